@@ -0,0 +1,3 @@
+"""
+Benchmarks for the data structures and their visualizers
+"""
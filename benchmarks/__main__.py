@@ -0,0 +1,9 @@
+"""
+Run the data structure microbenchmarks: python -m benchmarks --help
+"""
+
+import sys
+
+from benchmarks.operations import main
+
+sys.exit(main())
@@ -0,0 +1,139 @@
+"""
+Concurrent figure rendering: pyplot against pyplot-free figures and the figure pool
+
+Run with: python -m benchmarks.figures [--threads 1 2 4 8] [--frames 20] [--size 100]
+
+Every thread renders frames of the box-and-arrow views to PNG at once, as sessions of one
+server do. "pyplot" makes each frame with plt.subplots and a bare plt.close(), as the
+visualizers used to; "figure" makes a new pyplot-free Figure per frame; "pool" borrows one
+from utils.figures. Every PNG is checked against a single-threaded reference, so frames a
+race corrupted are counted as errors.
+"""
+
+import argparse
+import hashlib
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from benchmarks.render_collections import VIEWS
+from benchmarks.reporting import PERCENTILES, add_report_arguments, finish, make_report
+from utils.figures import pooled_subplots, subplots
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+DEFAULT_FRAMES = 20  # Frames per thread
+DEFAULT_SIZE = 100  # Items in each view
+PNG_DPI = 100
+
+
+def _pyplot_frame(figsize, draw):
+    fig, ax = plt.subplots(figsize=figsize)
+    draw(ax)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=PNG_DPI)
+    plt.close()  # Closes whichever figure is current, which may be another thread's
+    return buffer.getvalue()
+
+
+def _figure_frame(figsize, draw):
+    fig, ax = subplots(figsize)
+    draw(ax)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=PNG_DPI)
+    return buffer.getvalue()
+
+
+def _pool_frame(figsize, draw):
+    with pooled_subplots(figsize) as (fig, ax):
+        draw(ax)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=PNG_DPI)
+        return buffer.getvalue()
+
+
+MODES = {
+    "pyplot": _pyplot_frame,
+    "figure": _figure_frame,
+    "pool": _pool_frame,
+}
+
+
+def _digest(png):
+    return hashlib.sha1(png).hexdigest()
+
+
+def run_thread(render, frames, references):
+    """Render frames round-robin over the views; returns per-frame seconds and the error count"""
+    seconds = []
+    errors = 0
+    for i in range(frames):
+        figsize, draw, expected = references[i % len(references)]
+        start = time.perf_counter()
+        try:
+            png = render(figsize, draw)
+        except Exception:
+            png = None
+        seconds.append(time.perf_counter() - start)
+        errors += png is None or _digest(png) != expected
+    return seconds, errors
+
+
+def run_case(mode, threads, frames, references):
+    render = MODES[mode]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = list(pool.map(run_thread, [render] * threads, [frames] * threads, [references] * threads))
+    wall = time.perf_counter() - start
+
+    millis = np.asarray([s for seconds, _ in outcomes for s in seconds]) * 1000
+    result = {
+        "name": f"{mode}[threads={threads}]",
+        "mode": mode,
+        "threads": threads,
+        "frames": len(millis),
+        "throughput": len(millis) / wall,  # Frames finished per second across all threads
+        "errors": sum(errors for _, errors in outcomes),
+        "mean_ms": float(millis.mean()),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(millis, PERCENTILES)):
+        result[f"p{percentile}_ms"] = float(value)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.figures", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=DEFAULT_THREADS, help="concurrent thread counts")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames each thread renders")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="items in each view")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Reference PNGs come from fresh figures on one thread, which nothing can interfere with
+    references = []
+    for make_frame in VIEWS.values():
+        figsize, draw = make_frame(args.size)
+        references.append((figsize, draw, _digest(_figure_frame(figsize, draw))))
+
+    print(f"{'case':<22}{'frames':>8}{'per sec':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    results = []
+    for threads in args.threads:
+        for mode in args.modes:
+            result = run_case(mode, threads, args.frames, references)
+            results.append(result)
+            print(f"{result['name']:<22}{result['frames']:>8}{result['throughput']:>10.1f}"
+                  f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['errors']:>8}")
+
+    settings = {"threads": args.threads, "frames": args.frames, "size": args.size, "modes": args.modes,
+                "dpi": PNG_DPI}
+    return finish(make_report("figures", settings, results), args, metric="throughput")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
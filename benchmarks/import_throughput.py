@@ -0,0 +1,106 @@
+"""
+Rows per second of streaming dataset import into every structure
+
+Run with: python -m benchmarks.import_throughput [--rows 1000000] [--only heap] [--output report.json]
+
+Reports use the benchmarks.reporting format, with ops_per_sec counting imported rows
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+from benchmarks.reporting import add_report_arguments, finish, make_report, summarize
+from utils.dataset_import import import_dataset
+from utils.workloads import erdos_renyi_edges, key_sequence
+
+DEFAULT_ROWS = 10 ** 6
+SEED = 0
+
+# Structure factory (given the row count) and the generated file it reads
+TARGETS = {
+    "stack": (lambda rows: Stack(max_size=rows), "values.csv"),
+    "queue": (lambda rows: Queue(max_size=rows), "values.csv"),
+    "linked list": (lambda rows: LinkedList(), "values.csv"),
+    "doubly linked list": (lambda rows: LinkedList(doubly=True), "values.csv"),
+    "binary tree": (lambda rows: BinaryTree(), "values.csv"),
+    "heap": (lambda rows: Heap(), "values.csv"),
+    "hash table (csv)": (lambda rows: HashTable(), "pairs.csv"),
+    "hash table (jsonl)": (lambda rows: HashTable(), "pairs.jsonl"),
+    "graph": (lambda rows: Graph(), "graph.edges"),
+}
+
+
+def write_datasets(directory, rows):
+    """Write the value, key/value and edge-list files the benchmark imports"""
+    values = np.array(key_sequence(rows, "random", SEED))
+    np.savetxt(os.path.join(directory, "values.csv"), values, fmt="%d", header="value", comments="")
+
+    keys = np.array(key_sequence(rows, "random", SEED + 1))
+    pairs = np.column_stack([keys, values])
+    np.savetxt(os.path.join(directory, "pairs.csv"), pairs, fmt="%d", delimiter=",",
+               header="key,value", comments="")
+    with open(os.path.join(directory, "pairs.jsonl"), "w") as handle:
+        handle.writelines(f'{{"key": {key}, "value": {value}}}\n' for key, value in pairs)
+
+    # Sparse random graph with ten edge ends (five edges) per vertex
+    vertices = max(2, rows // 5)
+    edges = erdos_renyi_edges(vertices, 10 / (vertices - 1), SEED, max_weight=99)
+    np.savetxt(os.path.join(directory, "graph.edges"), np.array(edges, dtype=np.int64).reshape(-1, 3), fmt="%d")
+    return len(edges)
+
+
+def run_suite(rows, only=None):
+    """Import the generated files into every structure; returns (results, whether every import was complete)"""
+    results = []
+    complete = True
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        edge_rows = write_datasets(directory, rows)
+        print(f"Generated {rows:,} row datasets in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'structure':<20}{'rows':>12}{'seconds':>10}{'rows/s':>12}")
+        for name, (make, filename) in TARGETS.items():
+            if only and not any(part in name for part in only):
+                continue
+            structure = make(rows)
+            start = time.perf_counter()
+            imported, message = import_dataset(structure, os.path.join(directory, filename),
+                                               filename.rsplit(".", 1)[-1].replace("jsonl", "json"))
+            elapsed = time.perf_counter() - start
+            if imported != (edge_rows if filename == "graph.edges" else rows):
+                print(f"{name:<20}{message}")
+                complete = False
+                continue
+            results.append({"name": name, "rows": imported, "seconds": elapsed,
+                            **summarize([elapsed / imported], imported)})
+            print(f"{name:<20}{imported:>12,}{elapsed:>10.2f}{imported / elapsed:>12,.0f}")
+    return results, complete
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_throughput",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="rows in each generated file")
+    parser.add_argument("--only", nargs="+", help="structures whose name contains any of these")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results, complete = run_suite(args.rows, args.only)
+    status = finish(make_report("import_throughput", {"rows": args.rows, "only": args.only}, results), args)
+    return status if complete else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
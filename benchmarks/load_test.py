@@ -0,0 +1,235 @@
+"""
+Multi-session load test: N simulated users clicking through every page of main.py at once
+
+Run with: python -m benchmarks.load_test [--sessions 1 2 4 8] [--rounds 2] [--processes]
+
+Each session is a streamlit.testing.v1.AppTest, so no server or browser is needed. Threads
+share one interpreter like sessions of a real Streamlit server do; --processes gives every
+session its own interpreter instead.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import streamlit.logger
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest
+import streamlit.testing.v1.app_test
+
+from benchmarks.reporting import PERCENTILES, add_report_arguments, finish, make_report
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+DEFAULT_SESSIONS = [1, 2, 4, 8]
+DEFAULT_ROUNDS = 2
+TIMEOUT = 120  # Seconds one interaction may take before AppTest gives up
+
+# Page -> steps of (kind, widget inputs, button label); "{i}" in an input is the round number,
+# so every round touches different values. Each step is one interaction (one click and its reruns)
+SCRIPTS = {
+    "Stack": [
+        ("insert", [("text", "push_input", "{i}")], "🔼 Push"),
+        ("read", [], "👁️ Peek"),
+        ("delete", [], "🔽 Pop"),
+    ],
+    "Queue": [
+        ("insert", [("text", "enqueue_input", "{i}")], "➡️ Enqueue"),
+        ("read", [], "👁️ Front"),
+        ("delete", [], "⬅️ Dequeue"),
+    ],
+    "Linked List": [
+        ("insert", [("text", "insert_input", "{i}")], "➡️ Insert at End"),
+        ("read", [("text", "search_input", "{i}")], "🔍 Search"),
+        ("delete", [("text", "delete_input", "{i}")], "🗑️ Delete"),
+    ],
+    "Binary Tree": [
+        ("insert", [("text", "insert_input", "5{i}")], "🌱 Insert"),
+        ("insert", [("text", "insert_input", "2{i}")], "🌱 Insert"),
+        ("traverse", [], "📖 Inorder"),
+        ("delete", [("text", "delete_input", "2{i}")], "🗑️ Delete"),
+    ],
+    "Hash Table": [
+        ("insert", [("text", "key_input", "k{i}"), ("text", "value_input", "{i}")], "📝 Insert/Update"),
+        ("read", [("text", "get_input", "k{i}")], "🔍 Get Value"),
+        ("delete", [("text", "delete_input", "k{i}")], "🗑️ Delete"),
+    ],
+    "Heap": [
+        ("insert", [("text", "insert_input", "{i}")], "⬆️ Insert"),
+        ("traverse", [], "🔄 Heap Sort"),
+        ("delete", [], "⬇️ Extract Root"),
+    ],
+    "Graph": [
+        ("insert", [("text", "vertex_input", "a{i}")], "➕ Add Vertex"),
+        ("insert", [("text", "vertex_input", "b{i}")], "➕ Add Vertex"),
+        ("insert", [("select", "from_vertex", "a{i}"), ("select", "to_vertex", "b{i}")], "🔗 Add Edge"),
+        ("traverse", [("select", "start_vertex", "a{i}")], "🔍 BFS"),
+    ],
+}
+
+
+class _NoSleep:
+    """The time module without sleep, for skipping the visualizers' animation delays"""
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+    @staticmethod
+    def sleep(seconds):
+        pass
+
+
+def skip_animation_delays():
+    """Stop the time.sleep(0.5) after each operation from dominating every latency"""
+    import visualizers.components
+    import visualizers.stack_visualizer
+    import visualizers.queue_visualizer
+    import visualizers.linked_list_visualizer
+    import visualizers.binary_tree_visualizer
+    import visualizers.hash_table_visualizer
+    import visualizers.heap_visualizer
+    import visualizers.graph_visualizer
+    for module in (visualizers.components, visualizers.stack_visualizer, visualizers.queue_visualizer,
+                   visualizers.linked_list_visualizer, visualizers.binary_tree_visualizer,
+                   visualizers.hash_table_visualizer, visualizers.heap_visualizer, visualizers.graph_visualizer):
+        module.time = _NoSleep()
+
+
+def share_server_state():
+    """Let AppTests run side by side in threads of one process, as sessions of one server do"""
+    # A server compiles main.py once into a shared script cache; AppTest compiles it on
+    # every run, and concurrent compiles can trip CPython's AST recursion check
+    script_cache = ScriptCache()
+    streamlit.testing.v1.app_test.ScriptCache = lambda: script_cache
+
+    # Every AppTest run also installs a process-global mock Runtime and clears it when it
+    # finishes, pulling it out from under any session still running; fall back to the
+    # last mock instead, as a server has one Runtime for all sessions
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+        elif "runtime" in last:
+            return last["runtime"]
+        else:
+            raise RuntimeError("Runtime hasn't been created!")
+        return cls._instance
+
+    Runtime.instance = classmethod(instance)
+
+
+def _interact(at, inputs, label, i):
+    """Fill the inputs and click the button; returns the seconds the click's reruns took"""
+    for kind, key, value in inputs:
+        value = value.format(i=i)
+        if kind == "text":
+            at.text_input(key=key).input(value)
+        else:
+            at.selectbox(key=key).select(value)
+    button = next(button for button in at.button if button.label == label)
+    start = time.perf_counter()
+    button.click().run(timeout=TIMEOUT)
+    return time.perf_counter() - start
+
+
+def run_session(session, pages, rounds, keep_delays=False):
+    """One simulated user; returns [(page, kind, seconds)] and the number of failed interactions"""
+    streamlit.logger.set_log_level("error")  # Deprecation and bare-mode warnings would drown the table
+    if not keep_delays:
+        skip_animation_delays()
+
+    at = AppTest.from_file(MAIN, default_timeout=TIMEOUT)
+    start = time.perf_counter()
+    at.run()
+    samples = [("Home", "load", time.perf_counter() - start)]
+    errors = 0
+    for i in range(rounds):
+        for page in pages:
+            steps = [("navigate", [], None), *SCRIPTS[page]]
+            for kind, inputs, label in steps:
+                # A failure is counted and the session carries on, as a user would retry
+                try:
+                    if label is None:
+                        start = time.perf_counter()
+                        at.sidebar.selectbox[0].select(page).run()
+                        seconds = time.perf_counter() - start
+                    else:
+                        seconds = _interact(at, inputs, label, f"{session}{i}")
+                    samples.append((page, kind, seconds))
+                except Exception:
+                    errors += 1
+                errors += len(at.exception)
+    return samples, errors
+
+
+def _latency_summary(seconds):
+    millis = np.asarray(seconds) * 1000
+    summary = {"interactions": len(millis), "mean_ms": float(millis.mean())}
+    for percentile, value in zip(PERCENTILES, np.percentile(millis, PERCENTILES)):
+        summary[f"p{percentile}_ms"] = float(value)
+    summary["max_ms"] = float(millis.max())
+    return summary
+
+
+def run_load(sessions, pages, rounds, processes=False, keep_delays=False):
+    """Run that many sessions at once; returns the report results for this load level"""
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    if not processes:
+        share_server_state()
+    start = time.perf_counter()
+    with executor(max_workers=sessions) as pool:
+        outcomes = list(pool.map(run_session, range(sessions), [pages] * sessions, [rounds] * sessions,
+                                 [keep_delays] * sessions))
+    wall = time.perf_counter() - start
+
+    samples = [sample for session_samples, _ in outcomes for sample in session_samples]
+    errors = sum(session_errors for _, session_errors in outcomes)
+    results = [{
+        "name": f"sessions={sessions}",
+        "sessions": sessions,
+        "wall_seconds": wall,
+        "throughput": len(samples) / wall,  # Interactions completed per second across all sessions
+        "errors": errors,
+        **_latency_summary([seconds for _, _, seconds in samples]),
+    }]
+    for page in ["Home", *pages]:
+        page_seconds = [seconds for sample_page, _, seconds in samples if sample_page == page]
+        if page_seconds:
+            results.append({"name": f"sessions={sessions}/{page}", "sessions": sessions, "page": page,
+                            **_latency_summary(page_seconds)})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="concurrent session counts")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="passes over the pages per session")
+    parser.add_argument("--pages", nargs="+", choices=list(SCRIPTS), default=list(SCRIPTS))
+    parser.add_argument("--processes", action="store_true", help="one process per session instead of threads")
+    parser.add_argument("--keep-delays", action="store_true", help="keep the 0.5 s animation sleep after operations")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    run_session(0, args.pages[:1], 1, args.keep_delays)  # Warm imports and caches outside the measurements
+    print(f"{'sessions':>8}{'interactions':>14}{'per sec':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    results = []
+    for sessions in args.sessions:
+        level = run_load(sessions, args.pages, args.rounds, args.processes, args.keep_delays)
+        total = level[0]
+        print(f"{sessions:>8}{total['interactions']:>14}{total['throughput']:>10.1f}{total['p50_ms']:>10.0f}"
+              f"{total['p90_ms']:>10.0f}{total['p99_ms']:>10.0f}{total['errors']:>8}")
+        results.extend(level)
+
+    settings = {"sessions": args.sessions, "rounds": args.rounds, "pages": args.pages,
+                "processes": args.processes, "keep_delays": args.keep_delays}
+    return finish(make_report("load_test", settings, results), args, metric="throughput")
+
+
+if __name__ == "__main__":
+    # Run the imported module, so worker processes can unpickle run_session by its module name
+    from benchmarks.load_test import main as load_test_main
+    sys.exit(load_test_main())
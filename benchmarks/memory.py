@@ -0,0 +1,100 @@
+"""
+Memory benchmark: bytes per element of every structure, from memory_report()
+
+Run with: python -m benchmarks.memory [--sizes 1000 10000 100000 1000000] [--only Heap] [--trace]
+
+Reports use the benchmarks.reporting format; the baseline gate flags bytes_per_element growth
+"""
+
+import argparse
+import fnmatch
+import gc
+import sys
+import time
+import tracemalloc
+
+from benchmarks.operations import SUITE, Fixture, _linked_list
+from benchmarks.reporting import add_report_arguments, finish, make_report
+
+DEFAULT_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+DEFAULT_THRESHOLD = 0.10  # Memory is deterministic, so a smaller growth counts as a regression
+RECURSION_LIMIT = 20_000
+
+# Structure -> (build, distribution); one typical input each, as size not key order drives memory
+STRUCTURES = {
+    "Stack": (SUITE["Stack"][0], "random"),
+    "Queue": (SUITE["Queue"][0], "random"),
+    "LinkedList": (_linked_list(False), "random"),
+    "LinkedList (doubly)": (_linked_list(True), "random"),
+    "BinaryTree": (SUITE["BinaryTree"][0], "random"),
+    "HashTable": (SUITE["HashTable"][0], "random"),
+    "Heap": (SUITE["Heap"][0], "random"),
+    "Graph": (SUITE["Graph"][0], "erdos_renyi"),
+}
+
+
+def measure(build, n, distribution, trace=False):
+    """memory_report() of a freshly built structure, and optionally the bytes its build allocated"""
+    fixture = Fixture(build, n, distribution)
+    traced = None
+    if trace:
+        gc.collect()
+        tracemalloc.start()
+        structure = build(fixture)
+        traced = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    else:
+        structure = build(fixture)
+
+    start = time.perf_counter()
+    report = structure.memory_report()
+    seconds = time.perf_counter() - start
+    return report, seconds, traced
+
+
+def run_suite(sizes, only="*", trace=False):
+    results = []
+    for name, (build, distribution) in STRUCTURES.items():
+        if not fnmatch.fnmatch(name, only):
+            continue
+        for n in sizes:
+            report, seconds, traced = measure(build, n, distribution, trace)
+            result = {
+                "name": f"{name}[n={n}]",
+                "structure": name,
+                "n": n,
+                "elements": report["elements"],
+                "total_bytes": report["total"],
+                "bytes_per_element": report["bytes_per_element"],
+                "parts": report["parts"],
+                "report_ms": seconds * 1000,  # Time memory_report() itself took
+            }
+            if traced is not None:
+                # Allocated while building; excludes the stored keys, which the fixture made beforehand
+                result["traced_bytes"] = traced
+            results.append(result)
+            print(f"{result['name']:<32}{report['elements']:>10}{report['total'] / 2 ** 20:>12.2f}"
+                  f"{report['bytes_per_element']:>10.1f}{result['report_ms']:>12.1f}"
+                  + (f"{traced / 2 ** 20:>12.2f}" if traced is not None else ""))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.memory", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", default="*", help="glob over structure names")
+    parser.add_argument("--trace", action="store_true", help="also measure the build's allocations with tracemalloc")
+    add_report_arguments(parser)
+    parser.set_defaults(threshold=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    print(f"{'case':<32}{'elements':>10}{'MiB':>12}{'B/elem':>10}{'report ms':>12}"
+          + (f"{'traced MiB':>12}" if args.trace else ""))
+    results = run_suite(args.sizes, args.only, args.trace)
+    settings = {"sizes": args.sizes, "only": args.only, "trace": args.trace}
+    return finish(make_report("memory", settings, results), args, metric="bytes_per_element", higher_is_better=False)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
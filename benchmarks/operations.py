@@ -0,0 +1,362 @@
+"""
+Microbenchmarks of every public operation of every structure across sizes and key distributions
+
+Run with: python -m benchmarks [--sizes 100 1000 10000] [--only Heap] [--output report.json]
+"""
+
+import argparse
+import copy
+import fnmatch
+import sys
+import time
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+from benchmarks.reporting import add_report_arguments, finish, make_report, summarize
+from utils.workloads import GRAPH_MODELS, KEY_DISTRIBUTIONS, graph_edges, key_sequence, populate_graph
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_SAMPLES = 15
+CALLS = 64  # Calls per timed sample of the per-item operations
+SEED = 0
+RECURSION_LIMIT = 20_000  # Recursive BST helpers go one frame per level of a degenerate tree
+DEGENERATE_MAX_N = 2 ** 11  # Sorted and reverse input make the BST a path, so cap its size
+
+
+class Fixture:
+    """Keys for one (size, distribution) and a factory for fresh filled structures"""
+
+    def __init__(self, build, n, distribution):
+        if distribution in GRAPH_MODELS:
+            keys = list(range(n + CALLS))  # Vertices 0..n-1, then new vertex ids
+            self.edges = graph_edges(distribution, n, SEED)
+        else:
+            keys = key_sequence(n + CALLS, distribution, SEED)
+            self.edges = None
+        self.n = n
+        self.stored = keys[:n]  # Values in the structure
+        self.probes = keys[n:]  # Values that are not (except by chance under zipf)
+        self.hits = self.stored[::max(1, n // CALLS)][:CALLS]  # Present values spread over the structure
+        self._build = build
+        self._prototype = None
+
+    def fresh(self):
+        """A newly filled structure; BSTs are cloned since rebuilding a path takes O(n^2)"""
+        if self._prototype is None:
+            self._prototype = self._build(self)
+        if isinstance(self._prototype, BinaryTree):
+            return _clone_tree(self._prototype)
+        return self._build(self)
+
+    def shared(self):
+        """The filled structure that read-only operations reuse across samples"""
+        if self._prototype is None:
+            self._prototype = self._build(self)
+        return self._prototype
+
+
+def _clone_tree(tree):
+    """Copy a BST node by node without recursion, keeping its exact shape"""
+    clone = copy.copy(tree)
+    clone.history = []
+    clone._flat_cache = None
+    clone._layout = None
+    if tree.root is not None:
+        clone.root = copy.copy(tree.root)
+        stack = [clone.root]
+        while stack:
+            node = stack.pop()
+            for side in ("left", "right"):
+                child = getattr(node, side)
+                if child is not None:
+                    child = copy.copy(child)
+                    setattr(node, side, child)
+                    stack.append(child)
+    return clone
+
+
+def _stack(fixture):
+    stack = Stack(max_size=fixture.n + 2 * CALLS)
+    stack.extend(fixture.stored)
+    return stack
+
+
+def _queue(fixture):
+    queue = Queue(max_size=fixture.n + 2 * CALLS)
+    queue.extend(fixture.stored)
+    return queue
+
+
+def _linked_list(doubly):
+    def build(fixture):
+        linked_list = LinkedList(doubly=doubly)
+        linked_list.extend(fixture.stored)
+        return linked_list
+    return build
+
+
+def _tree(fixture):
+    tree = BinaryTree()
+    tree.apply_batch([("insert", key) for key in fixture.stored])
+    return tree
+
+
+def _hash_table(fixture):
+    table = HashTable(max(10, fixture.n))  # Load factor 1
+    table.update((key, key) for key in fixture.stored)
+    return table
+
+
+def _heap(fixture):
+    heap = Heap()
+    heap.build_heap(fixture.stored)
+    return heap
+
+
+def _graph(fixture):
+    graph = Graph()
+    populate_graph(graph, fixture.n, fixture.edges)
+    return graph
+
+
+def _each(method, values):
+    """One call per value"""
+    return lambda s, f: [(getattr(s, method), (value,)) for value in getattr(f, values)]
+
+
+def _repeat(method, *args):
+    """CALLS calls with the same arguments"""
+    return lambda s, f: [(getattr(s, method), args)] * CALLS
+
+
+def _once(method, *args):
+    """A single call of an operation over the whole structure"""
+    return lambda s, f: [(getattr(s, method), args)]
+
+
+def _once_with(method, argument):
+    """A single call whose argument is computed from the structure and fixture"""
+    return lambda s, f: [(getattr(s, method), (argument(s, f),))]
+
+
+def _common(batch):
+    """Operations every structure shares; batch(fixture) gives the ops of one apply_batch call"""
+    return {
+        "apply_batch": (_once_with("apply_batch", lambda s, f: batch(f)), True),
+        "get_history": (_repeat("get_history"), False),
+        "clear_history": (_repeat("clear_history"), True),
+        "stats": (_repeat("stats"), False),
+        "clear": (_once("clear"), True),
+    }
+
+
+def _edge_sample(graph, fixture):
+    """Up to CALLS existing edges"""
+    edges = []
+    for vertex in fixture.hits:
+        neighbors = graph.adjacency_list.get(vertex)
+        if neighbors:
+            edges.append((vertex, neighbors[0][0]))
+    return edges
+
+
+def _new_edges(fixture):
+    """Pairs of existing vertices from opposite ends of the sample, mostly not yet joined"""
+    return [(fixture.hits[i], fixture.hits[-1 - i]) for i in range(len(fixture.hits))]
+
+
+# Structure -> (build(fixture), distributions, {operation: (calls(structure, fixture), mutates)})
+# calls returns the (bound method, args) list one sample times; mutating operations get a fresh structure
+SUITE = {
+    "Stack": (_stack, ("random",), {
+        "push": (_each("push", "probes"), True),
+        "pop": (_repeat("pop"), True),
+        "extend": (_once_with("extend", lambda s, f: f.probes), True),
+        "peek": (_repeat("peek"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        "is_full": (_repeat("is_full"), False),
+        "size": (_repeat("size"), False),
+        "get_items": (_repeat("get_items"), False),
+        **_common(lambda f: [("push", value) for value in f.probes]),
+    }),
+    "Queue": (_queue, ("random",), {
+        "enqueue": (_each("enqueue", "probes"), True),
+        "dequeue": (_repeat("dequeue"), True),
+        "extend": (_once_with("extend", lambda s, f: f.probes), True),
+        "front": (_repeat("front"), False),
+        "rear": (_repeat("rear"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        "is_full": (_repeat("is_full"), False),
+        "size": (_repeat("size"), False),
+        "get_items": (_repeat("get_items"), False),
+        **_common(lambda f: [("enqueue", value) for value in f.probes]),
+    }),
+    **{name: (_linked_list(doubly), ("random",), {
+        "insert_at_beginning": (_each("insert_at_beginning", "probes"), True),
+        "insert_at_end": (_each("insert_at_end", "probes"), True),
+        "insert_at_position": (lambda s, f: [(s.insert_at_position, (value, s.size // 2)) for value in f.probes], True),
+        "extend": (_once_with("extend", lambda s, f: f.probes), True),
+        "delete": (_each("delete", "hits"), True),
+        "search": (_each("search", "hits"), False),
+        "search (missing)": (_each("search", "probes"), False),
+        "get_list": (_once("get_list"), False),
+        "iter_slice": (lambda s, f: [(lambda: list(s.iter_slice(s.size // 2, s.size // 2 + 20)), ())] * CALLS, False),
+        **_common(lambda f: [("insert_at_end", value) for value in f.probes]),
+    }) for name, doubly in (("LinkedList", False), ("LinkedList (doubly)", True))},
+    "BinaryTree": (_tree, KEY_DISTRIBUTIONS, {
+        "insert": (_each("insert", "probes"), True),
+        "delete": (_each("delete", "hits"), True),
+        "search": (_each("search", "hits"), False),
+        "search (missing)": (_each("search", "probes"), False),
+        "build_from": (_once_with("build_from", lambda s, f: f.stored), True),
+        "rebalance": (_once("rebalance"), True),
+        "size": (_repeat("size"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        "select": (lambda s, f: [(s.select, (k,)) for k in range(0, f.n, max(1, f.n // CALLS))][:CALLS], False),
+        "rank": (_each("rank", "probes"), False),
+        "count_range": (lambda s, f: [(s.count_range, (min(a, b), max(a, b))) for a, b in zip(f.hits, f.probes)], False),
+        "range_iter": (lambda s, f: [(lambda: list(s.range_iter(f.hits[0], f.hits[0] + 200)), ())] * CALLS, False),
+        "floor": (_each("floor", "probes"), False),
+        "ceiling": (_each("ceiling", "probes"), False),
+        "predecessor": (_each("predecessor", "hits"), False),
+        "successor": (_each("successor", "hits"), False),
+        "inorder_traversal": (_once("inorder_traversal"), False),
+        "preorder_traversal": (_once("preorder_traversal"), False),
+        "postorder_traversal": (_once("postorder_traversal"), False),
+        "get_tree_structure": (_once("get_tree_structure"), False),
+        "get_flat_structure": (_once("get_flat_structure"), True),  # Cached after the first call
+        **_common(lambda f: [("insert", value) for value in f.probes]),
+    }),
+    "HashTable": (_hash_table, KEY_DISTRIBUTIONS, {
+        "insert": (lambda s, f: [(s.insert, (key, key)) for key in f.probes], True),
+        "update": (_once_with("update", lambda s, f: [(key, key) for key in f.probes]), True),
+        "resize": (_once_with("resize", lambda s, f: 2 * s.size), True),
+        "get": (_each("get", "hits"), False),
+        "get (missing)": (_each("get", "probes"), False),
+        "contains": (_each("contains", "hits"), False),
+        "delete": (_each("delete", "hits"), True),
+        "get_all_items": (_once("get_all_items"), False),
+        "get_table_state": (_repeat("get_table_state"), False),
+        "get_chain_lengths": (_repeat("get_chain_lengths"), False),
+        "get_load_factor": (_repeat("get_load_factor"), False),
+        "get_collision_count": (_repeat("get_collision_count"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        **_common(lambda f: [("insert", key, key) for key in f.probes]),
+    }),
+    "Heap": (_heap, KEY_DISTRIBUTIONS, {
+        "insert": (_each("insert", "probes"), True),
+        "extract": (_repeat("extract"), True),
+        "delete": (_each("delete", "hits"), True),
+        "peek": (_repeat("peek"), False),
+        "build_heap": (_once_with("build_heap", lambda s, f: f.stored), True),
+        "heap_sort": (_once("heap_sort"), False),
+        "get_heap_array": (_repeat("get_heap_array"), False),
+        "get_tree_structure": (_once("get_tree_structure"), False),
+        "get_flat_structure": (_once("get_flat_structure"), True),  # Cached after the first call
+        "size": (_repeat("size"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        **_common(lambda f: [("insert", value) for value in f.probes]),
+    }),
+    "Graph": (_graph, tuple(GRAPH_MODELS), {
+        "add_vertex": (_each("add_vertex", "probes"), True),
+        "add_edge": (lambda s, f: [(s.add_edge, pair) for pair in _new_edges(f)], True),
+        "add_edges": (_once_with("add_edges", lambda s, f: [(u, v, 1) for u, v in _new_edges(f)]), True),
+        "remove_vertex": (_each("remove_vertex", "hits"), True),
+        "remove_edge": (lambda s, f: [(s.remove_edge, pair) for pair in _edge_sample(s, f)], True),
+        "get_neighbors": (_each("get_neighbors", "hits"), False),
+        "bfs": (_once("bfs", 0), False),
+        "dfs": (_once("dfs", 0), False),
+        "has_path": (lambda s, f: [(s.has_path, (0, f.n - 1))], False),
+        "get_graph_data": (_once("get_graph_data"), False),
+        "get_adjacency_matrix": (_once("get_adjacency_matrix"), False),
+        "is_empty": (_repeat("is_empty"), False),
+        "vertex_count": (_repeat("vertex_count"), False),
+        "edge_count": (_repeat("edge_count"), False),
+        **_common(lambda f: [("add_vertex", vertex) for vertex in f.probes]),
+    }),
+}
+
+# (structure, operation) -> largest n worth running
+SIZE_LIMITS = {
+    ("Graph", "get_adjacency_matrix"): 2000,  # Builds an n x n matrix
+}
+
+
+def _skip(structure, operation, n, distribution):
+    if structure == "BinaryTree" and distribution in ("sorted", "reverse") and n > DEGENERATE_MAX_N:
+        return True
+    return n > SIZE_LIMITS.get((structure, operation), n)
+
+
+def time_case(fixture, calls, mutates, samples):
+    """Per-call seconds of each sample and the total number of calls made"""
+    per_call = []
+    total = 0
+    for _ in range(samples):
+        structure = fixture.fresh() if mutates else fixture.shared()
+        bound = calls(structure, fixture)
+        if not bound:
+            return [], 0
+        start = time.perf_counter()
+        for method, args in bound:
+            method(*args)
+        per_call.append((time.perf_counter() - start) / len(bound))
+        total += len(bound)
+    return per_call, total
+
+
+def run_suite(sizes, samples, only="*", distributions=None):
+    """Time every selected case; only is a glob over 'Structure.operation'"""
+    results = []
+    for structure, (build, structure_distributions, operations) in SUITE.items():
+        chosen = [op for op in operations if fnmatch.fnmatch(f"{structure}.{op}", only)]
+        for distribution in structure_distributions:
+            if distributions and distribution not in distributions:
+                continue
+            for n in sizes:
+                fixture = Fixture(build, n, distribution)
+                for operation in chosen:
+                    if _skip(structure, operation, n, distribution):
+                        continue
+                    calls, mutates = operations[operation]
+                    per_call, total = time_case(fixture, calls, mutates, samples)
+                    if not per_call:
+                        continue
+                    result = {
+                        "name": f"{structure}.{operation}[n={n},{distribution}]",
+                        "structure": structure,
+                        "operation": operation,
+                        "n": n,
+                        "distribution": distribution,
+                        **summarize(per_call, total),
+                    }
+                    results.append(result)
+                    print(f"{result['name']:<60}{result['ops_per_sec']:>14,.0f}/s"
+                          f"{result['p50_us']:>12.2f}us{result['p99_us']:>12.2f}us")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="timed samples per case")
+    parser.add_argument("--only", default="*", help="glob over Structure.operation, e.g. 'Heap.*' or '*.search*'")
+    parser.add_argument("--distributions", nargs="+", help="key distributions or graph models to run")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    print(f"{'case':<60}{'ops/sec':>16}{'p50':>14}{'p99':>14}")
+    results = run_suite(args.sizes, args.samples, args.only, args.distributions)
+    settings = {"sizes": args.sizes, "samples": args.samples, "calls_per_sample": CALLS, "seed": SEED,
+                "only": args.only, "distributions": args.distributions}
+    return finish(make_report("operations", settings, results), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
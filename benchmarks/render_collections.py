@@ -0,0 +1,131 @@
+"""
+Headless per-frame render time of the box-and-arrow views
+
+Run with: python -m benchmarks.render_collections [--sizes 10 100 1000 10000] [--only stack] [--output report.json]
+
+Reports use the benchmarks.reporting format, with ops_per_sec counting whole frames
+"""
+
+import argparse
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.heap import Heap
+from visualizers.stack_visualizer import StackVisualizer
+from visualizers.queue_visualizer import QueueVisualizer
+from visualizers.linked_list_visualizer import LinkedListVisualizer
+from visualizers.heap_visualizer import HeapVisualizer
+from benchmarks.reporting import add_report_arguments, finish, make_report, summarize
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+REPEATS = 3
+
+
+def _stack_frame(n):
+    """Figure size and drawing call for a full stack of n items"""
+    visualizer = StackVisualizer.__new__(StackVisualizer)
+    visualizer.stack = Stack(max_size=n)
+    for i in range(n):
+        visualizer.stack.push(i)
+    return (8, 10), visualizer._draw_stack
+
+
+def _queue_frame(n):
+    """Figure size and drawing call for a full queue of n items"""
+    visualizer = QueueVisualizer.__new__(QueueVisualizer)
+    visualizer.queue = Queue(max_size=n)
+    for i in range(n):
+        visualizer.queue.enqueue(i)
+    return (12, 6), visualizer._draw_queue
+
+
+def _linked_list_frame(n):
+    """Figure size and drawing call for the last window of a doubly linked list of n items"""
+    visualizer = LinkedListVisualizer.__new__(LinkedListVisualizer)
+    visualizer.list_type = "Doubly Linked List"
+    visualizer.linked_list = LinkedList(doubly=True)
+    for i in range(n):
+        visualizer.linked_list.insert_at_end(i)
+
+    def draw(ax):
+        offset = max(0, n - visualizer.window_size)
+        items = list(visualizer.linked_list.iter_slice(offset, offset + visualizer.window_size))
+        visualizer._draw_list(ax, items, offset)
+    return (16, 6), draw
+
+
+def _heap_array_frame(n):
+    """Figure size and drawing call for the last window of a heap array of n items"""
+    visualizer = HeapVisualizer.__new__(HeapVisualizer)
+    visualizer.heap = Heap()
+    visualizer.heap.build_heap(list(range(n)))
+    flat = visualizer.heap.get_flat_structure()
+    offset = max(0, n - visualizer.array_window)
+    return (12, 5), lambda ax: visualizer._draw_heap_array(ax, flat, offset)
+
+
+VIEWS = {
+    "stack": _stack_frame,
+    "queue": _queue_frame,
+    "linked list": _linked_list_frame,
+    "heap array": _heap_array_frame,
+}
+
+
+def time_frame(figsize, draw, repeats):
+    """Seconds to build and rasterize one frame, once per repeat"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig, ax = plt.subplots(figsize=figsize)
+        draw(ax)
+        fig.canvas.draw()
+        timings.append(time.perf_counter() - start)
+        plt.close(fig)
+    return timings
+
+
+def run_suite(sizes, repeats, only=None):
+    results = []
+    for view, make_frame in VIEWS.items():
+        if only and not any(name in view for name in only):
+            continue
+        row = []
+        for n in sizes:
+            timings = time_frame(*make_frame(n), repeats)
+            results.append({
+                "name": f"{view}[n={n}]",
+                "view": view,
+                "n": n,
+                **summarize(timings, repeats),
+                "best_ms": min(timings) * 1000,
+            })
+            row.append(min(timings) * 1000)
+        print(f"{view:<14}" + "".join(f"{ms:>10.1f}ms" for ms in row))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.render_collections",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timed frames per view and size")
+    parser.add_argument("--only", nargs="+", help="views whose name contains any of these")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    print(f"{'view':<14}" + "".join(f"{n:>12}" for n in args.sizes) + "   (best of each)")
+    results = run_suite(args.sizes, args.repeats, args.only)
+    settings = {"sizes": args.sizes, "repeats": args.repeats, "only": args.only}
+    return finish(make_report("render_collections", settings, results), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Headless render benchmark: every visualizer's drawing code under Agg with a stubbed st
+
+Run with: python -m benchmarks.rendering [--sizes 10 100 1000] [--only heap] [--output report.json]
+
+Reports use the benchmarks.reporting format, with ops_per_sec counting whole frames
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from PIL import Image
+
+import visualizers.components
+import visualizers.stack_visualizer
+import visualizers.queue_visualizer
+import visualizers.linked_list_visualizer
+import visualizers.binary_tree_visualizer
+import visualizers.hash_table_visualizer
+import visualizers.heap_visualizer
+import visualizers.graph_visualizer
+from benchmarks.reporting import add_report_arguments, finish, make_report, summarize
+from utils.workloads import graph_edges, key_sequence, populate_graph
+
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_FRAMES = 5
+SEED = 0
+RECURSION_LIMIT = 20_000
+PNG_DPI = 200  # st.pyplot saves figures at this resolution
+
+
+class _SessionState(dict):
+    """Dict with attribute access, like st.session_state"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+
+class StubStreamlit:
+    """Just enough of the streamlit module for the visualizers to draw without a server"""
+
+    def __init__(self):
+        self.session_state = _SessionState()
+        self.figures = []
+
+    def pyplot(self, fig, **kwargs):
+        self.figures.append(fig)  # Kept open so the harness can rasterize it
+
+    def png_bytes(self, fig):
+        # Stands in for utils.figures.png_bytes in tree frames; the figure goes back to the
+        # pool, but nothing borrows it again before the harness rasterizes it
+        self.figures.append(fig)
+        return b""
+
+    def slider(self, label, min_value=None, max_value=None, value=None, *args, **kwargs):
+        return value if value is not None else min_value
+
+    def selectbox(self, label, options, index=0, *args, **kwargs):
+        options = list(options)
+        return options[index] if options else None
+
+    radio = selectbox
+
+    def button(self, *args, **kwargs):
+        return False
+
+    def columns(self, spec, **kwargs):
+        return [contextlib.nullcontext() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def rerun(self):
+        raise RuntimeError("A visualizer asked for a rerun while drawing")
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None  # subheader, caption, info, markdown, ...
+
+
+VISUALIZER_MODULES = [
+    visualizers.components,
+    visualizers.stack_visualizer,
+    visualizers.queue_visualizer,
+    visualizers.linked_list_visualizer,
+    visualizers.binary_tree_visualizer,
+    visualizers.hash_table_visualizer,
+    visualizers.heap_visualizer,
+    visualizers.graph_visualizer,
+]
+
+
+@contextlib.contextmanager
+def stubbed_streamlit():
+    """Swap the st of every visualizer module, and the PNG encoding of tree frames, for a StubStreamlit"""
+    stub = StubStreamlit()
+    originals = [module.st for module in VISUALIZER_MODULES]
+    png_bytes = visualizers.components.png_bytes
+    for module in VISUALIZER_MODULES:
+        module.st = stub
+    visualizers.components.png_bytes = stub.png_bytes  # So tree frames are timed like the others
+    try:
+        yield stub
+    finally:
+        for module, original in zip(VISUALIZER_MODULES, originals):
+            module.st = original
+        visualizers.components.png_bytes = png_bytes
+
+
+def _stack(n):
+    visualizer = visualizers.stack_visualizer.StackVisualizer()
+    visualizer.stack.max_size = max(n, 1)
+    visualizer.stack.extend(range(n))
+    return visualizer
+
+
+def _queue(n):
+    visualizer = visualizers.queue_visualizer.QueueVisualizer()
+    visualizer.queue.max_size = max(n, 1)
+    visualizer.queue.extend(range(n))
+    return visualizer
+
+
+def _linked_list(doubly):
+    def make(n):
+        visualizer = visualizers.linked_list_visualizer.LinkedListVisualizer()
+        if doubly:
+            visualizer.list_type = "Doubly Linked List"
+            visualizer.linked_list = visualizer.linked_list.__class__(doubly=True)
+        visualizer.linked_list.extend(range(n))
+        return visualizer
+    return make
+
+
+def _binary_tree(n):
+    visualizer = visualizers.binary_tree_visualizer.BinaryTreeVisualizer()
+    visualizer.tree.apply_batch([("insert", key) for key in key_sequence(n, "random", SEED)])
+    return visualizer
+
+
+def _hash_table(n):
+    visualizer = visualizers.hash_table_visualizer.HashTableVisualizer()
+    visualizer.hash_table.resize(max(10, n))  # Load factor 1, as a user would size it
+    visualizer.hash_table.update((key, key) for key in key_sequence(n, "random", SEED))
+    return visualizer
+
+
+def _heap(n):
+    visualizer = visualizers.heap_visualizer.HeapVisualizer()
+    visualizer.heap.build_heap(key_sequence(n, "random", SEED))
+    return visualizer
+
+
+def _graph(n):
+    visualizer = visualizers.graph_visualizer.GraphVisualizer()
+    populate_graph(visualizer.graph, n, graph_edges("erdos_renyi", n, SEED, average_degree=3))
+    return visualizer
+
+
+# View name -> make(n) returning a visualizer (built under the stub) holding n items
+VIEWS = {
+    "stack": _stack,
+    "queue": _queue,
+    "linked list": _linked_list(False),
+    "doubly linked list": _linked_list(True),
+    "binary tree": _binary_tree,
+    "hash table": _hash_table,
+    "heap": _heap,
+    "graph": _graph,
+}
+
+
+def time_frame(visualizer, stub):
+    """Seconds to build, rasterize and PNG-encode one frame, and the PNG size in bytes"""
+    stub.figures.clear()
+    for key in [key for key in stub.session_state if key.endswith("_frames")]:
+        del stub.session_state[key]  # Time a full redraw, not a cached frame
+    start = time.perf_counter()
+    visualizer._render_visualization()  # Structure queries, layout and every _draw_* call
+    built = time.perf_counter()
+
+    raster = encode = 0.0
+    size = 0
+    for fig in stub.figures:
+        fig.set_dpi(PNG_DPI)
+        canvas = FigureCanvasAgg(fig)
+        start_raster = time.perf_counter()
+        canvas.draw()
+        pixels = np.asarray(canvas.buffer_rgba())
+        start_encode = time.perf_counter()
+        buffer = io.BytesIO()
+        Image.fromarray(pixels).save(buffer, format="png")  # What savefig does after drawing, minus the tight crop
+        done = time.perf_counter()
+        raster += start_encode - start_raster
+        encode += done - start_encode
+        size += buffer.tell()
+    return built - start, raster, encode, size
+
+
+def run_suite(sizes, frames, only=None):
+    results = []
+    for view, make in VIEWS.items():
+        if only and not any(name in view for name in only):
+            continue
+        for n in sizes:
+            with stubbed_streamlit() as stub:
+                visualizer = make(n)
+                time_frame(visualizer, stub)  # Warm caches, as any rerun after the first would
+                timings = [time_frame(visualizer, stub) for _ in range(frames)]
+
+            build, raster, encode, size = zip(*timings)
+            result = {
+                "name": f"{view}[n={n}]",
+                "view": view,
+                "n": n,
+                **summarize([sum(frame[:3]) for frame in timings], frames),
+                "build_ms": statistics.median(build) * 1000,
+                "raster_ms": statistics.median(raster) * 1000,
+                "encode_ms": statistics.median(encode) * 1000,
+                "png_bytes": size[-1],
+            }
+            results.append(result)
+            print(f"{result['name']:<28}{result['build_ms']:>10.1f}{result['raster_ms']:>10.1f}"
+                  f"{result['encode_ms']:>10.1f}{result['png_bytes'] / 1024:>10.0f}{result['ops_per_sec']:>10.2f}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.rendering", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="timed frames per view and size")
+    parser.add_argument("--only", nargs="+", help="views whose name contains any of these")
+    add_report_arguments(parser)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSION_LIMIT))
+    print(f"{'view':<28}{'build ms':>10}{'raster ms':>10}{'png ms':>10}{'png KiB':>10}{'frames/s':>10}")
+    results = run_suite(args.sizes, args.frames, args.only)
+    settings = {"sizes": args.sizes, "frames": args.frames, "dpi": PNG_DPI, "only": args.only}
+    return finish(make_report("rendering", settings, results), args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
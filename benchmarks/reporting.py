@@ -0,0 +1,129 @@
+"""
+JSON benchmark reports with machine metadata, and comparison against a saved baseline
+"""
+
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import matplotlib
+import numpy as np
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_THRESHOLD = 0.25  # Flag a case whose ops/sec falls more than 25% below its baseline
+PERCENTILES = (50, 90, 99)
+
+
+def machine_metadata():
+    """Describe the machine and code a report was measured on"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(__file__), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpu_count": os.cpu_count(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "commit": commit,
+    }
+
+
+def summarize(seconds_per_call, calls):
+    """Throughput and latency percentiles from per-call times of every timed sample"""
+    samples = np.asarray(seconds_per_call, dtype=float)
+    micros = samples * 1e6
+    summary = {
+        "calls": int(calls),
+        "samples": len(samples),
+        "ops_per_sec": float(1 / samples.mean()) if samples.mean() > 0 else float("inf"),
+        "mean_us": float(micros.mean()),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(micros, PERCENTILES)):
+        summary[f"p{percentile}_us"] = float(value)
+    return summary
+
+
+def make_report(suite, settings, results):
+    """Wrap results (each a dict with a unique 'name') in the shared report format"""
+    return {
+        "suite": suite,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "machine": machine_metadata(),
+        "settings": settings,
+        "results": results,
+    }
+
+
+def write_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+
+def load_report(path):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def compare(report, baseline, metric="ops_per_sec", threshold=DEFAULT_THRESHOLD, higher_is_better=True):
+    """Match results by name; returns (name, baseline, current, relative change, regressed) rows"""
+    previous = {result["name"]: result for result in baseline["results"]}
+    rows = []
+    for result in report["results"]:
+        before = previous.get(result["name"])
+        if before is None or not before.get(metric) or metric not in result:
+            continue
+        change = result[metric] / before[metric] - 1
+        worse = -change if higher_is_better else change
+        rows.append((result["name"], before[metric], result[metric], change, worse > threshold))
+    return rows
+
+
+def finish(report, args, metric="ops_per_sec", higher_is_better=True):
+    """Write the report, save or compare the baseline as asked; returns the exit code"""
+    if args.output:
+        write_report(report, args.output)
+        print(f"\nWrote {len(report['results'])} results to {args.output}")
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{report['suite']}.json")
+    if args.save_baseline:
+        write_report(report, baseline_path)
+        print(f"Saved baseline to {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    baseline = load_report(baseline_path)
+    if baseline["machine"].get("platform") != report["machine"]["platform"]:
+        print(f"Warning: the baseline was measured on {baseline['machine'].get('platform')}")
+
+    rows = compare(report, baseline, metric, args.threshold, higher_is_better)
+    regressions = [row for row in rows if row[4]]
+    print(f"\nCompared {len(rows)} results with {baseline_path} ({metric}, threshold {args.threshold:.0%})")
+    for name, before, after, change, _ in regressions:
+        print(f"  REGRESSION {name}: {before:,.4g} -> {after:,.4g} ({change:+.1%})")
+    if not regressions:
+        print("  No regressions")
+    return 1 if regressions else 0
+
+
+def add_report_arguments(parser):
+    """Options shared by every suite for writing reports and gating on a baseline"""
+    parser.add_argument("--output", "-o", help="write the JSON report to this path")
+    parser.add_argument("--baseline", help="baseline report to compare with (default: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default: %(default)s)")
@@ -0,0 +1,255 @@
+"""
+Check every structure's incrementally maintained stats() against a full recomputation
+
+Run with: python -m benchmarks.stats_check [--seeds 20] [--steps 400] [--only Heap]
+
+Each seed runs a random mix of single, bulk and clearing operations and compares stats()
+after every one of them with the same figures computed from scratch from the structure's
+contents. Exits with status 1 if any comparison differs.
+"""
+
+import argparse
+import fnmatch
+import random
+import sys
+from collections import Counter
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+
+DEFAULT_SEEDS = 20
+DEFAULT_STEPS = 400
+KEY_RANGE = 200  # Keys are drawn from a small range so deletes and duplicates hit often
+
+
+def _stack_step(stack, rng):
+    r = rng.random()
+    if r < 0.5:
+        stack.push(rng.randrange(KEY_RANGE))
+    elif r < 0.9:
+        stack.pop()
+    elif r < 0.97:
+        stack.extend(rng.randrange(KEY_RANGE) for _ in range(rng.randrange(5)))
+    else:
+        stack.clear()
+
+
+def _stack_expected(stack):
+    items = stack.items
+    return {'size': len(items), 'capacity': stack.max_size, 'top': items[-1] if items else None}
+
+
+def _queue_step(queue, rng):
+    r = rng.random()
+    if r < 0.5:
+        queue.enqueue(rng.randrange(KEY_RANGE))
+    elif r < 0.9:
+        queue.dequeue()
+    elif r < 0.97:
+        queue.extend(rng.randrange(KEY_RANGE) for _ in range(rng.randrange(5)))
+    else:
+        queue.clear()
+
+
+def _queue_expected(queue):
+    items = queue.items
+    return {'size': len(items), 'capacity': queue.max_size,
+            'front': items[0] if items else None, 'rear': items[-1] if items else None}
+
+
+def _linked_list_step(linked_list, rng):
+    r = rng.random()
+    value = rng.randrange(KEY_RANGE // 4)
+    if r < 0.25:
+        linked_list.insert_at_beginning(value)
+    elif r < 0.5:
+        linked_list.insert_at_end(value)
+    elif r < 0.6:
+        linked_list.insert_at_position(value, rng.randrange(linked_list.size + 2))
+    elif r < 0.9:
+        linked_list.delete(value)
+    elif r < 0.98:
+        linked_list.extend(rng.randrange(KEY_RANGE // 4) for _ in range(rng.randrange(10)))
+    else:
+        linked_list.clear()
+
+
+def _linked_list_expected(linked_list):
+    size = 0
+    last = None
+    node = linked_list.head
+    while node is not None:
+        size += 1
+        last = node
+        node = node.next
+    return {
+        'size': size,
+        'head': linked_list.head.data if linked_list.head else None,
+        'tail': last.data if linked_list.doubly and last else None,  # Only tracked for doubly linked lists
+    }
+
+
+def _binary_tree_step(tree, rng):
+    r = rng.random()
+    if r < 0.5:
+        tree.insert(rng.randrange(KEY_RANGE))
+    elif r < 0.85:
+        tree.delete(rng.randrange(KEY_RANGE))
+    elif r < 0.9:
+        tree.rebalance()
+    elif r < 0.97:
+        tree.build_from(rng.sample(range(KEY_RANGE * 2), rng.randrange(30)))
+    else:
+        tree.clear()
+
+
+def _binary_tree_expected(tree):
+    values = []
+    height = 0
+    stack = [(tree.root, 1)] if tree.root else []
+    while stack:
+        node, depth = stack.pop()
+        values.append(node.data)
+        height = max(height, depth)
+        stack.extend((child, depth + 1) for child in (node.left, node.right) if child is not None)
+    return {'size': len(values), 'height': height, 'min': min(values, default=None), 'max': max(values, default=None)}
+
+
+def _heap_step(heap, rng):
+    r = rng.random()
+    if r < 0.45:
+        heap.insert(rng.randrange(KEY_RANGE))
+    elif r < 0.7:
+        heap.extract()
+    elif r < 0.85:
+        heap.delete(rng.randrange(KEY_RANGE))
+    elif r < 0.92:
+        heap.build_heap([rng.randrange(KEY_RANGE) for _ in range(rng.randrange(20))])
+    elif r < 0.97:
+        heap.heap_sort()
+    else:
+        heap.clear()
+
+
+def _heap_expected(heap):
+    values = heap.heap
+    return {'size': len(values), 'height': len(values).bit_length(),
+            'min': min(values, default=None), 'max': max(values, default=None)}
+
+
+def _hash_table_step(table, rng):
+    r = rng.random()
+    key = rng.choice([rng.randrange(KEY_RANGE // 3), f"k{rng.randrange(KEY_RANGE // 6)}"])
+    if r < 0.55:
+        table.insert(key, rng.randrange(KEY_RANGE))
+    elif r < 0.9:
+        table.delete(key)
+    elif r < 0.95:
+        table.update((rng.randrange(KEY_RANGE // 3), i) for i in range(rng.randrange(10)))
+    elif r < 0.98:
+        table.resize(rng.choice([5, 7, 13, 31]))
+    else:
+        table.clear()
+
+
+def _hash_table_expected(table):
+    lengths = [len(bucket) for bucket in table.table]
+    count = sum(lengths)
+    return {
+        'size': len(lengths),
+        'count': count,
+        'load_factor': count / len(lengths),
+        'collisions': sum(length - 1 for length in lengths if length > 1),
+        'max_chain': max(lengths),
+        'empty_buckets': lengths.count(0),
+    }
+
+
+def _graph_step(graph, rng):
+    r = rng.random()
+    vertex1, vertex2 = rng.choice("ABCDEFGHIJ"), rng.choice("ABCDEFGHIJ")
+    if r < 0.1:
+        graph.add_vertex(vertex1)
+    elif r < 0.55:
+        graph.add_edge(vertex1, vertex2, rng.randrange(10))
+    elif r < 0.65:
+        graph.add_edges((rng.choice("ABCDEFGHIJKL"), rng.choice("ABCDEFGHIJKL"), 1) for _ in range(rng.randrange(6)))
+    elif r < 0.85:
+        graph.remove_edge(vertex1, vertex2)
+    elif r < 0.98:
+        graph.remove_vertex(vertex1)
+    else:
+        graph.clear()
+
+
+def _graph_expected(graph):
+    degrees = [len(graph.adjacency_list[vertex]) for vertex in graph.vertices]
+    return {
+        'vertices': len(graph.vertices),
+        'edges': sum(degrees) if graph.directed else sum(degrees) // 2,
+        'degree_histogram': dict(Counter(degrees)),
+    }
+
+
+# Name -> (factory, random operation, stats recomputed from scratch)
+STRUCTURES = {
+    "Stack": (lambda: Stack(max_size=20), _stack_step, _stack_expected),
+    "Queue": (lambda: Queue(max_size=20), _queue_step, _queue_expected),
+    "LinkedList": (lambda: LinkedList(), _linked_list_step, _linked_list_expected),
+    "LinkedList (doubly)": (lambda: LinkedList(doubly=True), _linked_list_step, _linked_list_expected),
+    "BinaryTree": (lambda: BinaryTree(), _binary_tree_step, _binary_tree_expected),
+    "Heap (min)": (lambda: Heap("min"), _heap_step, _heap_expected),
+    "Heap (max)": (lambda: Heap("max"), _heap_step, _heap_expected),
+    "HashTable": (lambda: HashTable(7), _hash_table_step, _hash_table_expected),
+    "Graph": (lambda: Graph(), _graph_step, _graph_expected),
+    "Graph (directed)": (lambda: Graph(directed=True), _graph_step, _graph_expected),
+}
+
+
+def check(make, step, expected, seeds, steps):
+    """Compare stats() with the recomputation after every step; returns (checks, first mismatch or None, mismatches)"""
+    checks = mismatches = 0
+    first = None
+    for seed in range(seeds):
+        rng = random.Random(seed)
+        structure = make()
+        for index in range(steps):
+            step(structure, rng)
+            got, want = structure.stats(), expected(structure)
+            checks += 1
+            if got != want:
+                mismatches += 1
+                if first is None:
+                    first = (seed, index, structure.history[-1] if structure.history else None, got, want)
+    return checks, first, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stats_check",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS, help="random operation sequences per structure")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="operations in each sequence")
+    parser.add_argument("--only", default="*", help="glob of structure names to check")
+    args = parser.parse_args(argv)
+
+    print(f"{'structure':<22}{'checks':>10}{'mismatches':>12}")
+    failed = False
+    for name, (make, step, expected) in STRUCTURES.items():
+        if not fnmatch.fnmatch(name, args.only):
+            continue
+        checks, first, mismatches = check(make, step, expected, args.seeds, args.steps)
+        print(f"{name:<22}{checks:>10,}{mismatches:>12,}")
+        if first is not None:
+            failed = True
+            seed, index, operation, got, want = first
+            print(f"  first at seed {seed}, step {index} ({operation}):\n    stats()  {got}\n    expected {want}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
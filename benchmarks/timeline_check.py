@@ -0,0 +1,90 @@
+"""
+Check that operation counting and the undo timeline work together on every structure
+
+Run with: python -m benchmarks.timeline_check [--seeds 5] [--steps 200] [--only Heap]
+
+The pages attach a structure's timeline before counting is switched on, so each seed does
+the same: it attaches a timeline, enables counting and runs the random operations of
+benchmarks.stats_check, comparing the counts after every operation with those of a counted
+twin that has no timeline. Halfway through, counting is switched off and on again on both.
+At the end, undoing to the start and redoing to the end must restore the same contents
+without adding to the counts. Exits with status 1 if any comparison differs.
+"""
+
+import argparse
+import fnmatch
+import random
+import sys
+
+from benchmarks.stats_check import STRUCTURES
+from data_structures.instrumented import disable_counting, enable_counting, operation_counts
+from data_structures.timeline import Timeline
+
+DEFAULT_SEEDS = 5
+DEFAULT_STEPS = 200
+
+
+def _state(structure):
+    """What both twins must agree on: contents, counts and the last counted operation"""
+    return structure.stats(), operation_counts(structure), structure.last_operation
+
+
+def check(make, step, seeds, steps):
+    """Run both twins through the same operations; returns (checks, first mismatch or None, mismatches)"""
+    checks = mismatches = 0
+    first = None
+
+    def compare(seed, index, got, want):
+        nonlocal checks, mismatches, first
+        checks += 1
+        if got != want:
+            mismatches += 1
+            if first is None:
+                first = (seed, index, got, want)
+
+    for seed in range(seeds):
+        structure, twin = make(), make()
+        timeline = Timeline(structure).attach(structure)
+        enable_counting(structure)
+        enable_counting(twin)
+        rng, twin_rng = random.Random(seed), random.Random(seed)
+        for index in range(steps):
+            if index == steps // 2:
+                for counted in (structure, twin):
+                    enable_counting(disable_counting(counted))
+            step(structure, rng)
+            step(twin, twin_rng)
+            compare(seed, index, _state(structure), _state(twin))
+
+        if not timeline.unavailable:
+            end = len(timeline.commands)
+            timeline.seek(structure, 0)
+            timeline.seek(structure, end)
+            compare(seed, "undo and redo", _state(structure), _state(twin))
+    return checks, first, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.timeline_check",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seeds", type=int, default=DEFAULT_SEEDS, help="random operation sequences per structure")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="operations in each sequence")
+    parser.add_argument("--only", default="*", help="glob of structure names to check")
+    args = parser.parse_args(argv)
+
+    print(f"{'structure':<22}{'checks':>10}{'mismatches':>12}")
+    failed = False
+    for name, (make, step, _) in STRUCTURES.items():
+        if not fnmatch.fnmatch(name, args.only):
+            continue
+        checks, first, mismatches = check(make, step, args.seeds, args.steps)
+        print(f"{name:<22}{checks:>10,}{mismatches:>12,}")
+        if first is not None:
+            failed = True
+            seed, index, got, want = first
+            print(f"  first at seed {seed}, step {index}:\n    with timeline {got}\n    without       {want}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Batch Operation Support shared by all Data Structures
+"""
+
+import hashlib
+import sys
+from collections import Counter
+from data_structures.memory import deep_size
+
+HASH_BYTES = 16
+EMPTY_HASH = bytes(HASH_BYTES)  # Merkle hash of a missing child
+
+def merkle_hash(value, left=EMPTY_HASH, right=EMPTY_HASH):
+    """Collision-resistant hash of a subtree from its value and its children's hashes"""
+    # Frames are reused when root hashes match, so built-in hash() won't do: hash(-1) == hash(-2).
+    # The value is tagged with its type so 1, 1.0 and True differ; the child hashes have a fixed length
+    tagged = f"{type(value).__qualname__}:{value!r}".encode()
+    return hashlib.blake2b(tagged + left + right, digest_size=HASH_BYTES).digest()
+
+class BatchMixin:
+    version = 0  # Bumped on every mutation, or once per batch
+    _batch_depth = 0
+    _batch_dirty = False
+    
+    # Names of the methods apply_batch() may call; every structure lists its own
+    BATCH_OPERATIONS = ()
+    
+    def _tally(self, cost, amount):
+        """Report what a loop cost as it ran; only structures being counted keep the total"""
+    
+    def _touch(self):
+        """Record a mutation; inside a batch the version is bumped once at the end"""
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.version += 1
+    
+    def apply_batch(self, ops):
+        """Apply (operation, *args) tuples in one pass with one history entry"""
+        ops = [tuple(op) for op in ops]
+        for op in ops:
+            name = op[0] if op else None
+            if name not in self.BATCH_OPERATIONS:
+                return [], f"Unknown operation {name}"
+        if not ops:
+            return [], "No operations to apply"
+        
+        history_length = len(self.history)
+        self._batch_depth += 1
+        results = []
+        try:
+            for name, *args in ops:
+                outcome = getattr(self, name)(*args)
+                results.append(outcome[0] if isinstance(outcome, tuple) else True)  # clear() returns nothing
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self.version += 1
+        
+        # Replace the per-operation entries with one summary
+        applied = sum(1 for result in results if result is not None and result is not False)
+        counts = ", ".join(f"{name} x{count}" for name, count in Counter(op[0] for op in ops).items())
+        del self.history[history_length:]
+        self.history.append(f"Batch of {len(ops)} operations ({counts}): {applied} applied")
+        return results, f"Applied {applied} of {len(ops)} operations"
+    
+    def _element_count(self):
+        """Number of elements the structure holds, for per-element memory figures"""
+        return self.stats()['size']
+    
+    def memory_report(self):
+        """Get the deep size in bytes of the structure, broken down by attribute"""
+        seen = {id(self)}
+        parts = {}
+        for name, value in vars(self).items():
+            if not callable(value):  # Method wrappers installed on the instance aren't data
+                parts[name] = deep_size(value, seen)
+        
+        total = sys.getsizeof(self) + sum(parts.values())
+        elements = self._element_count()
+        return {
+            'total': total,
+            'elements': elements,
+            'bytes_per_element': total / elements if elements else None,
+            'parts': dict(sorted(parts.items(), key=lambda item: item[1], reverse=True)),
+        }
@@ -2,27 +2,49 @@
 Binary Tree Data Structure Implementation
 """
 
+import itertools
+from data_structures.base import EMPTY_HASH, BatchMixin, merkle_hash
+from utils.tree_layout import TidyLayout
+
 class TreeNode:
+    MEMORY_FIELDS = ("data", "left", "right", "size", "height", "hash")  # Followed by memory_report()
+    
     def __init__(self, data):
         self.data = data
         self.left = None
         self.right = None
+        self.size = 1  # Number of nodes in the subtree rooted here
+        self.height = 1  # Number of levels in the subtree rooted here
+        self.hash = merkle_hash(data)  # Merkle hash of the subtree's values and shape
 
-class BinaryTree:
+class BinaryTree(BatchMixin):
+    BATCH_OPERATIONS = ("insert", "delete", "clear")
+    
     def __init__(self):
         self.root = None
         self.history = []
         self.traversal_result = []
+        self.version = 0  # Bumped on every mutation
+        self._flat_cache = None
+        self._layout = None  # Tidy layout backing the cached flat arrays
+        self._min = None  # Smallest and largest values, kept up to date by every mutation
+        self._max = None
     
     def insert(self, data):
         """Insert a node into the binary search tree"""
         if self.root is None:
             self.root = TreeNode(data)
+            self._min = self._max = data
+            self._touch()
             self.history.append(f"Inserted {data} as root")
             return True, f"Successfully inserted {data} as root"
         
         result = self._insert_recursive(self.root, data)
         if result:
+            self._min = min(self._min, data)
+            self._max = max(self._max, data)
+            self._touch()
+            self._extend_flat_structure(data)
             self.history.append(f"Inserted {data}")
             return True, f"Successfully inserted {data}"
         else:
@@ -33,17 +55,22 @@ class BinaryTree:
         if data < node.data:
             if node.left is None:
                 node.left = TreeNode(data)
-                return True
+                inserted = True
             else:
-                return self._insert_recursive(node.left, data)
+                inserted = self._insert_recursive(node.left, data)
         elif data > node.data:
             if node.right is None:
                 node.right = TreeNode(data)
-                return True
+                inserted = True
             else:
-                return self._insert_recursive(node.right, data)
+                inserted = self._insert_recursive(node.right, data)
         else:
             return False  # Duplicate value
+        
+        if inserted:
+            node.size += 1
+            self._update_derived(node)
+        return inserted
     
     def search(self, data):
         """Search for a value in the tree"""
@@ -74,6 +101,14 @@ class BinaryTree:
         
         self.root, deleted = self._delete_recursive(self.root, data)
         if deleted:
+            # Only deleting an extreme value moves it, and the new one is one walk away
+            if self.root is None:
+                self._min = self._max = None
+            elif data == self._min:
+                self._min = self._find_min(self.root).data
+            elif data == self._max:
+                self._max = self._find_max(self.root).data
+            self._touch()
             self.history.append(f"Deleted {data}")
             return True, f"Successfully deleted {data}"
         else:
@@ -86,9 +121,15 @@ class BinaryTree:
         
         if data < node.data:
             node.left, deleted = self._delete_recursive(node.left, data)
+            if deleted:
+                node.size -= 1
+                self._update_derived(node)
             return node, deleted
         elif data > node.data:
             node.right, deleted = self._delete_recursive(node.right, data)
+            if deleted:
+                node.size -= 1
+                self._update_derived(node)
             return node, deleted
         else:
             # Node to be deleted found
@@ -101,14 +142,298 @@ class BinaryTree:
                 min_node = self._find_min(node.right)
                 node.data = min_node.data
                 node.right, _ = self._delete_recursive(node.right, min_node.data)
+                node.size -= 1
+                self._update_derived(node)
                 return node, True
     
     def _find_min(self, node):
         """Find the minimum value node in a subtree"""
+        hops = 1
         while node.left is not None:
             node = node.left
+            hops += 1
+        self._tally("hops", hops)
         return node
     
+    def _find_max(self, node):
+        """Find the maximum value node in a subtree"""
+        hops = 1
+        while node.right is not None:
+            node = node.right
+            hops += 1
+        self._tally("hops", hops)
+        return node
+    
+    def build_from(self, values):
+        """Replace the tree with a perfectly balanced BST built from values"""
+        values = list(values)
+        
+        # Sorted, duplicate-free input is used as-is; anything else is sorted once
+        if not all(a < b for a, b in zip(values, itertools.islice(values, 1, None))):
+            values = sorted(set(values))
+        
+        self.root = self._build_balanced(values)
+        self._min = values[0] if values else None
+        self._max = values[-1] if values else None
+        self._touch()
+        self.history.append(f"Built balanced tree from {len(values)} values")
+        return True, f"Successfully built balanced tree with {len(values)} nodes"
+    
+    def _build_balanced(self, values):
+        """Helper method to build a balanced subtree from sorted unique values in O(n)"""
+        if not values:
+            return None
+        
+        # Nodes are made with their final values, so leaves already have the right hash
+        root = TreeNode(values[len(values) // 2])
+        order = []
+        stack = [(root, 0, len(values))]  # (node to fill, half-open value range)
+        while stack:
+            node, low, high = stack.pop()
+            order.append(node)
+            mid = (low + high) // 2
+            node.size = high - low
+            node.height = (high - low).bit_length()  # Midpoint splits give minimal height
+            if low < mid:
+                node.left = TreeNode(values[(low + mid) // 2])
+                stack.append((node.left, low, mid))
+            if mid + 1 < high:
+                node.right = TreeNode(values[(mid + 1 + high) // 2])
+                stack.append((node.right, mid + 1, high))
+        
+        for node in reversed(order):  # Children are filled after their parent
+            if node.left is not None or node.right is not None:
+                node.hash = merkle_hash(node.data, self._hash(node.left), self._hash(node.right))
+        return root
+    
+    def rebalance(self):
+        """Rebalance the tree in place using the Day-Stout-Warren algorithm"""
+        if self.root is None:
+            return False, "Tree is empty"
+        
+        count = self.size()
+        pseudo_root = TreeNode(None)
+        pseudo_root.right = self.root
+        
+        self._tree_to_vine(pseudo_root)
+        self._vine_to_tree(pseudo_root, count)
+        
+        self.root = pseudo_root.right
+        self._recompute_sizes(self.root)
+        self._touch()
+        self.history.append(f"Rebalanced tree with {count} nodes")
+        return True, f"Successfully rebalanced tree with {count} nodes"
+    
+    def _tree_to_vine(self, pseudo_root):
+        """Flatten the tree into a right-leaning vine using right rotations"""
+        tail = pseudo_root
+        rest = tail.right
+        while rest is not None:
+            if rest.left is None:
+                tail = rest
+                rest = rest.right
+            else:
+                left = rest.left
+                rest.left = left.right
+                left.right = rest
+                rest = left
+                tail.right = left
+    
+    def _vine_to_tree(self, pseudo_root, count):
+        """Turn a vine of count nodes into a balanced tree using left rotations"""
+        leaves = count + 1 - (1 << ((count + 1).bit_length() - 1))
+        self._compress(pseudo_root, leaves)
+        count -= leaves
+        while count > 1:
+            count //= 2
+            self._compress(pseudo_root, count)
+    
+    def _compress(self, pseudo_root, rotations):
+        """Left-rotate every other node along the vine"""
+        scanner = pseudo_root
+        for _ in range(rotations):
+            child = scanner.right
+            scanner.right = child.right
+            scanner = scanner.right
+            child.right = scanner.left
+            scanner.left = child
+    
+    def _recompute_sizes(self, root):
+        """Recompute subtree sizes, heights and hashes bottom-up without recursion"""
+        order = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                order.append(node)
+                stack.append(node.left)
+                stack.append(node.right)
+        
+        # Reversed preorder visits children before their parents
+        for node in reversed(order):
+            node.size = 1 + self._size(node.left) + self._size(node.right)
+            self._update_derived(node)
+    
+    def _size(self, node):
+        """Get the size of a subtree (0 for an empty subtree)"""
+        return node.size if node is not None else 0
+    
+    def _height(self, node):
+        """Get the height of a subtree (0 for an empty subtree)"""
+        return node.height if node is not None else 0
+    
+    def _hash(self, node):
+        """Get the structural hash of a subtree (EMPTY_HASH for an empty subtree)"""
+        return node.hash if node is not None else EMPTY_HASH
+    
+    def _update_derived(self, node):
+        """Recompute the height and structural hash of node from its children's"""
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.hash = merkle_hash(node.data, self._hash(node.left), self._hash(node.right))
+    
+    def _count_below(self, data, inclusive=False):
+        """Count values smaller than (or equal to, if inclusive) data in O(h)"""
+        count = hops = 0
+        node = self.root
+        while node is not None:
+            hops += 1
+            if node.data < data or (inclusive and node.data == data):
+                count += self._size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        self._tally("hops", hops)
+        return count
+    
+    def _closest(self, data, smaller, inclusive):
+        """Find the nearest value below (smaller=True) or above data in O(h)"""
+        best = None
+        node = self.root
+        hops = 0
+        while node is not None:
+            hops += 1
+            if inclusive and node.data == data:
+                self._tally("hops", hops)
+                return node.data
+            if smaller:
+                if node.data < data:
+                    best = node.data
+                    node = node.right
+                else:
+                    node = node.left
+            else:
+                if node.data > data:
+                    best = node.data
+                    node = node.left
+                else:
+                    node = node.right
+        self._tally("hops", hops)
+        return best
+    
+    def stats(self):
+        """Get summary statistics in O(1) from incrementally maintained fields"""
+        return {
+            'size': self._size(self.root),
+            'height': self._height(self.root),
+            'min': self._min,
+            'max': self._max,
+        }
+    
+    def size(self):
+        """Get number of nodes in the tree"""
+        return self._size(self.root)
+    
+    def select(self, k):
+        """Find the k-th smallest value (0-based) using subtree sizes"""
+        if k < 0 or k >= self.size():
+            return None, f"Rank {k} is out of range"
+        
+        rank = k
+        node = self.root
+        hops = 0
+        while True:
+            hops += 1
+            left_size = self._size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k > left_size:
+                k -= left_size + 1
+                node = node.right
+            else:
+                break
+        self._tally("hops", hops)
+        
+        self.history.append(f"Selected {node.data} at rank {rank}")
+        return node.data, f"Value at rank {rank} is {node.data}"
+    
+    def rank(self, data):
+        """Count how many values in the tree are smaller than data"""
+        result = self._count_below(data)
+        self.history.append(f"Rank of {data}: {result}")
+        return result, f"{result} value(s) are smaller than {data}"
+    
+    def count_range(self, low, high):
+        """Count values in the inclusive range [low, high]"""
+        if low > high:
+            return 0, f"Empty range [{low}, {high}]"
+        
+        result = self._count_below(high, inclusive=True) - self._count_below(low)
+        self.history.append(f"Counted {result} value(s) in [{low}, {high}]")
+        return result, f"{result} value(s) in range [{low}, {high}]"
+    
+    def range_iter(self, low, high):
+        """Lazily yield values in [low, high] in sorted order, visiting O(h + k) nodes"""
+        stack = []
+        node = self.root
+        hops = 0
+        try:
+            while stack or node is not None:
+                if node is not None:
+                    hops += 1
+                    if node.data < low:
+                        # Everything in the left subtree is below the range
+                        node = node.right
+                    else:
+                        stack.append(node)
+                        node = node.left
+                else:
+                    node = stack.pop()
+                    if node.data > high:
+                        return
+                    yield node.data
+                    node = node.right
+        finally:
+            self._tally("hops", hops)  # Also when the caller stops early and the generator is closed
+    
+    def floor(self, data):
+        """Find the largest value less than or equal to data"""
+        result = self._closest(data, smaller=True, inclusive=True)
+        return self._neighbor_result("Floor", data, result)
+    
+    def ceiling(self, data):
+        """Find the smallest value greater than or equal to data"""
+        result = self._closest(data, smaller=False, inclusive=True)
+        return self._neighbor_result("Ceiling", data, result)
+    
+    def predecessor(self, data):
+        """Find the largest value strictly less than data"""
+        result = self._closest(data, smaller=True, inclusive=False)
+        return self._neighbor_result("Predecessor", data, result)
+    
+    def successor(self, data):
+        """Find the smallest value strictly greater than data"""
+        result = self._closest(data, smaller=False, inclusive=False)
+        return self._neighbor_result("Successor", data, result)
+    
+    def _neighbor_result(self, name, data, result):
+        """Helper method to report floor/ceiling/predecessor/successor results"""
+        if result is None:
+            self.history.append(f"{name} of {data}: none")
+            return None, f"{name} of {data} does not exist"
+        
+        self.history.append(f"{name} of {data}: {result}")
+        return result, f"{name} of {data} is {result}"
+    
     def inorder_traversal(self):
         """Perform inorder traversal (Left, Root, Right)"""
         self.traversal_result = []
@@ -172,9 +497,79 @@ class BinaryTree:
             'right': self._build_tree_dict(node.right)
         }
     
+    def get_flat_structure(self):
+        """Get the tree as parallel arrays for visualization, rebuilt once per version"""
+        if self._flat_cache is None or self._flat_cache['version'] != self.version:
+            self._flat_cache = self._build_flat_structure()
+        return self._flat_cache
+    
+    def _build_flat_structure(self):
+        """Helper method to export the tree level by level without recursion"""
+        # Index 0 is the root and every child comes after its parent; missing
+        # children are -1. x is the layout column and y the layout row (-depth).
+        data, left, right, depth, hashes = [], [], [], [], []
+        if self.root is not None:
+            nodes = [self.root]
+            depth.append(0)
+            for index, node in enumerate(nodes):  # nodes grows while we scan it (BFS)
+                data.append(node.data)
+                hashes.append(node.hash)
+                for child, links in ((node.left, left), (node.right, right)):
+                    if child is None:
+                        links.append(-1)
+                    else:
+                        links.append(len(nodes))
+                        nodes.append(child)
+                        depth.append(depth[index] + 1)
+        
+        self._layout = TidyLayout(left, right)
+        return {
+            'version': self.version,
+            'data': data,
+            'left': left,
+            'right': right,
+            'depth': depth,
+            'x': self._layout.positions(),
+            'y': [-d for d in depth],
+            'hash': hashes,
+        }
+    
+    def _extend_flat_structure(self, data):
+        """Append a newly inserted leaf to the cached flat arrays and layout"""
+        flat = self._flat_cache
+        if flat is None or flat['version'] != self.version - 1 or not flat['data'] or self._batch_depth:
+            return  # Rebuilt from scratch on the next get_flat_structure()
+        
+        # Follow the insertion path over the flat arrays to find the new leaf's parent,
+        # refreshing the hashes of the nodes on it, the only ones the insert changed
+        parent = 0
+        node = self.root
+        while True:
+            flat['hash'][parent] = node.hash
+            links = flat['left'] if data < flat['data'][parent] else flat['right']
+            node = node.left if data < node.data else node.right
+            if links[parent] == -1:
+                break
+            parent = links[parent]
+        
+        index = len(flat['data'])
+        links[parent] = index
+        flat['data'].append(data)
+        flat['left'].append(-1)
+        flat['right'].append(-1)
+        flat['depth'].append(flat['depth'][parent] + 1)
+        flat['y'].append(-flat['depth'][index])
+        flat['hash'].append(node.hash)
+        
+        self._layout.add_leaf(index, parent)
+        flat['x'] = self._layout.positions()
+        flat['version'] = self.version
+    
     def clear(self):
         """Clear the entire tree"""
         self.root = None
+        self._min = self._max = None
+        self._touch()
         self.history.append("Tree cleared")
     
     def get_history(self):
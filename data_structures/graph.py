@@ -3,19 +3,49 @@ Graph Data Structure Implementation (Adjacency List)
 """
 
 from collections import deque, defaultdict
+from data_structures.base import BatchMixin
 
-class Graph:
+class Graph(BatchMixin):
+    BATCH_OPERATIONS = ("add_vertex", "add_edge", "remove_vertex", "remove_edge", "clear")
+    
     def __init__(self, directed=False):
         self.adjacency_list = defaultdict(list)
         self.directed = directed
         self.history = []
         self.vertices = set()
+        self._entry_count = 0  # Total adjacency list entries (each undirected edge is stored twice)
+        self.degree_histogram = {}  # Out-degree -> number of vertices with it
+    
+    def _shift_degree(self, old_degree, new_degree):
+        """Move one vertex between degree histogram buckets"""
+        if old_degree is not None:
+            self.degree_histogram[old_degree] -= 1
+            if not self.degree_histogram[old_degree]:
+                del self.degree_histogram[old_degree]
+        if new_degree is not None:
+            self.degree_histogram[new_degree] = self.degree_histogram.get(new_degree, 0) + 1
+    
+    def _append_neighbor(self, vertex, neighbor, weight):
+        """Append one adjacency list entry, keeping the counts in step"""
+        neighbors = self.adjacency_list[vertex]
+        neighbors.append((neighbor, weight))
+        self._entry_count += 1
+        self._shift_degree(len(neighbors) - 1, len(neighbors))
+    
+    def _set_neighbors(self, vertex, neighbors):
+        """Replace the adjacency list of an existing vertex, keeping the counts in step"""
+        old_degree = len(self.adjacency_list[vertex])
+        self.adjacency_list[vertex] = neighbors
+        self._entry_count += len(neighbors) - old_degree
+        self._shift_degree(old_degree, len(neighbors))
     
     def add_vertex(self, vertex):
         """Add a vertex to the graph"""
         if vertex not in self.vertices:
             self.vertices.add(vertex)
             self.adjacency_list[vertex] = []
+            self._shift_degree(None, 0)
+            self._touch()
             self.history.append(f"Added vertex {vertex}")
             return True, f"Successfully added vertex {vertex}"
         else:
@@ -33,16 +63,59 @@ class Graph:
                 return False, f"Edge {vertex1} -> {vertex2} already exists"
         
         # Add edge
-        self.adjacency_list[vertex1].append((vertex2, weight))
+        self._append_neighbor(vertex1, vertex2, weight)
         
         # For undirected graph, add reverse edge
         if not self.directed:
-            self.adjacency_list[vertex2].append((vertex1, weight))
+            self._append_neighbor(vertex2, vertex1, weight)
         
+        self._touch()
         edge_type = "directed" if self.directed else "undirected"
         self.history.append(f"Added {edge_type} edge {vertex1} -> {vertex2} (weight: {weight})")
         return True, f"Successfully added edge {vertex1} -> {vertex2}"
     
+    def add_edges(self, edges):
+        """Add many (vertex1, vertex2, weight) edges and their vertices with one history entry"""
+        adjacency_list = self.adjacency_list
+        neighbor_sets = {}  # Neighbors of the vertices touched so far, for O(1) duplicate checks
+        old_degrees = {}  # Degree of each touched vertex before this call
+        added = 0
+        try:
+            for vertex1, vertex2, weight in edges:
+                for vertex in (vertex1, vertex2):
+                    if vertex not in self.vertices:
+                        self.vertices.add(vertex)
+                        adjacency_list[vertex] = []
+                        self._shift_degree(None, 0)
+                
+                known = neighbor_sets.get(vertex1)
+                if known is None:
+                    known = neighbor_sets[vertex1] = {neighbor for neighbor, w in adjacency_list[vertex1]}
+                if vertex2 in known:
+                    continue
+                
+                known.add(vertex2)
+                if vertex1 not in old_degrees:
+                    old_degrees[vertex1] = len(adjacency_list[vertex1])
+                adjacency_list[vertex1].append((vertex2, weight))
+                if not self.directed:
+                    if vertex2 not in old_degrees:
+                        old_degrees[vertex2] = len(adjacency_list[vertex2])
+                    adjacency_list[vertex2].append((vertex1, weight))
+                    if vertex2 in neighbor_sets:
+                        neighbor_sets[vertex2].add(vertex1)
+                added += 1
+        finally:
+            # Settle the counts once per touched vertex rather than once per edge, even
+            # if the edge stream fails part way
+            for vertex, old_degree in old_degrees.items():
+                self._shift_degree(old_degree, len(adjacency_list[vertex]))
+            self._entry_count += added if self.directed else 2 * added
+            self._touch()
+        
+        self.history.append(f"Added {added} edges ({len(self.vertices)} vertices)")
+        return added, f"Successfully added {added} edges"
+    
     def remove_vertex(self, vertex):
         """Remove a vertex and all its edges"""
         if vertex not in self.vertices:
@@ -50,12 +123,15 @@ class Graph:
         
         # Remove all edges to this vertex
         for v in self.vertices:
-            self.adjacency_list[v] = [(neighbor, weight) for neighbor, weight in self.adjacency_list[v] 
-                                     if neighbor != vertex]
+            self._set_neighbors(v, [(neighbor, weight) for neighbor, weight in self.adjacency_list[v] 
+                                    if neighbor != vertex])
         
         # Remove the vertex itself
+        self._entry_count -= len(self.adjacency_list[vertex])
+        self._shift_degree(len(self.adjacency_list[vertex]), None)
         del self.adjacency_list[vertex]
         self.vertices.remove(vertex)
+        self._touch()
         
         self.history.append(f"Removed vertex {vertex}")
         return True, f"Successfully removed vertex {vertex}"
@@ -67,17 +143,18 @@ class Graph:
         
         # Remove edge from vertex1 to vertex2
         original_length = len(self.adjacency_list[vertex1])
-        self.adjacency_list[vertex1] = [(neighbor, weight) for neighbor, weight in self.adjacency_list[vertex1] 
-                                       if neighbor != vertex2]
+        self._set_neighbors(vertex1, [(neighbor, weight) for neighbor, weight in self.adjacency_list[vertex1] 
+                                      if neighbor != vertex2])
         
         edge_removed = len(self.adjacency_list[vertex1]) < original_length
         
         # For undirected graph, remove reverse edge
         if not self.directed and edge_removed:
-            self.adjacency_list[vertex2] = [(neighbor, weight) for neighbor, weight in self.adjacency_list[vertex2] 
-                                           if neighbor != vertex1]
+            self._set_neighbors(vertex2, [(neighbor, weight) for neighbor, weight in self.adjacency_list[vertex2] 
+                                          if neighbor != vertex1])
         
         if edge_removed:
+            self._touch()
             self.history.append(f"Removed edge {vertex1} -> {vertex2}")
             return True, f"Successfully removed edge {vertex1} -> {vertex2}"
         else:
@@ -100,6 +177,7 @@ class Graph:
         visited = set()
         queue = deque([start_vertex])
         traversal_order = []
+        relaxations = 0
         
         while queue:
             vertex = queue.popleft()
@@ -108,10 +186,13 @@ class Graph:
                 traversal_order.append(vertex)
                 
                 # Add unvisited neighbors to queue
-                for neighbor, weight in self.adjacency_list[vertex]:
+                neighbors = self.adjacency_list[vertex]
+                relaxations += len(neighbors)
+                for neighbor, weight in neighbors:
                     if neighbor not in visited:
                         queue.append(neighbor)
         
+        self._tally("relaxations", relaxations)
         self.history.append(f"BFS from {start_vertex}: {traversal_order}")
         return traversal_order, f"BFS traversal: {traversal_order}"
     
@@ -122,16 +203,21 @@ class Graph:
         
         visited = set()
         traversal_order = []
+        relaxations = 0
         
         def dfs_recursive(vertex):
+            nonlocal relaxations
             visited.add(vertex)
             traversal_order.append(vertex)
             
-            for neighbor, weight in self.adjacency_list[vertex]:
+            neighbors = self.adjacency_list[vertex]
+            relaxations += len(neighbors)
+            for neighbor, weight in neighbors:
                 if neighbor not in visited:
                     dfs_recursive(neighbor)
         
         dfs_recursive(start_vertex)
+        self._tally("relaxations", relaxations)
         self.history.append(f"DFS from {start_vertex}: {traversal_order}")
         return traversal_order, f"DFS traversal: {traversal_order}"
     
@@ -142,19 +228,24 @@ class Graph:
         
         visited = set()
         queue = deque([start])
+        relaxations = 0
         
         while queue:
             vertex = queue.popleft()
             if vertex == end:
+                self._tally("relaxations", relaxations)
                 self.history.append(f"Path found from {start} to {end}")
                 return True, f"Path exists from {start} to {end}"
             
             if vertex not in visited:
                 visited.add(vertex)
-                for neighbor, weight in self.adjacency_list[vertex]:
+                neighbors = self.adjacency_list[vertex]
+                relaxations += len(neighbors)
+                for neighbor, weight in neighbors:
                     if neighbor not in visited:
                         queue.append(neighbor)
         
+        self._tally("relaxations", relaxations)
         self.history.append(f"No path from {start} to {end}")
         return False, f"No path exists from {start} to {end}"
     
@@ -198,13 +289,26 @@ class Graph:
     
     def edge_count(self):
         """Get number of edges"""
-        total_edges = sum(len(neighbors) for neighbors in self.adjacency_list.values())
-        return total_edges if self.directed else total_edges // 2
+        return self._entry_count if self.directed else self._entry_count // 2
+    
+    def stats(self):
+        """Get summary statistics in O(1) from incrementally maintained counts"""
+        return {
+            'vertices': len(self.vertices),
+            'edges': self.edge_count(),
+            'degree_histogram': dict(self.degree_histogram),
+        }
+    
+    def _element_count(self):
+        return len(self.vertices) + self.edge_count()  # Vertices and edges both cost memory
     
     def clear(self):
         """Clear the graph"""
         self.adjacency_list.clear()
         self.vertices.clear()
+        self._entry_count = 0
+        self.degree_histogram.clear()
+        self._touch()
         self.history.append("Graph cleared")
     
     def get_history(self):
@@ -2,12 +2,40 @@
 Hash Table Data Structure Implementation
 """
 
-class HashTable:
+from data_structures.base import BatchMixin
+
+class HashTable(BatchMixin):
+    BATCH_OPERATIONS = ("insert", "delete", "clear")
+    
     def __init__(self, size=10):
         self.size = size
         self.table = [[] for _ in range(self.size)]  # Using chaining for collision resolution
         self.history = []
         self.count = 0
+        self.chain_lengths = [0] * self.size  # Per-bucket item counts, kept in step with the table
+        self._reset_chain_stats()
+    
+    def _reset_chain_stats(self):
+        """Start the chain statistics for a table of empty buckets"""
+        self.chain_histogram = [self.size]  # chain_histogram[k] = number of buckets holding k items
+        self.max_chain = 0
+    
+    def _resize_chain(self, index, delta):
+        """Move bucket index to a chain length delta away, updating the statistics in O(1)"""
+        old = self.chain_lengths[index]
+        new = old + delta
+        self.chain_lengths[index] = new
+        
+        self.chain_histogram[old] -= 1
+        if new == len(self.chain_histogram):
+            self.chain_histogram.append(0)
+        self.chain_histogram[new] += 1
+        
+        # A chain only grows or shrinks by one, so the longest moves by at most one
+        if new > self.max_chain:
+            self.max_chain = new
+        elif old == self.max_chain and self.chain_histogram[old] == 0:
+            self.max_chain = new
     
     def _hash(self, key):
         """Simple hash function using modulo"""
@@ -23,27 +51,81 @@ class HashTable:
         # Check if key already exists
         for i, (k, v) in enumerate(bucket):
             if k == key:
+                self._tally("probes", i + 1)
                 old_value = bucket[i][1]
                 bucket[i] = (key, value)
+                self._touch()
                 self.history.append(f"Updated {key}: {old_value} -> {value} at index {index}")
                 return True, f"Updated {key} with new value {value}"
         
         # Add new key-value pair
+        self._tally("probes", len(bucket))
         bucket.append((key, value))
         self.count += 1
+        self._resize_chain(index, 1)
+        self._touch()
         self.history.append(f"Inserted {key}: {value} at index {index}")
         return True, f"Successfully inserted {key}: {value}"
     
+    def update(self, pairs):
+        """Insert or update many key-value pairs with one history entry"""
+        counts = [0, 0]
+        try:
+            self._insert_many(pairs, counts)
+        finally:
+            if any(counts):
+                self._touch()  # Even if the pairs stream fails part way
+        inserted, updated = counts
+        self.history.append(f"Inserted {inserted} and updated {updated} keys")
+        return inserted + updated, f"Successfully inserted {inserted} and updated {updated} keys"
+    
+    def resize(self, size):
+        """Rehash every item into a table with the given number of buckets"""
+        items = self.get_all_items()
+        self.size = size
+        self.table = [[] for _ in range(self.size)]
+        self.count = 0
+        self.chain_lengths = [0] * self.size
+        self._reset_chain_stats()
+        self._insert_many(items, [0, 0])
+        self._touch()
+        self.history.append(f"Resized hash table to {size} buckets")
+        return True, f"Successfully resized hash table to {size} buckets"
+    
+    def _insert_many(self, pairs, counts):
+        """Helper method to insert pairs without per-item history, tallying [inserted, updated] into counts"""
+        probes = 0
+        try:
+            for key, value in pairs:
+                index = self._hash(key)
+                bucket = self.table[index]
+                for i, (k, v) in enumerate(bucket):
+                    if k == key:
+                        bucket[i] = (key, value)
+                        counts[1] += 1
+                        probes += i + 1
+                        break
+                else:
+                    probes += len(bucket)
+                    bucket.append((key, value))
+                    self.count += 1
+                    self._resize_chain(index, 1)
+                    counts[0] += 1
+        finally:
+            self._tally("probes", probes)
+    
     def get(self, key):
         """Get value by key"""
         index = self._hash(key)
         bucket = self.table[index]
         
-        for k, v in bucket:
+        for i, (k, v) in enumerate(bucket):
             if k == key:
+                self._tally("probes", i + 1)
                 self.history.append(f"Found {key}: {v} at index {index}")
                 return v, f"Found {key}: {v}"
         
+        self._tally("probes", len(bucket))
         self.history.append(f"Key {key} not found")
         return None, f"Key {key} not found"
     
@@ -54,11 +136,15 @@ class HashTable:
         
         for i, (k, v) in enumerate(bucket):
             if k == key:
+                self._tally("probes", i + 1)
                 deleted_item = bucket.pop(i)
                 self.count -= 1
+                self._resize_chain(index, -1)
+                self._touch()
                 self.history.append(f"Deleted {key}: {v} from index {index}")
                 return True, f"Successfully deleted {key}: {v}"
         
+        self._tally("probes", len(bucket))
         return False, f"Key {key} not found for deletion"
     
     def contains(self, key):
@@ -66,10 +152,12 @@ class HashTable:
         index = self._hash(key)
         bucket = self.table[index]
         
-        for k, v in bucket:
+        for i, (k, v) in enumerate(bucket):
             if k == key:
+                self._tally("probes", i + 1)
                 return True, f"Key {key} exists in hash table"
         
+        self._tally("probes", len(bucket))
         return False, f"Key {key} does not exist in hash table"
     
     def get_all_items(self):
@@ -83,22 +171,40 @@ class HashTable:
         """Get current state of the hash table for visualization"""
         return [bucket.copy() for bucket in self.table]
     
+    def get_chain_lengths(self):
+        """Get the number of items in every bucket, without scanning the buckets"""
+        return self.chain_lengths.copy()
+    
     def get_load_factor(self):
         """Calculate load factor"""
         return self.count / self.size
     
     def get_collision_count(self):
-        """Count number of collisions (buckets with more than one item)"""
-        collisions = 0
-        for bucket in self.table:
-            if len(bucket) > 1:
-                collisions += len(bucket) - 1
-        return collisions
+        """Count number of collisions (items beyond the first in each bucket)"""
+        # Every occupied bucket holds one non-colliding item
+        return self.count - (self.size - self.chain_histogram[0])
+    
+    def stats(self):
+        """Get summary statistics in O(1) from incrementally maintained counts"""
+        return {
+            'size': self.size,
+            'count': self.count,
+            'load_factor': self.get_load_factor(),
+            'collisions': self.get_collision_count(),
+            'max_chain': self.max_chain,
+            'empty_buckets': self.chain_histogram[0],
+        }
+    
+    def _element_count(self):
+        return self.count
     
     def clear(self):
         """Clear all items from hash table"""
         self.table = [[] for _ in range(self.size)]
         self.count = 0
+        self.chain_lengths = [0] * self.size
+        self._reset_chain_stats()
+        self._touch()
         self.history.append("Hash table cleared")
     
     def get_history(self):
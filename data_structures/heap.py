@@ -2,11 +2,22 @@
 Heap Data Structure Implementation (Min Heap and Max Heap)
 """
 
-class Heap:
+from data_structures.base import EMPTY_HASH, BatchMixin, merkle_hash
+from utils.tree_layout import TidyLayout
+
+class Heap(BatchMixin):
+    BATCH_OPERATIONS = ("insert", "extract", "delete", "clear")
+    
     def __init__(self, heap_type="min"):
         self.heap = []
         self.heap_type = heap_type  # "min" or "max"
         self.history = []
+        self.version = 0  # Bumped on every mutation
+        self._flat_cache = None
+        self._layout_cache = None  # Layout only depends on the heap size
+        self._far_extreme = None  # Largest value of a min heap (smallest of a max heap)
+        self._hashes = None  # Merkle hash of the subtree at each position, built on first export
+        self._dirty = set()  # Positions whose value or children changed since the hashes were updated
     
     def _parent(self, index):
         """Get parent index"""
@@ -27,6 +38,13 @@ class Heap:
         else:
             return a > b
     
+    def _find_far_extreme(self):
+        """Scan the leaves, where the value farthest from the root must live"""
+        leaves = self.heap[len(self.heap) // 2:]
+        if not leaves:
+            return None
+        return max(leaves) if self.heap_type == "min" else min(leaves)
+    
     def _heapify_up(self, index):
         """Maintain heap property upward"""
         while index > 0:
@@ -59,14 +77,19 @@ class Heap:
             if smallest_or_largest == index:
                 break
             
-            # Swap and continue
+            # Swap and continue; the positions above the deepest swap are rehashed with it
             self.heap[index], self.heap[smallest_or_largest] = self.heap[smallest_or_largest], self.heap[index]
+            self._dirty.add(smallest_or_largest)
             index = smallest_or_largest
     
     def insert(self, value):
         """Insert a value into the heap"""
         self.heap.append(value)
+        self._dirty.add(len(self.heap) - 1)  # Every position a climb swaps is above this one
         self._heapify_up(len(self.heap) - 1)
+        if self._far_extreme is None or self._compare(self._far_extreme, value):
+            self._far_extreme = value
+        self._touch()
         self.history.append(f"Inserted {value} into {self.heap_type} heap")
         return True, f"Successfully inserted {value}"
     
@@ -77,14 +100,18 @@ class Heap:
         
         if len(self.heap) == 1:
             root = self.heap.pop()
+            self._far_extreme = None
+            self._touch()
             self.history.append(f"Extracted {root} from {self.heap_type} heap")
             return root, f"Extracted {root}"
         
         # Store root and replace with last element
         root = self.heap[0]
         self.heap[0] = self.heap.pop()
+        self._dirty.update((0, len(self.heap)))  # The vacated last position changes its parent
         self._heapify_down(0)
         
+        self._touch()
         self.history.append(f"Extracted {root} from {self.heap_type} heap")
         return root, f"Extracted {root}"
     
@@ -102,13 +129,17 @@ class Heap:
         try:
             index = self.heap.index(value)
         except ValueError:
+            self._tally("comparisons", len(self.heap))
             return False, f"Value {value} not found in heap"
+        self._tally("comparisons", index + 1)  # Finding the value is a linear scan of the array
         
         # Replace with last element
         last_element = self.heap.pop()
+        self._dirty.add(len(self.heap))
         
         if index < len(self.heap):
             self.heap[index] = last_element
+            self._dirty.add(index)
             
             # Heapify both up and down to maintain heap property
             parent_index = self._parent(index)
@@ -118,18 +149,26 @@ class Heap:
             else:
                 self._heapify_down(index)
         
+        # Deleting is already linear, so a lost extreme is simply found again
+        if value == self._far_extreme:
+            self._far_extreme = self._find_far_extreme()
+        self._touch()
         self.history.append(f"Deleted {value} from {self.heap_type} heap")
         return True, f"Successfully deleted {value}"
     
     def build_heap(self, array):
         """Build heap from an array"""
         self.heap = array.copy()
+        self._hashes = None
         
         # Start from last non-leaf node and heapify down
         for i in range(len(self.heap) // 2 - 1, -1, -1):
             self._heapify_down(i)
         
-        self.history.append(f"Built {self.heap_type} heap from array: {array}")
+        self._far_extreme = self._find_far_extreme()
+        self._touch()
+        shown = array if len(array) <= 20 else f"{len(array)} values"
+        self.history.append(f"Built {self.heap_type} heap from array: {shown}")
         return True, f"Successfully built heap from array"
     
     def heap_sort(self):
@@ -138,6 +177,8 @@ class Heap:
             return [], "Heap is empty"
         
         original_heap = self.heap.copy()
+        far_extreme = self._far_extreme
+        dirty = self._dirty.copy()
         sorted_array = []
         
         while self.heap:
@@ -146,6 +187,9 @@ class Heap:
         
         # Restore original heap
         self.heap = original_heap
+        self._far_extreme = far_extreme
+        self._dirty = dirty  # The hashes themselves are only updated on export
+        self._touch()
         
         # For min heap, reverse to get ascending order
         if self.heap_type == "min":
@@ -154,6 +198,16 @@ class Heap:
         self.history.append(f"Performed heap sort: {sorted_array}")
         return sorted_array, f"Heap sort completed: {sorted_array}"
     
+    def stats(self):
+        """Get summary statistics in O(1) from incrementally maintained fields"""
+        root = self.heap[0] if self.heap else None
+        return {
+            'size': len(self.heap),
+            'height': len(self.heap).bit_length(),
+            'min': root if self.heap_type == "min" else self._far_extreme,
+            'max': self._far_extreme if self.heap_type == "min" else root,
+        }
+    
     def get_heap_array(self):
         """Get heap as array for visualization"""
         return self.heap.copy()
@@ -180,6 +234,86 @@ class Heap:
             'right': self._build_tree_dict(right_index) if right_index < len(self.heap) else None
         }
     
+    def get_flat_structure(self):
+        """Get the heap as parallel arrays for visualization, rebuilt once per version"""
+        if self._flat_cache is None or self._flat_cache['version'] != self.version:
+            self._flat_cache = self._build_flat_structure()
+        return self._flat_cache
+    
+    def _build_flat_structure(self):
+        """Helper method to export the implicit tree; index i is heap position i"""
+        n = len(self.heap)
+        layout = self._layout_cache
+        if layout is not None and layout['n'] > 0 and layout['n'] == n - 1:
+            # One element was appended under an existing root: extend the shape and layout incrementally
+            index = n - 1
+            parent = self._parent(index)
+            if index == self._left_child(parent):
+                layout['left'][parent] = index
+            else:
+                layout['right'][parent] = index
+            layout['left'].append(-1)
+            layout['right'].append(-1)
+            layout['depth'].append((index + 1).bit_length() - 1)
+            layout['y'].append(-layout['depth'][index])
+            layout['tidy'].add_leaf(index, parent)
+            layout['x'] = layout['tidy'].positions()
+            layout['n'] = n
+        elif layout is None or layout['n'] != n:
+            left = [2 * i + 1 if 2 * i + 1 < n else -1 for i in range(n)]
+            right = [2 * i + 2 if 2 * i + 2 < n else -1 for i in range(n)]
+            depth = [(i + 1).bit_length() - 1 for i in range(n)]
+            tidy = TidyLayout(left, right)
+            layout = self._layout_cache = {
+                'n': n,
+                'left': left,
+                'right': right,
+                'depth': depth,
+                'tidy': tidy,
+                'x': tidy.positions(),
+                'y': [-d for d in depth],
+            }
+        
+        return {
+            'version': self.version,
+            'data': self.heap.copy(),
+            'left': layout['left'],
+            'right': layout['right'],
+            'depth': layout['depth'],
+            'x': layout['x'],
+            'y': layout['y'],
+            'hash': self._update_hashes().copy(),
+        }
+    
+    def _update_hashes(self):
+        """Rehash the changed positions and their ancestors, children before parents"""
+        heap = self.heap
+        n = len(heap)
+        if self._hashes is None:
+            self._hashes = [EMPTY_HASH] * n
+            pending = range(n - 1, -1, -1)
+        else:
+            del self._hashes[n:]
+            self._hashes.extend([EMPTY_HASH] * (n - len(self._hashes)))
+            # A change at a position changes the hash of every position above it
+            marked = set()
+            for index in self._dirty:
+                while index not in marked:
+                    marked.add(index)
+                    if index == 0:
+                        break
+                    index = self._parent(index)
+            pending = sorted(marked, reverse=True)  # Children sit at higher positions than parents
+        
+        hashes = self._hashes
+        for index in pending:
+            if index < n:  # Positions vacated by a pop only pass the change on to their parent
+                left, right = 2 * index + 1, 2 * index + 2
+                hashes[index] = merkle_hash(heap[index], hashes[left] if left < n else EMPTY_HASH,
+                                            hashes[right] if right < n else EMPTY_HASH)
+        self._dirty.clear()
+        return hashes
+    
     def size(self):
         """Get heap size"""
         return len(self.heap)
@@ -191,6 +325,9 @@ class Heap:
     def clear(self):
         """Clear the heap"""
         self.heap.clear()
+        self._far_extreme = None
+        self._hashes = None
+        self._touch()
         self.history.append(f"{self.heap_type.title()} heap cleared")
     
     def get_history(self):
@@ -0,0 +1,226 @@
+"""
+Opt-in Operation Counting (comparisons, swaps, pointer hops, bucket probes, edge relaxations)
+"""
+
+# Counting works by swapping an instance's class for a counting subclass, so a
+# structure that isn't being counted runs the plain class with no extra work.
+# The subclasses only wrap existing methods; costs of loops inside a method are
+# derived from where the loop stopped, or reported by the loop itself through
+# _tally(), which the plain classes leave empty, rather than by copying the loop.
+
+import functools
+from collections import Counter
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList, SKIP_STRIDE
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+
+_END = object()
+
+def _total(structure, name, counts):
+    """Add one call of an operation and what it cost to the structure's totals"""
+    totals = structure.op_counts.setdefault(name, Counter())
+    totals["calls"] += 1
+    totals.update(counts)
+    structure.last_operation = (name, dict(counts))
+
+def _operation(method):
+    """Wrap a public method so the counts it causes are totalled under its name"""
+    @functools.wraps(method)
+    def counted(self, *args, **kwargs):
+        if self._op_depth:  # Nested call such as insert_at_position -> insert_at_end
+            return method(self, *args, **kwargs)
+
+        self._counts = Counter()
+        self._op_depth = 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._op_depth = 0
+            _total(self, method.__name__, self._counts)
+    return counted
+
+def _generator_operation(method):
+    """Wrap a public generator method, which works as it is consumed, so each step counts towards it"""
+    @functools.wraps(method)
+    def counted(self, *args, **kwargs):
+        counts = Counter()
+        values = method(self, *args, **kwargs)
+
+        def step(advance):
+            # Other operations may run between steps, so each step gets this call's counts back
+            outer, self._counts = self._counts, counts
+            self._op_depth += 1
+            try:
+                return advance()
+            finally:
+                self._op_depth -= 1
+                self._counts = outer
+
+        try:
+            while True:
+                value = step(lambda: next(values, _END))
+                if value is _END:
+                    return
+                yield value
+        finally:
+            step(values.close)  # Runs the walk's own cleanup when the caller stops early
+            _total(self, method.__name__, counts)
+    return counted
+
+def _counting(*operations):
+    """Class decorator wrapping the named public operations with _operation"""
+    def decorate(cls):
+        for name in operations:
+            setattr(cls, name, _operation(getattr(cls, name)))
+        return cls
+    return decorate
+
+def _counts_hops(method):
+    """Wrap a recursive tree helper so each visit of a real node counts as one hop"""
+    @functools.wraps(method)
+    def counted(self, node, *args):
+        if node is not None:
+            self._counts["hops"] += 1
+        return method(self, node, *args)
+    return counted
+
+class _Counting:
+    def _tally(self, cost, amount):
+        self._counts[cost] += amount
+    
+    def _reset_counts(self):
+        """Start counting from zero"""
+        self._counts = Counter()  # Costs of the running operation, replaced by each new one
+        self._op_depth = 0
+        self.op_counts = {}  # Operation name -> Counter of calls and costs
+        self.last_operation = None  # (name, counts) of the most recent operation
+
+@_counting(*Stack.BATCH_OPERATIONS, "extend", "peek")
+class _CountingStack(_Counting, Stack):
+    pass  # Every operation is O(1); only calls are counted
+
+@_counting(*Queue.BATCH_OPERATIONS, "extend", "front", "rear")
+class _CountingQueue(_Counting, Queue):
+    def dequeue(self):
+        # Popping the front of a Python list shifts every remaining item
+        if self.items:
+            self._counts["shifts"] += len(self.items) - 1
+        return Queue.dequeue(self)
+
+@_counting(*LinkedList.BATCH_OPERATIONS, "extend", "search")
+class _CountingLinkedList(_Counting, LinkedList):
+    def insert_at_end(self, data):
+        # Without a tail pointer the append walks from the head to the last node
+        if self.head is not None and not (self.doubly and self.tail):
+            self._counts["hops"] += self.size - 1
+        return LinkedList.insert_at_end(self, data)
+    
+    def insert_at_position(self, data, position):
+        if 0 < position < self.size:
+            self._counts["hops"] += position - 1
+        return LinkedList.insert_at_position(self, data, position)
+    
+    def search(self, data):
+        position, message = LinkedList.search(self, data)
+        self._counts["hops"] += position if position != -1 else self.size
+        return position, message
+    
+    def _build_skip_index(self):
+        self._counts["hops"] += self.size
+        LinkedList._build_skip_index(self)
+    
+    def _node_at(self, position):
+        node = LinkedList._node_at(self, position)  # May build the skip index first
+        self._counts["hops"] += position % SKIP_STRIDE
+        return node
+
+@_counting(*BinaryTree.BATCH_OPERATIONS, "search", "build_from", "rebalance",
+           "inorder_traversal", "preorder_traversal", "postorder_traversal",
+           "select", "rank", "count_range", "floor", "ceiling", "predecessor", "successor")
+class _CountingBinaryTree(_Counting, BinaryTree):
+    range_iter = _generator_operation(BinaryTree.range_iter)
+    _insert_recursive = _counts_hops(BinaryTree._insert_recursive)
+    _search_recursive = _counts_hops(BinaryTree._search_recursive)
+    _delete_recursive = _counts_hops(BinaryTree._delete_recursive)
+    _inorder_recursive = _counts_hops(BinaryTree._inorder_recursive)
+    _preorder_recursive = _counts_hops(BinaryTree._preorder_recursive)
+    _postorder_recursive = _counts_hops(BinaryTree._postorder_recursive)
+
+@_counting(*HashTable.BATCH_OPERATIONS, "get", "contains", "update", "resize")
+class _CountingHashTable(_Counting, HashTable):
+    pass  # Bucket scans report their probes through _tally()
+
+@_counting(*Heap.BATCH_OPERATIONS, "build_heap", "heap_sort", "peek")
+class _CountingHeap(_Counting, Heap):
+    _won = 0  # Comparisons that came out true
+    _levels = 0  # Levels visited by _heapify_down, one _left_child call each
+    
+    def _compare(self, a, b):
+        result = Heap._compare(self, a, b)
+        self._counts["comparisons"] += 1
+        self._won += result
+        return result
+    
+    def _left_child(self, index):
+        self._levels += 1
+        return Heap._left_child(self, index)
+    
+    def _heapify_up(self, index):
+        # Every comparison the climbing value wins is followed by one swap
+        won = self._won
+        Heap._heapify_up(self, index)
+        self._counts["swaps"] += self._won - won
+    
+    def _heapify_down(self, index):
+        # Every level visited but the last ends in a swap
+        levels = self._levels
+        Heap._heapify_down(self, index)
+        self._counts["swaps"] += self._levels - levels - 1
+
+@_counting(*Graph.BATCH_OPERATIONS, "add_edges", "bfs", "dfs", "has_path", "get_neighbors")
+class _CountingGraph(_Counting, Graph):
+    pass  # Traversals report the adjacency entries they scan through _tally()
+
+COUNTING_CLASSES = {
+    Stack: _CountingStack,
+    Queue: _CountingQueue,
+    LinkedList: _CountingLinkedList,
+    BinaryTree: _CountingBinaryTree,
+    HashTable: _CountingHashTable,
+    Heap: _CountingHeap,
+    Graph: _CountingGraph,
+}
+PLAIN_CLASSES = {counting: plain for plain, counting in COUNTING_CLASSES.items()}
+
+def is_counting(structure):
+    """Check whether operation counting is enabled on a structure"""
+    return type(structure) in PLAIN_CLASSES
+
+def enable_counting(structure):
+    """Start counting the operations of a structure, from zero"""
+    if not is_counting(structure):
+        structure.__class__ = COUNTING_CLASSES[type(structure)]
+        structure._reset_counts()
+    return structure
+
+def disable_counting(structure):
+    """Stop counting, returning the structure to its plain uninstrumented class"""
+    if is_counting(structure):
+        structure.__class__ = PLAIN_CLASSES[type(structure)]
+    return structure
+
+def reset_counts(structure):
+    """Zero the counts of a structure that is being counted"""
+    if is_counting(structure):
+        structure._reset_counts()
+
+def operation_counts(structure):
+    """Get {operation: {'calls': n, cost: total, ...}} for a counted structure"""
+    if not is_counting(structure):
+        return {}
+    return {name: dict(counts) for name, counts in structure.op_counts.items()}
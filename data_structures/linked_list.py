@@ -2,19 +2,28 @@
 Linked List Data Structure Implementation
 """
 
+from data_structures.base import BatchMixin
+
+SKIP_STRIDE = 64  # Nodes between consecutive entries of the skip index
+
 class Node:
+    MEMORY_FIELDS = ("data", "next", "prev")  # Followed by memory_report()
+    
     def __init__(self, data):
         self.data = data
         self.next = None
         self.prev = None  # For doubly linked list
 
-class LinkedList:
+class LinkedList(BatchMixin):
+    BATCH_OPERATIONS = ("insert_at_beginning", "insert_at_end", "insert_at_position", "delete", "clear")
+    
     def __init__(self, doubly=False):
         self.head = None
         self.tail = None  # For doubly linked list
         self.doubly = doubly
         self.size = 0
         self.history = []
+        self._skip_index = None  # Every SKIP_STRIDE-th node, rebuilt lazily after edits
     
     def insert_at_beginning(self, data):
         """Insert a node at the beginning of the list"""
@@ -31,6 +40,8 @@ class LinkedList:
             self.head = new_node
         
         self.size += 1
+        self._skip_index = None
+        self._touch()
         self.history.append(f"Inserted {data} at beginning")
         return True, f"Successfully inserted {data} at beginning"
     
@@ -56,10 +67,47 @@ class LinkedList:
                     new_node.prev = current
                     self.tail = new_node
         
+        # Appending keeps every earlier position, so the skip index only grows
+        if self._skip_index is not None and self.size % SKIP_STRIDE == 0:
+            self._skip_index.append(new_node)
         self.size += 1
+        self._touch()
         self.history.append(f"Inserted {data} at end")
         return True, f"Successfully inserted {data} at end"
     
+    def extend(self, values):
+        """Append many values at the end in one pass"""
+        # Singly linked lists don't track their tail; the skip index finds it quickly
+        tail = self.tail if self.doubly else None
+        if tail is None and self.head is not None:
+            tail = self._node_at(self.size - 1)
+        
+        count = 0
+        try:
+            for data in values:
+                new_node = Node(data)
+                if tail is None:
+                    self.head = new_node
+                else:
+                    tail.next = new_node
+                    if self.doubly:
+                        new_node.prev = tail
+                tail = new_node
+                
+                if self._skip_index is not None and self.size % SKIP_STRIDE == 0:
+                    self._skip_index.append(new_node)
+                self.size += 1
+                count += 1
+        finally:
+            # Keep the list consistent if the values stream fails part way
+            if self.doubly:
+                self.tail = tail
+            if count:
+                self._touch()
+        
+        self.history.append(f"Inserted {count} values at end")
+        return count, f"Successfully inserted {count} values at end"
+    
     def insert_at_position(self, data, position):
         """Insert a node at a specific position"""
         if position < 0 or position > self.size:
@@ -86,6 +134,8 @@ class LinkedList:
                 new_node.next.prev = new_node
         
         self.size += 1
+        self._skip_index = None
+        self._touch()
         self.history.append(f"Inserted {data} at position {position}")
         return True, f"Successfully inserted {data} at position {position}"
     
@@ -102,12 +152,17 @@ class LinkedList:
             elif self.doubly:
                 self.tail = None
             self.size -= 1
+            self._skip_index = None
+            self._touch()
             self.history.append(f"Deleted {data}")
             return True, f"Successfully deleted {data}"
         
         current = self.head
+        hops = 0
         while current.next and current.next.data != data:
             current = current.next
+            hops += 1
+        self._tally("hops", hops)
         
         if current.next:
             node_to_delete = current.next
@@ -120,6 +175,8 @@ class LinkedList:
                     self.tail = current
             
             self.size -= 1
+            self._skip_index = None
+            self._touch()
             self.history.append(f"Deleted {data}")
             return True, f"Successfully deleted {data}"
         
@@ -148,11 +205,54 @@ class LinkedList:
             current = current.next
         return result
     
+    def _build_skip_index(self):
+        """Record every SKIP_STRIDE-th node in one pass over the list"""
+        self._skip_index = []
+        current = self.head
+        position = 0
+        while current:
+            if position % SKIP_STRIDE == 0:
+                self._skip_index.append(current)
+            current = current.next
+            position += 1
+    
+    def _node_at(self, position):
+        """Get the node at position, walking from the nearest skip index entry"""
+        if self._skip_index is None:
+            self._build_skip_index()
+        
+        current = self._skip_index[position // SKIP_STRIDE]
+        for _ in range(position % SKIP_STRIDE):
+            current = current.next
+        return current
+    
+    def iter_slice(self, start, stop):
+        """Yield the data at positions start..stop-1 without walking from the head"""
+        start = max(0, start)
+        stop = min(stop, self.size)
+        if start >= stop:
+            return
+        
+        current = self._node_at(start)
+        for _ in range(start, stop):
+            yield current.data
+            current = current.next
+    
+    def stats(self):
+        """Get summary statistics in O(1)"""
+        return {
+            'size': self.size,
+            'head': self.head.data if self.head else None,
+            'tail': self.tail.data if self.tail else None,  # Only tracked for doubly linked lists
+        }
+    
     def clear(self):
         """Clear the entire list"""
         self.head = None
         self.tail = None
         self.size = 0
+        self._skip_index = None
+        self._touch()
         self.history.append("List cleared")
     
     def get_history(self):
@@ -0,0 +1,275 @@
+"""
+Persistent Binary Search Tree with Structurally Shared Versions
+"""
+
+# Nodes never change once built. An insert or delete copies only the nodes on the path
+# from the root to the change and points the copies at the untouched subtrees, so every
+# new version costs O(height) nodes and every older version stays valid. Versions made
+# from one another share each subtree neither of them changed, which diff() relies on.
+
+import sys
+from data_structures.memory import deep_size
+from utils.tree_layout import TidyLayout
+
+MAX_VERSIONS = 200  # Versions a TreeVersions keeps, oldest dropped first
+NODE_BUDGET = 100_000  # Nodes the kept versions may hold, about 10 MiB, well within a session's memory cap
+PATH_OPERATIONS = ("insert", "delete")  # Timeline commands TreeVersions replays by path copying
+
+class PersistentNode:
+    __slots__ = ("data", "left", "right", "size", "height")
+    MEMORY_FIELDS = __slots__  # Followed by memory_report()
+    
+    def __init__(self, data, left=None, right=None):
+        self.data = data
+        self.left = left
+        self.right = right
+        self.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        self.height = 1 + max(left.height if left else 0, right.height if right else 0)
+
+def _rebuild(path, node):
+    """Copy a root-to-change path bottom-up on top of the changed subtree; returns the new root"""
+    for parent, went_left in reversed(path):
+        if went_left:
+            node = PersistentNode(parent.data, node, parent.right)
+        else:
+            node = PersistentNode(parent.data, parent.left, node)
+    return node
+
+class PersistentTree:
+    """One immutable version of a binary search tree; insert and delete return a new version"""
+    
+    __slots__ = ("root", "label", "created")
+    MEMORY_FIELDS = ("root", "label")  # Followed by memory_report()
+    
+    def __init__(self, root=None, label="Empty", created=0):
+        self.root = root
+        self.label = label  # What the change that made this version was
+        self.created = created  # Nodes this version added on top of the one it came from
+    
+    @classmethod
+    def from_root(cls, root, label="Copied"):
+        """Copy any data/left/right node tree, such as a BinaryTree's, keeping its shape"""
+        if root is None:
+            return cls(None, label)
+        
+        # Children are copied before their parents, so each node is built once, complete
+        order = [root]
+        for node in order:  # Grows while we scan it (BFS)
+            order.extend(child for child in (node.left, node.right) if child is not None)
+        copies = {}
+        for node in reversed(order):
+            copies[id(node)] = PersistentNode(node.data, copies.get(id(node.left)), copies.get(id(node.right)))
+        return cls(copies[id(root)], label, len(order))
+    
+    def size(self):
+        return self.root.size if self.root else 0
+    
+    def height(self):
+        return self.root.height if self.root else 0
+    
+    def find(self, data):
+        """The node holding a value, or None"""
+        node = self.root
+        while node is not None and node.data != data:
+            node = node.left if data < node.data else node.right
+        return node
+    
+    def insert(self, data, label=None):
+        """New version with the value added; this version itself if it was already there"""
+        path = []
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return self
+            path.append((node, data < node.data))
+            node = node.left if data < node.data else node.right
+        return PersistentTree(_rebuild(path, PersistentNode(data)), label or f"Inserted {data}", len(path) + 1)
+    
+    def delete(self, data, label=None):
+        """New version without the value; this version itself if it wasn't there"""
+        path = []
+        node = self.root
+        while node is not None and node.data != data:
+            path.append((node, data < node.data))
+            node = node.left if data < node.data else node.right
+        if node is None:
+            return self
+        
+        created = len(path)
+        if node.left is None:
+            replacement = node.right
+        elif node.right is None:
+            replacement = node.left
+        else:
+            # Two children: the in-order successor takes its place, as in BinaryTree.delete
+            successor_path = []
+            successor = node.right
+            while successor.left is not None:
+                successor_path.append((successor, True))
+                successor = successor.left
+            right = _rebuild(successor_path, successor.right)
+            replacement = PersistentNode(successor.data, node.left, right)
+            created += len(successor_path) + 1
+        return PersistentTree(_rebuild(path, replacement), label or f"Deleted {data}", created)
+    
+    def inorder(self):
+        """Values in sorted order, without recursion"""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.data
+            node = node.right
+    
+    def get_flat_structure(self):
+        """The version as the parallel arrays BinaryTree.get_flat_structure exports"""
+        data, left, right, depth = [], [], [], []
+        if self.root is not None:
+            nodes = [self.root]
+            depth.append(0)
+            for index, node in enumerate(nodes):  # nodes grows while we scan it (BFS)
+                data.append(node.data)
+                for child, links in ((node.left, left), (node.right, right)):
+                    if child is None:
+                        links.append(-1)
+                    else:
+                        links.append(len(nodes))
+                        nodes.append(child)
+                        depth.append(depth[index] + 1)
+        
+        return {
+            'version': id(self.root),  # Immutable, so the root identifies the contents
+            'data': data,
+            'left': left,
+            'right': right,
+            'depth': depth,
+            'x': TidyLayout(left, right).positions(),
+            'y': [-d for d in depth],
+        }
+
+def diff(old, new):
+    """What changed from one version to another, visiting only the nodes they don't share"""
+    # A node of one version is in the other exactly when looking its value up there finds
+    # that same object, and then its whole subtree is shared too, so the walk stops there.
+    # Versions derived from each other share all but O(height) nodes per change; unrelated
+    # copies share nothing and cost O(n * height).
+    added, removed, copied = [], [], []
+    shared = 0
+    
+    stack = [new.root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        match = old.find(node.data)
+        if match is node:
+            shared += node.size
+            continue
+        (added if match is None else copied).append(node.data)
+        stack.extend((node.left, node.right))
+    
+    stack = [old.root]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        match = new.find(node.data)
+        if match is node:
+            continue
+        if match is None:
+            removed.append(node.data)
+        stack.extend((node.left, node.right))
+    
+    # Copied values sit on the changed paths: present in both versions, but in new nodes
+    return {'added': sorted(added), 'removed': sorted(removed), 'copied': sorted(copied), 'shared': shared}
+
+class TreeVersions:
+    """Persistent versions of a BinaryTree, one per change, kept in step with its timeline"""
+    
+    def __init__(self, max_versions=MAX_VERSIONS, node_budget=NODE_BUDGET):
+        self.max_versions = max_versions
+        self.node_budget = node_budget
+        self.versions = []  # PersistentTree per change, oldest first
+        self._tree = None  # id() of the BinaryTree last synced, which a restore can replace
+        self._timeline = None
+        self._recorded = 0  # Timeline steps recorded when last synced
+        self._tree_version = None  # BinaryTree.version when last synced
+        self.too_large = None  # Size of the tree last synced if it was over the budget, so no versions are kept
+    
+    def __len__(self):
+        return len(self.versions)
+    
+    def nodes(self):
+        """Upper bound on the nodes the kept versions hold: all of the oldest, plus those each newer one created"""
+        if not self.versions:
+            return 0
+        # Nodes of dropped versions that newer ones still share are within the oldest kept version
+        return self.versions[0].size() + sum(version.created for version in self.versions[1:])
+    
+    def clear(self):
+        """Drop every version; the next sync starts again from a copy of the tree"""
+        self.versions = []
+        self._tree = self._timeline = self._tree_version = self.too_large = None
+        self._recorded = 0
+    
+    def _element_count(self):
+        return self.nodes()
+    
+    def memory_report(self):
+        """Deep size of the kept versions, in the same form as BatchMixin.memory_report()"""
+        parts = {'versions': deep_size(self.versions, {id(self)})}  # The timeline is the page's, not counted here
+        total = sys.getsizeof(self) + parts['versions']
+        elements = self.nodes()
+        return {
+            'total': total,
+            'elements': elements,
+            'bytes_per_element': total / elements if elements else None,
+            'parts': parts,
+        }
+    
+    def sync(self, tree, timeline=None):
+        """Add a version for every change made to the tree since the last sync"""
+        if self._tree_version is not None and id(tree) == self._tree and tree.version == self._tree_version:
+            return False
+        
+        steps = self._new_commands(tree, timeline)
+        if steps is not None and self.versions:
+            # Inserts and deletes are replayed by path copying, sharing everything else
+            latest = self.versions[-1]
+            for (name, args, kwargs), label in steps:
+                latest = getattr(latest, name)(*args, label=label, **kwargs)
+                self.versions.append(latest)
+        elif tree._element_count() > self.node_budget:
+            self.versions = []  # Even one copy would be over the budget
+        else:
+            # Undo, seeks and bulk changes copy the tree once, with the shape it has now
+            label = timeline.label(timeline.position) if timeline and not timeline.unavailable else "Current tree"
+            self.versions.append(PersistentTree.from_root(tree.root, label))
+        
+        self._tree = id(tree)
+        self._timeline = timeline
+        self._recorded = getattr(timeline, "recorded", 0)
+        self._tree_version = tree.version
+        
+        # Dropping the oldest versions frees whatever no newer version shares
+        while self.versions and (len(self.versions) > self.max_versions or self.nodes() > self.node_budget):
+            self.versions.pop(0)
+        self.too_large = None if self.versions else tree._element_count()
+        return True
+    
+    def _new_commands(self, tree, timeline):
+        """The timeline's newest (command, label) steps if they alone explain the change, else None"""
+        if timeline is None or timeline is not self._timeline or timeline.unavailable or id(tree) != self._tree:
+            return None
+        count = timeline.recorded - self._recorded
+        # Each insert or delete bumps the version once; any seek in between bumps it once more
+        if count <= 0 or count > timeline.position or tree.version - self._tree_version != count:
+            return None
+        start = timeline.position - count
+        commands = timeline.commands[start:timeline.position]
+        if any(command is None or command[0] not in PATH_OPERATIONS for command in commands):
+            return None
+        return list(zip(commands, timeline.labels[start:timeline.position]))
@@ -2,7 +2,11 @@
 Queue Data Structure Implementation
 """
 
-class Queue:
+from data_structures.base import BatchMixin
+
+class Queue(BatchMixin):
+    BATCH_OPERATIONS = ("enqueue", "dequeue", "clear")
+    
     def __init__(self, max_size=10):
         self.items = []
         self.max_size = max_size
@@ -14,15 +18,30 @@ class Queue:
             return False, "Queue Overflow! Maximum size reached."
         
         self.items.append(item)
+        self._touch()
         self.history.append(f"Enqueued {item} to queue")
         return True, f"Successfully enqueued {item}"
     
+    def extend(self, items):
+        """Enqueue many items at once, stopping when the queue is full"""
+        items = list(items)
+        accepted = items[:max(0, self.max_size - len(self.items))]
+        self.items.extend(accepted)
+        if accepted:
+            self._touch()
+        
+        self.history.append(f"Enqueued {len(accepted)} items to queue")
+        if len(accepted) < len(items):
+            return len(accepted), f"Enqueued {len(accepted)} items; queue full, {len(items) - len(accepted)} rejected"
+        return len(accepted), f"Successfully enqueued {len(accepted)} items"
+    
     def dequeue(self):
         """Remove and return the front item from the queue"""
         if self.is_empty():
             return None, "Queue Underflow! Queue is empty."
         
         item = self.items.pop(0)
+        self._touch()
         self.history.append(f"Dequeued {item} from queue")
         return item, f"Successfully dequeued {item}"
     
@@ -56,9 +75,19 @@ class Queue:
         """Return the current size of the queue"""
         return len(self.items)
     
+    def stats(self):
+        """Get summary statistics in O(1)"""
+        return {
+            'size': len(self.items),
+            'capacity': self.max_size,
+            'front': self.items[0] if self.items else None,
+            'rear': self.items[-1] if self.items else None,
+        }
+    
     def clear(self):
         """Clear all items from the queue"""
         self.items.clear()
+        self._touch()
         self.history.append("Queue cleared")
     
     def get_items(self):
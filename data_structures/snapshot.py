@@ -0,0 +1,441 @@
+"""
+Compact Binary Snapshots of Data Structures
+"""
+
+# A snapshot is MAGIC, a format version byte and a flags byte (bit 0: zlib), then a body
+# of a uint32 header length, a JSON header and the NumPy buffers it lists, back to back.
+# Every layout is flat: values in order for stacks, queues, heaps and linked lists,
+# preorder values with a packed child bitmap for BSTs, per-bucket chain lengths with the
+# keys and values in bucket order for hash tables, and CSR arrays for graphs. Encoding
+# and decoding are loops over those arrays, so no structure recurses however deep it is,
+# and nothing is unpickled, so an uploaded snapshot can't run code.
+#
+# Uploads are decoded with max_elements set. The header's own claims aren't trusted:
+# the decompressed body is capped at a size the element limit allows before any of it
+# is inflated, every buffer's length is checked against that limit, and the decoded
+# structure must hold the element count the header states and keep its ordering
+# invariants before it is handed back.
+
+import json
+import struct
+import zlib
+from collections import Counter
+import numpy as np
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList, Node
+from data_structures.base import EMPTY_HASH, merkle_hash
+from data_structures.binary_tree import BinaryTree, TreeNode
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+
+MAGIC = b"DSVS"
+FORMAT_VERSION = 1
+COMPRESSED = 1
+PREAMBLE = struct.Struct("<4sBB")
+HEADER_LENGTH = struct.Struct("<I")
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+TAGS = {"int": 0, "float": 1, "str": 2, "bigint": 3, "false": 4, "true": 5, "none": 6}  # Mixed columns
+DTYPES = {np.dtype(dtype).str: np.dtype(dtype) for dtype in (np.int64, np.float64, np.uint8)}  # Buffer dtypes
+
+# Limits applied when decoding with max_elements
+MAX_HEADER_BYTES = 1 << 16  # Headers are a few hundred bytes of JSON
+BYTES_PER_ELEMENT = 256  # Body bytes allowed per element, string values included
+HISTORY_ENTRIES = 10_000
+HISTORY_BYTES = 4 << 20  # Body bytes allowed for the history on top of the elements
+
+class _Writer:
+    """Collects the header fields and buffers of one snapshot"""
+    
+    def __init__(self, structure, cls):
+        self.header = {"type": cls.__name__, "elements": structure._element_count(),
+                       "version": structure.version, "buffers": []}
+        self.buffers = []
+    
+    def array(self, name, values, dtype):
+        array = np.ascontiguousarray(values, dtype=dtype)
+        self.header["buffers"].append([name, array.dtype.str, array.nbytes])
+        self.buffers.append(array.tobytes())
+    
+    def values(self, name, values):
+        """Store a list of ints, floats, strings, booleans or None in the tightest column it fits"""
+        kinds = {type(value) for value in values}
+        if kinds <= {int} and all(INT64_MIN <= value <= INT64_MAX for value in values):
+            self.header[name] = "int"
+            self.array(name, values, np.int64)
+        elif kinds <= {float}:
+            self.header[name] = "float"
+            self.array(name, values, np.float64)
+        elif kinds <= {str}:
+            self.header[name] = "str"
+            encoded = [value.encode() for value in values]
+            self.array(f"{name}.offsets", np.cumsum([0] + [len(value) for value in encoded]), np.int64)
+            self.array(f"{name}.bytes", np.frombuffer(b"".join(encoded), dtype=np.uint8), np.uint8)
+        else:
+            # One tag per value says which typed sub-column holds it
+            self.header[name] = "mixed"
+            tags, ints, floats, strings = [], [], [], []
+            for value in values:
+                kind = type(value)
+                if kind is int and INT64_MIN <= value <= INT64_MAX:
+                    tags.append(TAGS["int"])
+                    ints.append(value)
+                elif kind is int:
+                    tags.append(TAGS["bigint"])
+                    strings.append(str(value))
+                elif kind is float:
+                    tags.append(TAGS["float"])
+                    floats.append(value)
+                elif kind is str:
+                    tags.append(TAGS["str"])
+                    strings.append(value)
+                elif kind is bool:
+                    tags.append(TAGS["true"] if value else TAGS["false"])
+                elif value is None:
+                    tags.append(TAGS["none"])
+                else:
+                    raise ValueError(f"Cannot snapshot values of type {kind.__name__}")
+            self.array(f"{name}.tags", tags, np.uint8)
+            self.values(f"{name}.ints", ints)
+            self.values(f"{name}.floats", floats)
+            self.values(f"{name}.strings", strings)
+    
+    def to_bytes(self, compress):
+        header = json.dumps(self.header, separators=(",", ":")).encode()
+        body = b"".join([HEADER_LENGTH.pack(len(header)), header, *self.buffers])
+        if compress:
+            body = zlib.compress(body)
+        return PREAMBLE.pack(MAGIC, FORMAT_VERSION, COMPRESSED if compress else 0) + body
+
+class _Reader:
+    """Gives back the header fields and buffers of one snapshot"""
+    
+    def __init__(self, header, body):
+        self.header = header
+        self.buffers = {}
+        offset = 0
+        for name, dtype, nbytes in header["buffers"]:
+            if offset + nbytes > len(body):
+                raise ValueError("Snapshot is truncated")
+            dtype = DTYPES[dtype]
+            self.buffers[name] = np.frombuffer(body, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset)
+            offset += nbytes
+    
+    def array(self, name):
+        try:
+            return self.buffers[name]
+        except KeyError:
+            raise ValueError(f"Snapshot has no {name} buffer") from None
+    
+    def values(self, name):
+        kind = self.header.get(name)
+        if kind in ("int", "float"):
+            return self.array(name).tolist()
+        if kind == "str":
+            offsets = self.array(f"{name}.offsets").tolist()
+            data = self.array(f"{name}.bytes").tobytes()
+            return [data[start:end].decode() for start, end in zip(offsets, offsets[1:])]
+        if kind == "mixed":
+            columns = {TAGS["int"]: iter(self.values(f"{name}.ints")),
+                       TAGS["float"]: iter(self.values(f"{name}.floats"))}
+            strings = iter(self.values(f"{name}.strings"))
+            constants = {TAGS["false"]: False, TAGS["true"]: True, TAGS["none"]: None}
+            values = []
+            for tag in self.array(f"{name}.tags").tolist():
+                if tag in columns:
+                    values.append(next(columns[tag]))
+                elif tag == TAGS["str"]:
+                    values.append(next(strings))
+                elif tag == TAGS["bigint"]:
+                    values.append(int(next(strings)))
+                else:
+                    values.append(constants[tag])
+            return values
+        raise ValueError(f"Snapshot column {name} has unknown kind {kind!r}")
+
+def _write_stack(writer, stack):
+    writer.header["max_size"] = stack.max_size
+    writer.values("items", stack.items)
+
+def _read_stack(reader, stack):
+    stack.max_size = reader.header["max_size"]
+    stack.items = reader.values("items")
+    if not isinstance(stack.max_size, int):
+        raise ValueError("Snapshot capacity is not a number")
+
+def _write_linked_list(writer, linked_list):
+    writer.header["doubly"] = linked_list.doubly
+    values = []
+    node = linked_list.head
+    while node is not None:
+        values.append(node.data)
+        node = node.next
+    writer.values("values", values)
+
+def _read_linked_list(reader, linked_list):
+    linked_list.doubly = reader.header["doubly"] is True
+    tail = None
+    for data in reader.values("values"):
+        node = Node(data)
+        if tail is None:
+            linked_list.head = node
+        else:
+            tail.next = node
+            if linked_list.doubly:
+                node.prev = tail
+        tail = node
+        linked_list.size += 1
+    linked_list.tail = tail if linked_list.doubly else None
+
+def _write_tree(writer, tree):
+    values, children = [], []  # Preorder values; has-left and has-right flags per node
+    stack = [tree.root] if tree.root is not None else []
+    while stack:
+        node = stack.pop()
+        values.append(node.data)
+        children.append(node.left is not None)
+        children.append(node.right is not None)
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+    writer.header["nodes"] = len(values)
+    writer.values("values", values)
+    writer.array("children", np.packbits(np.array(children, dtype=bool)), np.uint8)
+
+def _read_tree(reader, tree):
+    values = reader.values("values")
+    children = np.unpackbits(reader.array("children"), count=2 * len(values)).astype(bool).tolist()
+    nodes = [TreeNode(data) for data in values]
+    
+    # Preorder: each node fills the most recent open child slot, then opens its own
+    slots = []
+    for index, node in enumerate(nodes):
+        if slots:
+            parent, side = slots.pop()
+            setattr(parent, side, node)
+        elif index:
+            raise ValueError("Snapshot tree shape is inconsistent")
+        if children[2 * index + 1]:
+            slots.append((node, "right"))
+        if children[2 * index]:
+            slots.append((node, "left"))
+    if slots:
+        raise ValueError("Snapshot tree shape is inconsistent")
+    _check_search_order(nodes[0] if nodes else None)
+    
+    for node in reversed(nodes):  # Children come after their parent in preorder
+        left, right = node.left, node.right
+        node.size = 1 + (left.size if left else 0) + (right.size if right else 0)
+        node.height = 1 + max(left.height if left else 0, right.height if right else 0)
+        node.hash = merkle_hash(node.data, left.hash if left else EMPTY_HASH, right.hash if right else EMPTY_HASH)
+    tree.root = nodes[0] if nodes else None
+    if nodes:
+        tree._min = tree._find_min(tree.root).data
+        tree._max = tree._find_max(tree.root).data
+
+def _check_search_order(root):
+    """Refuse a tree whose inorder values aren't strictly increasing, as search() relies on"""
+    stack = []
+    node = root
+    previous = None
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        if previous is not None and not previous.data < node.data:
+            raise ValueError("Snapshot tree is not a binary search tree")
+        previous = node
+        node = node.right
+
+def _write_hash_table(writer, table):
+    writer.header["buckets"] = table.size
+    writer.array("chain_lengths", table.chain_lengths, np.int64)
+    writer.values("keys", [key for bucket in table.table for key, value in bucket])
+    writer.values("values", [value for bucket in table.table for key, value in bucket])
+
+def _read_hash_table(reader, table):
+    size = reader.header["buckets"]
+    lengths = reader.array("chain_lengths").tolist()
+    keys, values = reader.values("keys"), reader.values("values")
+    pairs = list(zip(keys, values))
+    if (not isinstance(size, int) or size < 1 or len(lengths) != size or min(lengths) < 0
+            or len(keys) != len(values) or sum(lengths) != len(pairs)):
+        raise ValueError("Snapshot buckets don't match its items")
+    
+    table.size = size
+    table.table = []
+    start = 0
+    for length in lengths:
+        table.table.append(pairs[start:start + length])
+        start += length
+    table.count = len(pairs)
+    table.chain_lengths = lengths
+    histogram = Counter(lengths)
+    table.chain_histogram = [histogram.get(length, 0) for length in range(max(lengths, default=0) + 1)]
+    table.max_chain = len(table.chain_histogram) - 1
+    
+    # Keys whose hash isn't stable across processes (None, for one) may now belong elsewhere
+    if any(table._hash(key) != index for index, bucket in enumerate(table.table) for key, value in bucket):
+        table.table = [[] for _ in range(size)]
+        table.count = 0
+        table.chain_lengths = [0] * size
+        table._reset_chain_stats()
+        table._insert_many(pairs, [0, 0])
+
+def _write_heap(writer, heap):
+    writer.header["heap_type"] = heap.heap_type
+    writer.values("heap", heap.heap)
+
+def _read_heap(reader, heap):
+    heap.heap_type = reader.header["heap_type"]
+    heap.heap = reader.values("heap")
+    if heap.heap_type not in ("min", "max"):
+        raise ValueError(f"Snapshot has unknown heap type {heap.heap_type!r}")
+    # No child may belong above its parent
+    if any(heap._compare(heap.heap[i], heap.heap[heap._parent(i)]) for i in range(1, len(heap.heap))):
+        raise ValueError("Snapshot array is not a heap")
+    heap._far_extreme = heap._find_far_extreme()
+
+def _write_graph(writer, graph):
+    writer.header["directed"] = graph.directed
+    order = [vertex for vertex in graph.adjacency_list if vertex in graph.vertices]
+    order += [vertex for vertex in graph.vertices if vertex not in graph.adjacency_list]
+    index = {vertex: i for i, vertex in enumerate(order)}
+    
+    # Compressed sparse rows: the neighbors of vertex i are targets[offsets[i]:offsets[i + 1]]
+    offsets, targets, weights = [0], [], []
+    for vertex in order:
+        for neighbor, weight in graph.adjacency_list.get(vertex, ()):
+            targets.append(index[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+    writer.values("vertices", order)
+    writer.array("offsets", offsets, np.int64)
+    writer.array("targets", targets, np.int64)
+    writer.values("weights", weights)
+
+def _read_graph(reader, graph):
+    graph.directed = reader.header["directed"] is True
+    order = reader.values("vertices")
+    offsets = reader.array("offsets").tolist()
+    targets = reader.array("targets").tolist()
+    weights = reader.values("weights")
+    if (len(offsets) != len(order) + 1 or offsets[0] != 0 or offsets[-1] != len(targets)
+            or len(weights) != len(targets) or any(a > b for a, b in zip(offsets, offsets[1:]))
+            or any(not 0 <= target < len(order) for target in targets) or len(set(order)) != len(order)):
+        raise ValueError("Snapshot adjacency arrays don't match its vertices")
+    
+    graph.vertices = set(order)
+    degrees = Counter()
+    for i, vertex in enumerate(order):
+        start, end = offsets[i], offsets[i + 1]
+        graph.adjacency_list[vertex] = [(order[target], weight)
+                                        for target, weight in zip(targets[start:end], weights[start:end])]
+        degrees[end - start] += 1
+    graph._entry_count = len(targets)
+    graph.degree_histogram = dict(degrees)
+
+# Structure class -> (writer, reader) of its layout; queues share the stack layout
+FORMATS = {
+    Stack: (_write_stack, _read_stack),
+    Queue: (_write_stack, _read_stack),
+    LinkedList: (_write_linked_list, _read_linked_list),
+    BinaryTree: (_write_tree, _read_tree),
+    HashTable: (_write_hash_table, _read_hash_table),
+    Heap: (_write_heap, _read_heap),
+    Graph: (_write_graph, _read_graph),
+}
+TYPES = {cls.__name__: cls for cls in FORMATS}
+
+def to_snapshot(structure, compress=True):
+    """Encode a structure, with its history, as compact snapshot bytes"""
+    # Counting subclasses from data_structures.instrumented snapshot as their plain class
+    cls = next((cls for cls in type(structure).__mro__ if cls in FORMATS), None)
+    if cls is None:
+        raise ValueError(f"Cannot snapshot {type(structure).__name__}")
+    
+    writer = _Writer(structure, cls)
+    FORMATS[cls][0](writer, structure)
+    writer.values("history", structure.history)
+    return writer.to_bytes(compress)
+
+def _read_body(data, compressed, length):
+    """The first length bytes of the body, decompressing no more than that"""
+    if not compressed:
+        return data[:length]
+    try:
+        return zlib.decompressobj().decompress(data, length)
+    except zlib.error as error:
+        raise ValueError(f"Snapshot is corrupt: {error}") from None
+
+def _check_header(header, max_elements):
+    """Refuse headers of the wrong shape, and buffers longer than max_elements allow"""
+    buffers = header.get("buffers")
+    if (not isinstance(header.get("elements"), int) or header["elements"] < 0
+            or not isinstance(header.get("version"), int) or not isinstance(buffers, list)):
+        raise ValueError("Snapshot header is corrupt")
+    if max_elements is not None and header["elements"] > max_elements:
+        raise ValueError(f"Snapshot holds {header['elements']:,} elements, more than the {max_elements:,} allowed")
+    
+    for entry in buffers:
+        if (not isinstance(entry, list) or len(entry) != 3 or not isinstance(entry[0], str)
+                or entry[1] not in DTYPES or not isinstance(entry[2], int) or entry[2] < 0
+                or entry[2] % DTYPES[entry[1]].itemsize):
+            raise ValueError("Snapshot header is corrupt")
+        name, dtype, nbytes = entry
+        if max_elements is None or name.endswith(".bytes"):
+            continue  # String bytes are only bounded by the body size
+        # Offsets hold one item more than their column, and graph targets two per undirected edge
+        limit = HISTORY_ENTRIES + 1 if name.startswith("history") else 2 * max_elements + 1
+        if nbytes // DTYPES[dtype].itemsize > limit:
+            raise ValueError(f"Snapshot buffer {name} is longer than {max_elements:,} elements allow")
+
+def from_snapshot(data, max_elements=None):
+    """Decode snapshot bytes into a new structure, refusing more than max_elements"""
+    if len(data) < PREAMBLE.size:
+        raise ValueError("Not a data structure snapshot")
+    magic, version, flags = PREAMBLE.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a data structure snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {version}")
+    data = memoryview(data)[PREAMBLE.size:]
+    compressed = bool(flags & COMPRESSED)
+    
+    # The header is read on its own first, so oversized snapshots are refused before decoding
+    prefix = _read_body(data, compressed, HEADER_LENGTH.size)
+    if len(prefix) < HEADER_LENGTH.size:
+        raise ValueError("Snapshot is truncated")
+    header_length = HEADER_LENGTH.unpack(prefix)[0]
+    if max_elements is not None and header_length > MAX_HEADER_BYTES:
+        raise ValueError("Snapshot header is corrupt")
+    try:
+        header = json.loads(bytes(_read_body(data, compressed, HEADER_LENGTH.size + header_length)[HEADER_LENGTH.size:]))
+        cls = TYPES[header["type"]]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Snapshot header is corrupt") from None
+    _check_header(header, max_elements)
+    
+    # Only as much as the header lists is inflated, and for uploads no more than their limit allows
+    total = HEADER_LENGTH.size + header_length + sum(nbytes for _, _, nbytes in header["buffers"])
+    if max_elements is not None:
+        allowed = HEADER_LENGTH.size + header_length + max_elements * BYTES_PER_ELEMENT + HISTORY_BYTES
+        if total > allowed:
+            raise ValueError(f"Snapshot holds {total:,} bytes, more than {max_elements:,} elements allow")
+    body = bytes(_read_body(data, compressed, total))
+    reader = _Reader(header, body[HEADER_LENGTH.size + header_length:])
+    
+    structure = cls()
+    try:
+        FORMATS[cls][1](reader, structure)
+        structure.history = reader.values("history")
+        elements = structure._element_count()
+    except (KeyError, IndexError, StopIteration, TypeError, OverflowError):
+        raise ValueError("Snapshot contents are corrupt") from None
+    if elements != header["elements"]:
+        raise ValueError(f"Snapshot header says {header['elements']:,} elements but it holds {elements:,}")
+    structure.version = header["version"]
+    return structure
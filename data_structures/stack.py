@@ -2,7 +2,11 @@
 Stack Data Structure Implementation
 """
 
-class Stack:
+from data_structures.base import BatchMixin
+
+class Stack(BatchMixin):
+    BATCH_OPERATIONS = ("push", "pop", "clear")
+    
     def __init__(self, max_size=10):
         self.items = []
         self.max_size = max_size
@@ -14,15 +18,30 @@ class Stack:
             return False, "Stack Overflow! Maximum size reached."
         
         self.items.append(item)
+        self._touch()
         self.history.append(f"Pushed {item} onto stack")
         return True, f"Successfully pushed {item}"
     
+    def extend(self, items):
+        """Push many items at once, stopping when the stack is full"""
+        items = list(items)
+        accepted = items[:max(0, self.max_size - len(self.items))]
+        self.items.extend(accepted)
+        if accepted:
+            self._touch()
+        
+        self.history.append(f"Pushed {len(accepted)} items onto stack")
+        if len(accepted) < len(items):
+            return len(accepted), f"Pushed {len(accepted)} items; stack full, {len(items) - len(accepted)} rejected"
+        return len(accepted), f"Successfully pushed {len(accepted)} items"
+    
     def pop(self):
         """Remove and return the top item from the stack"""
         if self.is_empty():
             return None, "Stack Underflow! Stack is empty."
         
         item = self.items.pop()
+        self._touch()
         self.history.append(f"Popped {item} from stack")
         return item, f"Successfully popped {item}"
     
@@ -47,9 +66,18 @@ class Stack:
         """Return the current size of the stack"""
         return len(self.items)
     
+    def stats(self):
+        """Get summary statistics in O(1)"""
+        return {
+            'size': len(self.items),
+            'capacity': self.max_size,
+            'top': self.items[-1] if self.items else None,
+        }
+    
     def clear(self):
         """Clear all items from the stack"""
         self.items.clear()
+        self._touch()
         self.history.append("Stack cleared")
     
     def get_items(self):
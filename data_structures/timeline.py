@@ -0,0 +1,148 @@
+"""
+Undo, Redo and Time Travel over a Command Log
+"""
+
+# Every operation that changes a structure is logged as its method name and arguments.
+# A full snapshot is kept every CHECKPOINT_EVERY steps, and after bulk operations whose
+# input may be a one-shot stream, so reaching any step restores the nearest checkpoint
+# at or before it and replays at most CHECKPOINT_EVERY - 1 logged operations.
+
+import functools
+from data_structures.snapshot import FORMATS, from_snapshot, to_snapshot
+
+CHECKPOINT_EVERY = 16
+LOG_LIMIT = 512  # Steps kept; older ones are dropped a checkpoint interval at a time
+BULK_OPERATIONS = ("extend", "update", "add_edges", "build_from", "build_heap")  # Checkpointed, not logged
+
+def _kind(structure):
+    """What a structure must keep for the log to apply to it: class and construction options"""
+    cls = next((cls for cls in type(structure).__mro__ if cls in FORMATS), type(structure))
+    return (cls.__name__, getattr(structure, "doubly", None), getattr(structure, "heap_type", None),
+            getattr(structure, "directed", None))
+
+class Timeline:
+    """Command log of one structure, with checkpoints for fast undo, redo and seeking"""
+
+    def __init__(self, structure, checkpoint_every=CHECKPOINT_EVERY):
+        self.checkpoint_every = checkpoint_every
+        self.unavailable = None  # Why the structure can't be snapshotted, if it can't
+        self._replaying = False
+        self._depth = 0  # Nesting of logged calls, so only the outermost one is logged
+        self.recorded = 0  # Steps ever recorded; never rewound by seeks or trimmed by the log limit
+        self._reset(structure)
+
+    def _reset(self, structure):
+        """Start a new log with the structure as it is now as step 0"""
+        self.kind = _kind(structure)
+        self.commands = []  # (method name, args, kwargs), or None for a checkpointed bulk step
+        self.labels = []  # History line each step added
+        self.checkpoints = {}  # Step -> snapshot bytes
+        self.position = 0
+        self.version = structure.version
+        self._checkpoint(structure)
+
+    def _checkpoint(self, structure):
+        try:
+            self.checkpoints[self.position] = to_snapshot(structure)
+        except ValueError as error:
+            self.unavailable = str(error)
+            self.commands, self.labels, self.checkpoints, self.position = [], [], {}, 0
+
+    def attach(self, structure):
+        """Log the operations of a structure from now on; safe to call on every rerun"""
+        if _kind(structure) != self.kind:
+            self.unavailable = None
+            self._reset(structure)  # Replaced by a different kind, so the old steps don't apply
+        elif structure.version != self.version and not self.unavailable:
+            self._record(structure, None, "Changed outside the timeline")
+
+        for name in dir(type(structure)):
+            method = getattr(structure, name)
+            if name.startswith("_") or not callable(method) or getattr(method, "timeline", None) is self:
+                continue  # Other per-rerun wrappers copy the marker from the logging wrapper they wrap
+            structure.__dict__[name] = self._logged(structure, name, structure.__dict__.get(name))
+        return self
+
+    def _logged(self, structure, name, wrapped):
+        """Log calls of a method; wrapped is an instance-level wrapper to call, if there is one"""
+        def method(*args, **kwargs):
+            # Looked up on each call: enabling operation counting swaps the structure's class
+            if wrapped is not None:
+                return wrapped(*args, **kwargs)
+            return getattr(type(structure), name)(structure, *args, **kwargs)
+
+        @functools.wraps(wrapped or getattr(type(structure), name))
+        def logged(*args, **kwargs):
+            if self._replaying or self._depth or self.unavailable:
+                return method(*args, **kwargs)
+
+            before = structure.version
+            self._depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                if structure.version != before:  # Only operations that changed something are steps
+                    command = None if name in BULK_OPERATIONS else (
+                        name, tuple(list(arg) if isinstance(arg, list) else arg for arg in args), kwargs)
+                    self._record(structure, command, structure.history[-1] if structure.history else name)
+
+        logged.timeline = self
+        return logged
+
+    def _record(self, structure, command, label):
+        """Append a step, dropping any steps that were undone"""
+        del self.commands[self.position:]
+        del self.labels[self.position:]
+        for step in [step for step in self.checkpoints if step > self.position]:
+            del self.checkpoints[step]
+
+        self.commands.append(command)
+        self.labels.append(label)
+        self.position += 1
+        self.recorded += 1
+        self.version = structure.version
+        if command is None or self.position % self.checkpoint_every == 0:
+            self._checkpoint(structure)
+
+        if len(self.commands) > LOG_LIMIT:
+            # Rebase on the oldest checkpoint that keeps the log within the limit
+            base = min(step for step in self.checkpoints if step >= len(self.commands) - LOG_LIMIT)
+            self.commands, self.labels = self.commands[base:], self.labels[base:]
+            self.checkpoints = {step - base: data for step, data in self.checkpoints.items() if step >= base}
+            self.position -= base
+
+    def label(self, step):
+        """Describe the state after a step"""
+        return self.labels[step - 1] if step > 0 else "Start"
+
+    def seek(self, structure, step):
+        """Put the structure in the state it had after a step, in place"""
+        if self.unavailable or not 0 <= step <= len(self.commands) or step == self.position:
+            return False
+
+        base = max(checkpoint for checkpoint in self.checkpoints if checkpoint <= step)
+        restored = from_snapshot(self.checkpoints[base])
+        version = structure.version
+        cls = type(structure)
+        self._replaying = True
+        try:
+            # Updating the attributes keeps the object, its class and any wrappers installed on it
+            vars(structure).update(vars(restored))
+            structure.__class__ = type(restored)  # Replayed steps aren't new work, so a counting class doesn't count them
+            for name, args, kwargs in self.commands[base:step]:
+                getattr(structure, name)(*args, **kwargs)
+        finally:
+            structure.__class__ = cls
+            self._replaying = False
+
+        structure.version = version + 1  # Keeps caches keyed on the version from matching the old state
+        self.version = structure.version
+        self.position = step
+        return True
+
+    def undo(self, structure):
+        return self.seek(structure, self.position - 1)
+
+    def redo(self, structure):
+        return self.seek(structure, self.position + 1)
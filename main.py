@@ -11,6 +11,10 @@ from visualizers.binary_tree_visualizer import BinaryTreeVisualizer
 from visualizers.hash_table_visualizer import HashTableVisualizer
 from visualizers.heap_visualizer import HeapVisualizer
 from visualizers.graph_visualizer import GraphVisualizer
+from visualizers.complexity_explorer import ComplexityExplorer
+from visualizers.components import render_memory_panel, render_profiling_toggle, render_rerun_profile
+from utils.profiling import RerunProfiler
+from utils.sessions import SessionResourceManager
 
 # Page configuration
 st.set_page_config(
@@ -60,6 +64,17 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+VISUALIZERS = {
+    "Stack": StackVisualizer,
+    "Queue": QueueVisualizer,
+    "Linked List": LinkedListVisualizer,
+    "Binary Tree": BinaryTreeVisualizer,
+    "Hash Table": HashTableVisualizer,
+    "Heap": HeapVisualizer,
+    "Graph": GraphVisualizer,
+    "Complexity Explorer": ComplexityExplorer,
+}
+
 def main():
     # Sidebar navigation
     st.sidebar.title("🧠 Data Structure Visualizer")
@@ -68,33 +83,22 @@ def main():
     # Navigation menu
     page = st.sidebar.selectbox(
         "Choose a Data Structure:",
-        ["Home", "Stack", "Queue", "Linked List", "Binary Tree", "Hash Table", "Heap", "Graph"]
+        ["Home", *VISUALIZERS]
     )
 
-    # Display selected page
-    if page == "Home":
-        show_home_page()
-    elif page == "Stack":
-        stack_visualizer = StackVisualizer()
-        stack_visualizer.render_with_pseudocode()
-    elif page == "Queue":
-        queue_visualizer = QueueVisualizer()
-        queue_visualizer.render_with_pseudocode()
-    elif page == "Linked List":
-        linked_list_visualizer = LinkedListVisualizer()
-        linked_list_visualizer.render_with_pseudocode()
-    elif page == "Binary Tree":
-        binary_tree_visualizer = BinaryTreeVisualizer()
-        binary_tree_visualizer.render_with_pseudocode()
-    elif page == "Hash Table":
-        hash_table_visualizer = HashTableVisualizer()
-        hash_table_visualizer.render_with_pseudocode()
-    elif page == "Heap":
-        heap_visualizer = HeapVisualizer()
-        heap_visualizer.render_with_pseudocode()
-    elif page == "Graph":
-        graph_visualizer = GraphVisualizer()
-        graph_visualizer.render_with_pseudocode()
+    timing, use_cprofile = render_profiling_toggle()
+    profile_panel = st.sidebar.container()
+
+    # Display selected page, within this session's element and memory limits
+    with SessionResourceManager() as resources:
+        if timing:
+            with RerunProfiler(page, use_cprofile) as profiler:
+                show_page(page, profiler, resources)
+        else:
+            show_page(page, resources=resources)
+        if timing:
+            render_rerun_profile(profile_panel)
+        render_memory_panel()  # After the page, so it reflects this rerun's operations
 
     # Sidebar information
     st.sidebar.markdown("---")
@@ -121,6 +125,22 @@ def main():
     - **Custom Data Structures**
     """)
 
+def show_page(page, profiler=None, resources=None):
+    """Render one page, timing its sections when a profiler is given"""
+    if page == "Home":
+        show_home_page()
+        return
+
+    visualizer = VISUALIZERS[page]()
+    if resources is not None:
+        resources.guard(visualizer)
+    if profiler is not None:
+        profiler.instrument(visualizer)
+    if hasattr(visualizer, "render_with_pseudocode"):
+        visualizer.render_with_pseudocode()
+    else:
+        visualizer.render()
+
 def show_home_page():
     """Display the home page with overview and instructions"""
 
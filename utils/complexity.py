@@ -0,0 +1,220 @@
+"""
+Empirical complexity measurements: time and operation counts at growing n, with curve fitting
+"""
+
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+from data_structures.instrumented import enable_counting, operation_counts
+from utils.workloads import anagram_keys, graph_edges, key_sequence, populate_graph
+
+OPS_PER_ROUND = 64
+ROUNDS = 3
+WORKER_RECURSION_LIMIT = 20_000  # Sorted inserts recurse once per level of a degenerate tree
+
+
+def _stack_push(n, k, seed):
+    stack = Stack(max_size=n + k)
+    stack.extend(range(n))
+    return stack, [("push", i) for i in range(k)]
+
+
+def _queue_enqueue(n, k, seed):
+    queue = Queue(max_size=n + k)
+    queue.extend(range(n))
+    return queue, [("enqueue", i) for i in range(k)]
+
+
+def _queue_dequeue(n, k, seed):
+    queue = Queue(max_size=n + k)
+    queue.extend(range(n + k))
+    return queue, [("dequeue",)] * k
+
+
+def _list_append(doubly):
+    def make(n, k, seed):
+        linked_list = LinkedList(doubly=doubly)
+        linked_list.extend(range(n))
+        return linked_list, [("insert_at_end", i) for i in range(k)]
+    return make
+
+
+def _list_search_missing(n, k, seed):
+    linked_list = LinkedList()
+    linked_list.extend(range(n))
+    return linked_list, [("search", -1)] * k
+
+
+def _tree_insert(distribution):
+    def make(n, k, seed):
+        keys = key_sequence(n + k, distribution, seed)
+        tree = BinaryTree()
+        tree.apply_batch([("insert", key) for key in keys[:n]])
+        return tree, [("insert", key) for key in keys[n:]]
+    return make
+
+
+def _tree_search(n, k, seed):
+    keys = key_sequence(n, "random", seed)
+    tree = BinaryTree()
+    tree.apply_batch([("insert", key) for key in keys])
+    return tree, [("search", key) for key in keys[:k]]
+
+
+def _hash_insert(buckets):
+    def make(n, k, seed):
+        keys = key_sequence(n + k, "random", seed)
+        table = HashTable(buckets if buckets else max(n + k, 10))
+        table.update((key, key) for key in keys[:n])
+        return table, [("insert", key, key) for key in keys[n:]]
+    return make
+
+
+def _hash_get_anagrams(n, k, seed):
+    keys = anagram_keys(n, seed)
+    table = HashTable(max(n, 10))
+    table.update((key, key) for key in keys)
+    return table, [("get", key) for key in keys[-k:]]
+
+
+def _heap_insert(n, k, seed):
+    keys = key_sequence(n + k, "random", seed)
+    heap = Heap()
+    heap.build_heap(keys[:n])
+    return heap, [("insert", key) for key in keys[n:]]
+
+
+def _heap_extract(n, k, seed):
+    heap = Heap()
+    heap.build_heap(key_sequence(n + k, "random", seed))
+    return heap, [("extract",)] * k
+
+
+def _graph_bfs(n, k, seed):
+    graph = Graph()
+    populate_graph(graph, n, graph_edges("erdos_renyi", n, seed, average_degree=4))
+    return graph, [("bfs", 0)] * max(1, k // 16)
+
+
+# Label -> (make(n, k, seed) returning the prepared structure and the ops to time, largest n)
+EXPERIMENTS = {
+    "Stack.push": (_stack_push, 2 ** 18),
+    "Queue.enqueue": (_queue_enqueue, 2 ** 18),
+    "Queue.dequeue": (_queue_dequeue, 2 ** 18),
+    "LinkedList.insert_at_end (singly)": (_list_append(False), 2 ** 16),
+    "LinkedList.insert_at_end (doubly)": (_list_append(True), 2 ** 18),
+    "LinkedList.search (missing value)": (_list_search_missing, 2 ** 16),
+    "BinaryTree.insert (random input)": (_tree_insert("random"), 2 ** 16),
+    "BinaryTree.insert (sorted input)": (_tree_insert("sorted"), 2 ** 11),
+    "BinaryTree.search": (_tree_search, 2 ** 16),
+    "HashTable.insert (10 buckets)": (_hash_insert(10), 2 ** 14),
+    "HashTable.insert (load factor 1)": (_hash_insert(None), 2 ** 18),
+    "HashTable.get (anagram keys)": (_hash_get_anagrams, 2 ** 12),
+    "Heap.insert": (_heap_insert, 2 ** 18),
+    "Heap.extract": (_heap_extract, 2 ** 18),
+    "Graph.bfs (random graph)": (_graph_bfs, 2 ** 15),
+}
+
+# Name -> growth function; each is fitted as a + b * f(n), where a is the fixed
+# per-call overhead that would otherwise hide linear costs at small n
+MODELS = {
+    "O(1)": lambda n: np.zeros_like(n),
+    "O(log n)": lambda n: np.log2(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log2(n),
+    "O(n²)": lambda n: n ** 2,
+}
+SIMPLER_MODEL_SLACK = 1.25  # A simpler model wins unless a more complex one fits 25% better
+
+
+def geometric_sizes(smallest, largest, factor=2):
+    """Get smallest, smallest*factor, ... up to largest"""
+    sizes = []
+    n = smallest
+    while n <= largest:
+        sizes.append(n)
+        n *= factor
+    return sizes
+
+
+def _apply(structure, ops):
+    for name, *args in ops:
+        getattr(structure, name)(*args)
+
+
+def measure(label, n, seed=0, rounds=ROUNDS, ops_per_round=OPS_PER_ROUND):
+    """Best per-operation time and mean operation counts of one experiment at size n"""
+    make = EXPERIMENTS[label][0]
+
+    # One untimed round with counting on, so instrumentation never skews the timings
+    structure, ops = make(n, ops_per_round, seed)
+    enable_counting(structure)
+    _apply(structure, ops)
+    totals = {}
+    for counts in operation_counts(structure).values():
+        for cost, value in counts.items():
+            if cost != "calls":
+                totals[cost] = totals.get(cost, 0) + value
+
+    best = math.inf
+    for _ in range(rounds):
+        structure, ops = make(n, ops_per_round, seed)
+        start = time.perf_counter()
+        _apply(structure, ops)
+        best = min(best, (time.perf_counter() - start) / len(ops))
+    return {"n": n, "seconds": best, "counts": {cost: value / len(ops) for cost, value in totals.items()}}
+
+
+def _init_worker():
+    sys.setrecursionlimit(WORKER_RECURSION_LIMIT)
+
+
+def run_experiment(label, sizes, workers=None, seed=0, progress=None):
+    """Measure every size in a process pool; returns the results sorted by n"""
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(measure, label, n, seed) for n in sizes]
+        for future in as_completed(futures):
+            results.append(future.result())
+            if progress is not None:
+                progress(len(results), len(futures))
+    return sorted(results, key=lambda result: result["n"])
+
+
+def fit_models(ns, ys):
+    """Fit y = a + b * f(n) for every model by relative least squares; best fit first"""
+    ns = np.asarray(ns, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    fits = []
+    for name, growth in MODELS.items():
+        # Dividing each row by y minimizes relative error, so small sizes still count
+        design = np.column_stack([np.ones_like(ns), growth(ns)]) / ys[:, None]
+        (overhead, scale), *_ = np.linalg.lstsq(design, np.ones_like(ns), rcond=None)
+        if scale < 0 or overhead < 0:  # Costs can't shrink with n or be negative
+            overhead, scale = max(overhead, 0.0), max(scale, 0.0)
+            if not scale:
+                overhead = np.sum(1 / ys) / np.sum(1 / ys ** 2)
+            elif not overhead:
+                f = growth(ns)
+                scale = np.sum(f / ys) / np.sum((f / ys) ** 2)
+        predicted = overhead + scale * growth(ns)
+        error = float(np.sqrt(np.mean(((predicted - ys) / ys) ** 2)))
+        fits.append({"model": name, "overhead": float(overhead), "scale": float(scale), "error": error})
+
+    # MODELS is ordered simplest first; keep the simplest one that isn't clearly beaten
+    best = fits[0]
+    for fit in fits[1:]:
+        if fit["error"] * SIMPLER_MODEL_SLACK < best["error"]:
+            best = fit
+    return [best] + sorted((fit for fit in fits if fit is not best), key=lambda fit: fit["error"])
@@ -0,0 +1,208 @@
+"""
+Streaming dataset import (CSV, JSON and edge lists) into the data structures
+"""
+
+import io
+from itertools import islice
+import os
+import pandas as pd
+
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.linked_list import LinkedList
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+
+FORMATS = ("csv", "json", "edges")
+DEFAULT_CHUNKSIZE = 50_000
+
+# Columns each kind of structure reads from a dataset, in the order they are used
+COLUMN_ROLES = {
+    Stack: ("value",),
+    Queue: ("value",),
+    LinkedList: ("value",),
+    BinaryTree: ("value",),
+    Heap: ("value",),
+    HashTable: ("key", "value"),
+    Graph: ("source", "target", "weight"),
+}
+OPTIONAL_ROLES = ("weight",)  # Edges without a weight get weight 1
+
+# Server directory the import panel may read typed-in paths from; unset, only uploads are offered,
+# since any visitor of a hosted app could otherwise read any file the server can
+DATA_DIR_VARIABLE = "DS_VISUALIZER_DATA_DIR"
+
+
+def guess_format(name):
+    """Pick an import format from a file name"""
+    name = name.lower()
+    if name.endswith((".json", ".jsonl", ".ndjson")):
+        return "json"
+    if name.endswith((".edges", ".edgelist", ".txt")):
+        return "edges"
+    return "csv"
+
+
+def data_dir():
+    """The resolved directory server paths may be imported from, or None when path imports are off"""
+    directory = os.environ.get(DATA_DIR_VARIABLE)
+    return os.path.realpath(directory) if directory else None
+
+
+def resolve_data_path(path):
+    """Resolve a path typed into the UI inside data_dir(); raises ValueError for anything else"""
+    directory = data_dir()
+    if directory is None:
+        raise ValueError(f"Importing server paths is off; set {DATA_DIR_VARIABLE} to allow a directory")
+    # realpath follows symlinks and "..", and an absolute path replaces the directory, so
+    # whatever escapes it fails the prefix check
+    resolved = os.path.realpath(os.path.join(directory, path))
+    if os.path.commonpath([directory, resolved]) != directory:
+        raise ValueError(f"{path} is outside the data directory")
+    if not os.path.isfile(resolved):
+        raise ValueError(f"File {path} not found")
+    return resolved
+
+
+def _open_binary(source):
+    """Get a rewound binary file object for a path or an uploaded file"""
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        return open(source, "rb"), True
+    source.seek(0)
+    return source, False
+
+
+def count_rows(source, block_size=1 << 20):
+    """Count lines by scanning raw bytes, which is far cheaper than parsing them"""
+    handle, owned = _open_binary(source)
+    try:
+        rows = 0
+        last = b"\n"
+        while True:
+            block = handle.read(block_size)
+            if not block:
+                break
+            rows += block.count(b"\n")
+            last = block[-1:]
+        return rows + (last != b"\n")  # A final line without a newline still counts
+    finally:
+        if owned:
+            handle.close()
+        else:
+            handle.seek(0)
+
+
+def iter_chunks(source, fmt, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the dataset as DataFrames of at most chunksize rows"""
+    handle, owned = _open_binary(source)
+    try:
+        if fmt == "csv":
+            yield from pd.read_csv(handle, chunksize=chunksize)
+        elif fmt == "edges":
+            # Whitespace separated "source target [weight]" lines, # starts a comment
+            yield from pd.read_csv(handle, sep=r"\s+", header=None, comment="#",
+                                   names=["source", "target", "weight"], chunksize=chunksize)
+        elif fmt == "json":
+            # JSON Lines stream in chunks; a single JSON array has to be read whole
+            first = handle.read(1)
+            while first.isspace():
+                first = handle.read(1)
+            handle.seek(0)
+            if first == b"[":
+                frame = pd.read_json(io.StringIO(handle.read().decode("utf-8")))
+                for start in range(0, len(frame), chunksize):
+                    yield frame.iloc[start:start + chunksize]
+            else:
+                yield from pd.read_json(handle, lines=True, chunksize=chunksize)
+        else:
+            raise ValueError(f"Unknown format {fmt}; expected one of {', '.join(FORMATS)}")
+    finally:
+        if owned:
+            handle.close()
+
+
+def _weights(series, length):
+    """Edge weights from a dataset column: 1 when missing, whole numbers as int"""
+    if series is None:
+        return [1] * length
+    if pd.api.types.is_integer_dtype(series):
+        return series.tolist()
+    weights = series.fillna(1).tolist()
+    return [int(w) if isinstance(w, float) and w.is_integer() else w for w in weights]
+
+
+def _pick_columns(frame, roles, columns):
+    """Get one column per role, by configured name or by position (None if optional and absent)"""
+    picked = []
+    for position, role in enumerate(roles):
+        name = columns.get(role) if columns else None
+        if name:
+            if name not in frame.columns:
+                raise ValueError(f"Column {name} not found; available: {', '.join(map(str, frame.columns))}")
+            picked.append(frame[name])
+        elif position < frame.shape[1]:
+            picked.append(frame.iloc[:, position])
+        elif role in OPTIONAL_ROLES:
+            picked.append(None)
+        else:
+            raise ValueError(f"No {role} column; the data has {frame.shape[1]} column(s)")
+    return picked
+
+
+def column_roles(structure):
+    """Get the dataset columns a structure reads, or None if it can't import"""
+    return next((roles for kind, roles in COLUMN_ROLES.items() if isinstance(structure, kind)), None)
+
+
+def import_dataset(structure, source, fmt, columns=None, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Replace the structure's contents with a dataset, streaming it chunk by chunk"""
+    roles = column_roles(structure)
+    if roles is None:
+        return 0, f"Cannot import into {type(structure).__name__}"
+
+    total = count_rows(source) - (fmt == "csv")  # Minus the header line
+    structure.clear()
+    if isinstance(structure, HashTable) and total > structure.size:
+        structure.resize(total)  # Keep the load factor at or below 1
+
+    rows = 0
+
+    def chunks():
+        """Picked columns per chunk, reporting progress as each one is used up"""
+        nonlocal rows
+        for frame in iter_chunks(source, fmt, chunksize):
+            yield _pick_columns(frame, roles, columns), len(frame)
+            rows += len(frame)
+            if progress is not None:
+                progress(rows, total)
+
+    # Every structure takes the whole stream in one bulk call, so the import is
+    # one history entry and one version bump, but only a chunk is parsed at a time
+    try:
+        if isinstance(structure, Graph):
+            structure.add_edges(edge for picked, length in chunks()
+                                for edge in zip(picked[0].tolist(), picked[1].tolist(),
+                                                _weights(picked[2], length)))
+        elif isinstance(structure, HashTable):
+            structure.update(pair for picked, length in chunks()
+                             for pair in zip(picked[0].tolist(), picked[1].tolist()))
+        else:
+            values = (value for picked, length in chunks() for value in picked[0].tolist())
+            if isinstance(structure, BinaryTree):
+                structure.build_from(list(values))
+            elif isinstance(structure, Heap):
+                structure.build_heap(list(values))
+            elif isinstance(structure, (Stack, Queue)):
+                # Keep the chosen capacity and stop reading once it is full
+                accepted, _ = structure.extend(islice(values, structure.max_size))
+                if accepted < total:
+                    return accepted, (f"Imported {accepted} of {total} rows: "
+                                      f"{type(structure).__name__.lower()} is full at {structure.max_size}")
+                return accepted, f"Successfully imported {accepted} rows"
+            else:
+                structure.extend(values)
+    except (ValueError, TypeError, pd.errors.ParserError) as error:
+        return rows, f"Import stopped after {rows} rows: {error}"
+    return rows, f"Successfully imported {rows} rows"
@@ -0,0 +1,47 @@
+"""
+Batched matplotlib drawing helpers shared by the box-and-arrow visualizers
+"""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+
+# Beyond this many elements per-box labels are unreadable and only cost time
+MAX_LABELS = 60
+
+
+def draw_boxes(ax, xs, ys, width, height, facecolors, edgecolor='black', linewidth=2):
+    """Draw every box as one collection instead of one Rectangle patch each"""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    corners = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=float)
+    verts = corners[None, :, :] + np.stack([xs, ys], axis=1)[:, None, :]
+
+    boxes = PolyCollection(verts, facecolors=facecolors, edgecolors=edgecolor, linewidths=linewidth)
+    ax.add_collection(boxes)
+    return boxes
+
+
+def draw_arrows(ax, starts, ends, color='blue', linewidth=2, alpha=1.0):
+    """Draw every arrow as one quiver instead of one annotate call each"""
+    if len(starts) == 0:
+        return None
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    deltas = ends - starts
+
+    # Widths in pixels so arrows keep their look whatever the axes span
+    return ax.quiver(starts[:, 0], starts[:, 1], deltas[:, 0], deltas[:, 1],
+                     angles='xy', scale_units='xy', scale=1, units='dots',
+                     width=linewidth, headwidth=4, headlength=5, headaxislength=4.5,
+                     color=color, alpha=alpha)
+
+
+def label_stride(count, max_labels=MAX_LABELS):
+    """Step between drawn labels so that at most max_labels are placed"""
+    return max(1, -(-count // max_labels))
+
+
+def draw_labels(ax, xs, ys, labels, stride=1, **text_kwargs):
+    """Add a text label for every stride-th element"""
+    for i in range(0, len(labels), stride):
+        ax.text(xs[i], ys[i], labels[i], **text_kwargs)
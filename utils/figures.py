@@ -0,0 +1,135 @@
+"""
+Pyplot-free figures on Agg canvases, and a pool of them reused across reruns
+
+pyplot keeps every figure in one process-wide registry with a "current figure", so
+plt.subplots and plt.close() from sessions rendering on different threads race each
+other; a bare plt.close() can even close another session's figure mid-draw. Figures
+made here are plain matplotlib.figure.Figure objects with their own FigureCanvasAgg,
+which st.pyplot renders the same way.
+
+A borrowed figure belongs to one thread until it is handed back. Streamlit runs every
+rerun on a new thread, so thread-local pools would always start empty; idle figures
+wait in one small pool instead, guarded by a lock held only to take or return one.
+"""
+
+import contextlib
+import io
+import sys
+import threading
+from collections import OrderedDict
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from data_structures.memory import deep_size
+
+POOL_SIZE = 8  # Idle figures kept for reuse across all sessions
+FRAME_CACHE_SIZE = 8  # PNG frames a FrameCache keeps, least recently shown dropped first
+PNG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}  # What st.pyplot passes to savefig
+SUBPLOT_PARAMS = ("left", "bottom", "right", "top", "wspace", "hspace")
+
+_pool = []  # (layout, figure, axes) of idle figures, most recently returned last
+_pool_lock = threading.Lock()
+
+
+def _layout(nrows, ncols, gridspec_kw):
+    return nrows, ncols, repr(sorted((gridspec_kw or {}).items()))
+
+
+def _reset(fig, figsize):
+    """Return a figure's size, resolution and subplot margins to what a new one would have"""
+    fig.set_size_inches(figsize)
+    fig.set_dpi(matplotlib.rcParams["figure.dpi"])  # Savers such as benchmarks change it
+    # fig.tight_layout() moves the margins, which would otherwise carry over to the next user
+    fig.subplots_adjust(**{name: matplotlib.rcParams[f"figure.subplot.{name}"] for name in SUBPLOT_PARAMS})
+
+
+def _reusable(fig, axes):
+    """Whether a figure holds just the axes it was made with, so clearing them is enough"""
+    handed_out = list(axes.flat) if hasattr(axes, "flat") else [axes]
+    return fig.get_children() == [fig.patch, *handed_out]  # No colorbar axes, legends or figure texts
+
+
+def subplots(figsize, nrows=1, ncols=1, gridspec_kw=None, figure=None):
+    """(fig, axes) like plt.subplots(nrows, ncols, figsize=...) without pyplot; figure, if given, is cleared and reused"""
+    if figure is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)  # Sets fig.canvas, which savefig draws on
+    else:
+        fig = figure
+        fig.clear()
+        _reset(fig, figsize)
+    return fig, fig.subplots(nrows, ncols, gridspec_kw=gridspec_kw)
+
+
+@contextlib.contextmanager
+def pooled_subplots(figsize, nrows=1, ncols=1, gridspec_kw=None):
+    """subplots() on a figure borrowed from the pool for the with block; st.pyplot it inside the block"""
+    layout = _layout(nrows, ncols, gridspec_kw)
+    with _pool_lock:
+        # Prefer a figure with the same grid, whose axes only need clearing
+        index = next((i for i in range(len(_pool) - 1, -1, -1) if _pool[i][0] == layout), len(_pool) - 1)
+        entry = _pool.pop(index) if _pool else None
+
+    if entry is not None and entry[0] == layout and _reusable(entry[1], entry[2]):
+        fig, axes = entry[1], entry[2]
+        for ax in fig.axes:
+            ax.clear()
+            ax.set_aspect('auto')  # Not reset by clear()
+        _reset(fig, figsize)
+    else:
+        fig, axes = subplots(figsize, nrows, ncols, gridspec_kw, figure=entry[1] if entry else None)
+
+    try:
+        yield fig, axes
+    finally:
+        with _pool_lock:
+            _pool.append((layout, fig, axes))
+            del _pool[:-POOL_SIZE]
+
+
+def png_bytes(fig):
+    """Encode a figure the way st.pyplot does, for frames kept as bytes rather than live figures"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **PNG_OPTIONS)
+    return buffer.getvalue()
+
+
+class FrameCache:
+    """Recently shown PNG frames of one view, bounded by count, for a session to keep between reruns"""
+
+    def __init__(self, limit=FRAME_CACHE_SIZE):
+        self.limit = limit
+        self.frames = OrderedDict()  # Key -> PNG bytes, least recently shown first
+        self.last = None  # (key, data) the caller keeps about the frame shown last
+
+    def get(self, key):
+        png = self.frames.get(key)
+        if png is not None:
+            self.frames.move_to_end(key)
+        return png
+
+    def put(self, key, png):
+        self.frames[key] = png
+        self.frames.move_to_end(key)
+        while len(self.frames) > self.limit:
+            self.frames.popitem(last=False)
+        return png
+
+    def clear(self):
+        """Drop every frame; they are drawn again when next shown"""
+        self.frames.clear()
+        self.last = None
+
+    def memory_report(self):
+        """Bytes held, in the same form as BatchMixin.memory_report(), with frames as the elements"""
+        seen = {id(self)}
+        parts = {'frames': deep_size(self.frames, seen), 'last': deep_size(self.last, seen)}
+        total = sys.getsizeof(self) + sum(parts.values())
+        return {
+            'total': total,
+            'elements': len(self.frames),
+            'bytes_per_element': total / len(self.frames) if self.frames else None,
+            'parts': parts,
+        }
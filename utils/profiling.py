@@ -0,0 +1,198 @@
+"""
+Per-rerun profiling: where a Streamlit rerun spends its time, optionally under cProfile
+"""
+
+import cProfile
+import functools
+import marshal
+import threading
+import time
+
+import matplotlib.figure
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+
+from data_structures.base import BatchMixin
+
+PROFILE_HISTORY = 5  # Recent reruns kept for the sidebar report
+TOP_FUNCTIONS = 15
+
+# Visualizer method -> section of the page it draws
+SECTIONS = {
+    "render_with_pseudocode": "pseudocode tabs",
+    "render": "page layout",
+    "_render_controls": "controls",
+    "_render_visualization": "visualization",
+    "_render_results": "results",
+}
+HISTORY_SECTION_PREFIX = "_render_history"  # _render_history, _render_history_and_stats, ...
+
+# What the time was spent doing, whichever section it fell in
+STRUCTURE_OPS = "structure ops"
+FIGURE_BUILD = "figure build"
+PNG_ENCODE = "PNG encode"
+STREAMLIT_EMIT = "Streamlit emission"
+OTHER = "other Python"
+
+_local = threading.local()  # The profiler of the rerun running on this thread, if any
+_hooks_installed = False
+_hooks_lock = threading.Lock()  # First reruns of several sessions may race to install the hooks
+
+
+class _Ledger:
+    """Exclusive wall time per name; entering a nested name pauses the one around it"""
+
+    def __init__(self, outermost):
+        self.totals = {}
+        self._stack = [[outermost, time.perf_counter()]]
+
+    def _charge(self, now):
+        name, since = self._stack[-1]
+        self.totals[name] = self.totals.get(name, 0.0) + now - since
+
+    def enter(self, name):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.append([name, now])
+
+    def exit(self):
+        now = time.perf_counter()
+        self._charge(now)
+        self._stack.pop()
+        self._stack[-1][1] = now
+
+    def close(self):
+        self._charge(time.perf_counter())
+        return self.totals
+
+
+class RerunProfiler:
+    """Context manager timing one rerun by section and by kind of work"""
+
+    def __init__(self, page, use_cprofile=False):
+        self.page = page
+        self.sections = _Ledger("page layout")
+        self.kinds = _Ledger(OTHER)
+        self._cprofile = cProfile.Profile() if use_cprofile else None
+        self._patched = []  # (structure, method name, previous instance attribute) wrapped for this rerun only
+
+    def __enter__(self):
+        _install_hooks()
+        _local.profiler = self
+        self._start = time.perf_counter()
+        if self._cprofile is not None:
+            self._cprofile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # st.rerun() and st.stop() end a rerun by raising; the timings still count
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        total = time.perf_counter() - self._start
+        _local.profiler = None
+        for structure, name, previous in reversed(self._patched):
+            if previous is None:
+                structure.__dict__.pop(name, None)
+            else:
+                structure.__dict__[name] = previous  # Another per-rerun wrapper, such as a session limit
+
+        report = {
+            "page": self.page,
+            "total": total,
+            "sections": self.sections.close(),
+            "kinds": self.kinds.close(),
+            "interrupted": exc_type is not None,
+            "pstats": None,
+            "top": [],
+        }
+        if self._cprofile is not None:
+            self._cprofile.create_stats()
+            report["pstats"] = marshal.dumps(self._cprofile.stats)  # Same bytes as dump_stats()
+            report["top"] = _top_functions(self._cprofile.stats)
+
+        reports = st.session_state.setdefault("rerun_profiles", [])
+        reports.insert(0, report)
+        del reports[PROFILE_HISTORY:]
+        return False
+
+    def timed(self, function, section=None, kind=None):
+        """Wrap function so its time is charged to a section and/or a kind of work"""
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if section:
+                self.sections.enter(section)
+            if kind:
+                self.kinds.enter(kind)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if kind:
+                    self.kinds.exit()
+                if section:
+                    self.sections.exit()
+        return wrapper
+
+    def instrument(self, visualizer):
+        """Time the sections of a visualizer and the public operations of its structures"""
+        for name in dir(type(visualizer)):
+            section = SECTIONS.get(name) or ("history" if name.startswith(HISTORY_SECTION_PREFIX) else None)
+            if section:
+                kind = FIGURE_BUILD if name == "_render_visualization" else OTHER
+                setattr(visualizer, name, self.timed(getattr(visualizer, name), section, kind))
+
+        # Structures live in session_state, so their wrappers are removed when the rerun ends
+        for structure in vars(visualizer).values():
+            if isinstance(structure, BatchMixin):
+                for name in dir(type(structure)):
+                    method = getattr(structure, name)
+                    if not name.startswith("_") and callable(method):
+                        self._patched.append((structure, name, structure.__dict__.get(name)))
+                        setattr(structure, name, self.timed(method, kind=STRUCTURE_OPS))
+        return visualizer
+
+
+def _hooked(function, kind):
+    """Charge calls made during a profiled rerun to a kind of work; otherwise a plain call"""
+    @functools.wraps(function)
+    def hooked(*args, **kwargs):
+        profiler = getattr(_local, "profiler", None)
+        if profiler is None:
+            return function(*args, **kwargs)
+        profiler.kinds.enter(kind)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.kinds.exit()
+    return hooked
+
+
+def _install_hooks():
+    """Hook PNG encoding and the st.* element functions once per process"""
+    # Other sessions share these functions, so the hooks stay installed and
+    # only do work on the thread of a rerun that is being profiled
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    with _hooks_lock:
+        if _hooks_installed:
+            return  # Another thread installed them while this one waited; wrapping twice would double count
+
+        # st.pyplot and utils.figures.png_bytes save the figure to PNG, which draws it with Agg and encodes the pixels
+        matplotlib.figure.Figure.savefig = _hooked(matplotlib.figure.Figure.savefig, PNG_ENCODE)
+        for name in dir(st):
+            if name.startswith("_"):
+                continue
+            element = getattr(st, name)
+            if isinstance(getattr(element, "__self__", None), DeltaGenerator):
+                setattr(st, name, _hooked(element, STREAMLIT_EMIT))
+        _hooks_installed = True  # Only once every hook is in place
+
+
+def _top_functions(stats):
+    """The functions with the most cumulative time in cProfile stats"""
+    rows = []
+    for (filename, line, function), (calls, _, own, cumulative, _) in stats.items():
+        rows.append({"function": f"{function} ({filename.rsplit('/', 1)[-1]}:{line})", "calls": calls,
+                     "own ms": round(own * 1000, 2), "cumulative ms": round(cumulative * 1000, 2)})
+    rows.sort(key=lambda row: row["cumulative ms"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
@@ -151,6 +151,51 @@ BEGIN
         PostorderTraversal(root.left)
         PostorderTraversal(root.right)
         PRINT root.data
+END
+    """,
+
+    "select": """
+ALGORITHM Select(root, k)
+BEGIN
+    1. node = root
+    2. WHILE node is not NULL DO
+        left_size = SIZE(node.left)
+        IF k < left_size THEN
+            node = node.left
+        ELSE IF k > left_size THEN
+            k = k - left_size - 1
+            node = node.right
+        ELSE
+            RETURN node.data
+    3. RETURN NULL
+END
+    """,
+
+    "rank": """
+ALGORITHM Rank(root, value)
+BEGIN
+    1. count = 0
+    2. node = root
+    3. WHILE node is not NULL DO
+        IF node.data < value THEN
+            count = count + SIZE(node.left) + 1
+            node = node.right
+        ELSE
+            node = node.left
+    4. RETURN count
+END
+    """,
+
+    "rebalance": """
+ALGORITHM Rebalance(root, n)    // Day-Stout-Warren
+BEGIN
+    1. TreeToVine(root)          // right rotations until no left children
+    2. leaves = n + 1 - 2^floor(log2(n + 1))
+    3. Compress(root, leaves)
+    4. n = n - leaves
+    5. WHILE n > 1 DO
+        n = n / 2
+        Compress(root, n)        // left-rotate every other vine node
 END
     """
 }
@@ -0,0 +1,293 @@
+"""
+Per-session resource limits: element and memory caps, and spilling idle sessions to disk
+
+Every visitor keeps their own structures in st.session_state for as long as the session
+lives. The SessionResourceManager wraps each rerun: it restores anything spilled to disk
+before the page runs, refuses growth past the element cap while it runs, and afterwards
+trims histories, checks the memory cap and moves sessions that have gone idle to disk.
+"""
+
+import atexit
+import functools
+import itertools
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from data_structures.base import BatchMixin
+from data_structures.persistent_tree import TreeVersions
+from data_structures.snapshot import from_snapshot, to_snapshot
+from utils.figures import FrameCache
+
+MAX_ELEMENTS = 200_000  # Elements across all structures of one session
+MAX_BYTES = 64 * 2 ** 20  # Deep size of all structures of one session
+HISTORY_LIMIT = 500  # Newest history entries kept per structure
+IDLE_SECONDS = 10 * 60  # A session untouched this long is moved to disk
+SWEEP_SECONDS = 60  # How often a rerun looks for idle sessions
+MEMORY_CHECK_SECONDS = 30  # How often a session's deep size is measured
+
+# Caches rebuilt on demand, so compaction can drop them
+CACHE_ATTRIBUTES = ("_flat_cache", "_layout", "_layout_cache", "_skip_index", "_hashes")
+
+# Class name -> methods adding one element, and methods taking an iterable of them first
+SINGLE_GROWTH = {
+    "Stack": ("push",),
+    "Queue": ("enqueue",),
+    "LinkedList": ("insert_at_beginning", "insert_at_end", "insert_at_position"),
+    "BinaryTree": ("insert",),
+    "HashTable": ("insert",),
+    "Heap": ("insert",),
+    "Graph": ("add_vertex", "add_edge"),
+}
+BULK_GROWTH = {
+    "Stack": ("extend",),
+    "Queue": ("extend",),
+    "LinkedList": ("extend",),
+    "BinaryTree": ("build_from",),
+    "HashTable": ("update",),
+    "Heap": ("build_heap",),
+    "Graph": ("add_edges",),
+}
+REPLACING = ("build_from", "build_heap")  # Replace the contents, so the old elements don't count
+
+_sessions = {}  # Session id -> _Session, for every session this process has served
+_sessions_lock = threading.Lock()
+_sweep_lock = threading.Lock()
+_last_sweep = 0.0
+_spill_dir = None
+_END = object()
+
+
+class _Spilled:
+    """Stands in session_state for a structure moved to disk until the session's next rerun"""
+
+    def __init__(self, path):
+        self.path = path
+
+
+class _Session:
+    """What the manager tracks about one session between its reruns"""
+
+    def __init__(self, session_id, state):
+        self.session_id = session_id
+        self.state = weakref.ref(state)  # Dropped by Streamlit when the session ends
+        self.lock = threading.Lock()  # Held while a rerun runs or the session is being spilled
+        self.last_seen = time.monotonic()
+        self.last_memory_check = 0.0
+        self.spilled = False
+
+
+def _spill_path(session_id, key):
+    global _spill_dir
+    if _spill_dir is None:
+        # Private to this process and user, since other sessions' data lands here
+        _spill_dir = tempfile.mkdtemp(prefix="ds_visualizer_sessions_")
+        atexit.register(shutil.rmtree, _spill_dir, True)
+    return os.path.join(_spill_dir, f"{session_id}_{re.sub(r'[^A-Za-z0-9_-]', '_', key)}.snapshot")
+
+
+def _spill(session_id, key, structure):
+    """Write a structure's snapshot to disk; returns the placeholder to keep in its place"""
+    payload = to_snapshot(structure)  # Raises ValueError for values snapshots can't hold
+    path = _spill_path(session_id, key)
+    with open(path, "wb") as handle:
+        handle.write(payload)
+    return _Spilled(path)
+
+
+def _restore(placeholder):
+    with open(placeholder.path, "rb") as handle:
+        structure = from_snapshot(handle.read())
+    os.remove(placeholder.path)
+    return structure
+
+
+def compact(structure):
+    """Trim the history to its newest entries and drop rebuildable caches"""
+    del structure.history[:-HISTORY_LIMIT]
+    for name in CACHE_ATTRIBUTES:
+        if getattr(structure, name, None) is not None:
+            setattr(structure, name, None)
+
+
+def _structures(state):
+    return {key: value for key, value in state.filtered_state.items() if isinstance(value, BatchMixin)}
+
+
+def _rebuildable(state):
+    """Tree versions and frame caches: they count towards the memory cap, and are dropped rather than spilled"""
+    return {key: value for key, value in state.filtered_state.items() if isinstance(value, (TreeVersions, FrameCache))}
+
+
+def spill_session(record, keep=()):
+    """Move a session's structures, except those in keep, to disk and drop what can be rebuilt; returns how many moved"""
+    state = record.state()
+    if state is None:
+        return 0
+    for value in _rebuildable(state).values():
+        value.clear()  # Can't be written as snapshots; the pages rebuild them from their structures
+    moved = 0
+    for key, structure in _structures(state).items():
+        if structure in keep:
+            continue
+        try:
+            state[key] = _spill(record.session_id, key, structure)
+        except ValueError:
+            continue  # Holds values snapshots can't encode, so it stays in memory
+        moved += 1
+    return moved
+
+
+def _sweep():
+    """Spill sessions idle for IDLE_SECONDS and forget sessions that have ended"""
+    if not _sweep_lock.acquire(blocking=False):
+        return  # Another rerun is already sweeping
+    try:
+        now = time.monotonic()
+        with _sessions_lock:
+            records = list(_sessions.values())
+        for record in records:
+            if record.state() is None:
+                with _sessions_lock:
+                    _sessions.pop(record.session_id, None)
+                if _spill_dir is not None:
+                    for name in os.listdir(_spill_dir):
+                        if name.startswith(f"{record.session_id}_"):
+                            os.remove(os.path.join(_spill_dir, name))
+            elif not record.spilled and now - record.last_seen > IDLE_SECONDS:
+                # Skip a session that started a rerun meanwhile; it's no longer idle
+                if record.lock.acquire(blocking=False):
+                    try:
+                        spill_session(record)
+                        record.spilled = True
+                    finally:
+                        record.lock.release()
+    finally:
+        _sweep_lock.release()
+
+
+class SessionResourceManager:
+    """Context manager around one rerun that keeps the session within its limits"""
+
+    def __init__(self):
+        self.notices = []
+        self._record = None
+        self._active = []  # Structures of the page shown in this rerun
+        self._patched = []
+
+    def __enter__(self):
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return self  # Bare mode: there are no other sessions to protect against
+        with _sessions_lock:
+            record = _sessions.get(ctx.session_id)
+            if record is None or record.state() is not ctx.session_state:
+                record = _sessions[ctx.session_id] = _Session(ctx.session_id, ctx.session_state)
+        record.lock.acquire()  # Waits for a sweep that is spilling this session right now
+        self._record = record
+
+        # Transparent restore: the page finds its structures where it left them
+        for key, value in list(st.session_state.items()):
+            if isinstance(value, _Spilled):
+                st.session_state[key] = _restore(value)
+        record.spilled = False
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # st.rerun() ends a rerun by raising; limits are still enforced on the way out
+        for structure, name, previous in reversed(self._patched):
+            if previous is None:
+                structure.__dict__.pop(name, None)
+            else:
+                structure.__dict__[name] = previous  # A wrapper that outlives the rerun, such as the timeline's
+        record = self._record
+        if record is None:
+            return False
+        try:
+            self._enforce(record, show=exc_type is None)
+        finally:
+            record.last_seen = time.monotonic()
+            record.lock.release()
+
+        global _last_sweep
+        if time.monotonic() - _last_sweep > SWEEP_SECONDS:
+            _last_sweep = time.monotonic()
+            threading.Thread(target=_sweep, name="session-sweep", daemon=True).start()
+        return False
+
+    def elements(self):
+        """Elements across every structure of this session"""
+        return sum(structure._element_count() for structure in _structures(self._record.state()).values())
+
+    def guard(self, visualizer):
+        """Make the growth operations of a visualizer's structures respect the element cap"""
+        if self._record is None:
+            return visualizer
+        for structure in vars(visualizer).values():
+            if not isinstance(structure, BatchMixin):
+                continue
+            self._active.append(structure)
+            # Counting subclasses from data_structures.instrumented grow through the same methods
+            name = next(cls.__name__ for cls in type(structure).__mro__ if cls.__name__ in SINGLE_GROWTH or cls is object)
+            for method in SINGLE_GROWTH.get(name, ()):
+                self._patch(structure, method, bulk=False)
+            for method in BULK_GROWTH.get(name, ()):
+                self._patch(structure, method, bulk=True)
+        return visualizer
+
+    def _patch(self, structure, name, bulk):
+        method = getattr(structure, name)
+        message = f"Session limit of {MAX_ELEMENTS:,} elements reached; delete or clear something first"
+
+        @functools.wraps(method)
+        def limited(*args, **kwargs):
+            room = MAX_ELEMENTS - self.elements()
+            if name in REPLACING:
+                room += structure._element_count()
+            if not bulk:
+                return method(*args, **kwargs) if room > 0 else (False, message)
+
+            values = iter(args[0])
+            accepted = itertools.islice(values, max(room, 0))
+            result, outcome = method(list(accepted) if name in REPLACING else accepted, *args[1:], **kwargs)
+            if next(values, _END) is not _END:
+                outcome += f" (stopped at the session limit of {MAX_ELEMENTS:,} elements)"
+            return result, outcome
+
+        self._patched.append((structure, name, structure.__dict__.get(name)))
+        structure.__dict__[name] = limited  # Removed when the rerun ends
+
+    def _enforce(self, record, show):
+        structures = _structures(record.state())
+        for structure in structures.values():
+            del structure.history[:-HISTORY_LIMIT]
+
+        elements = sum(structure._element_count() for structure in structures.values())
+        if elements > MAX_ELEMENTS:
+            # Bulk edge imports add vertices on top of the edges they were limited to
+            self.notices.append(("warning", f"This session holds {elements:,} elements, above the "
+                                            f"limit of {MAX_ELEMENTS:,}"))
+
+        now = time.monotonic()
+        if now - record.last_memory_check > MEMORY_CHECK_SECONDS:
+            record.last_memory_check = now
+            accounted = [*structures.values(), *_rebuildable(record.state()).values()]
+            size = sum(value.memory_report()["total"] for value in accounted)
+            if size > MAX_BYTES:
+                for structure in structures.values():
+                    compact(structure)
+                moved = spill_session(record, keep=self._active)
+                self.notices.append(("warning", f"This session used {size / 2 ** 20:.0f} MiB, above the "
+                                                f"{MAX_BYTES / 2 ** 20:.0f} MiB limit; {moved} structure(s) "
+                                                f"not on this page were moved to disk"))
+
+        if show:
+            for kind, text in self.notices:
+                getattr(st.sidebar, kind)(text)
@@ -0,0 +1,322 @@
+"""
+Layout helpers for drawing binary trees stored as flat parallel arrays
+"""
+
+class TidyLayout:
+    """Reingold-Tilford tidy layout for a binary tree stored as flat arrays"""
+
+    # left/right are the child index arrays of the flat export (-1 for a missing
+    # child) and must list every child after its parent, so reverse index order
+    # is a valid postorder. They are shared with the caller so that add_leaf()
+    # can re-merge only the ancestors of a newly inserted leaf.
+
+    def __init__(self, left, right, min_separation=2):
+        self.left = left
+        self.right = right
+        self.min_separation = min_separation
+
+        n = len(left)
+        self.parent = [-1] * n
+        self.depth = [0] * n
+        for i in range(n):
+            for child in (left[i], right[i]):
+                if child != -1:
+                    self.parent[child] = i
+                    self.depth[child] = self.depth[i] + 1
+
+        # Distance from a node to its children (or to its thread target for leaves)
+        self.offset = [0] * n
+        # Threads link the deepest node of a shallow subtree to the next contour node
+        self.thread_left = [-1] * n
+        self.thread_right = [-1] * n
+        self.threaded = [-1] * n  # Leaf that each node threaded while being merged
+        # Leftmost/rightmost deepest node of each subtree: (node, x offset from subtree root, level)
+        self.leftmost = [None] * n
+        self.rightmost = [None] * n
+
+        for node in reversed(range(n)):
+            self._setup(node)
+
+    def _next_left(self, node):
+        """Next node on a left contour"""
+        child = self.left[node]
+        return child if child != -1 else self.thread_left[node]
+
+    def _next_right(self, node):
+        """Next node on a right contour"""
+        child = self.right[node]
+        return child if child != -1 else self.thread_right[node]
+
+    def _setup(self, node):
+        """Merge the two (already laid out) subtrees of node as close as possible"""
+        left, right = self.left[node], self.right[node]
+        level = self.depth[node]
+
+        if left == -1 and right == -1:
+            self.offset[node] = 0
+            self.leftmost[node] = self.rightmost[node] = (node, 0, level)
+            return
+
+        min_separation = self.min_separation
+        current_separation = root_separation = min_separation
+        left_offset_sum = right_offset_sum = 0
+
+        # Walk the right contour of the left subtree and the left contour of the right subtree
+        l, r = left, right
+        while l != -1 and r != -1:
+            if current_separation < min_separation:
+                root_separation += min_separation - current_separation
+                current_separation = min_separation
+
+            if self._next_right(l) != -1:
+                left_offset_sum += self.offset[l]
+                current_separation -= self.offset[l]
+                l = self._next_right(l)
+            else:
+                left_offset_sum -= self.offset[l]
+                current_separation += self.offset[l]
+                l = self._next_left(l)
+
+            if self._next_left(r) != -1:
+                right_offset_sum -= self.offset[r]
+                current_separation -= self.offset[r]
+                r = self._next_left(r)
+            else:
+                right_offset_sum += self.offset[r]
+                current_separation += self.offset[r]
+                r = self._next_right(r)
+
+        offset = (root_separation + 1) // 2
+        self.offset[node] = offset
+        left_offset_sum -= offset
+        right_offset_sum += offset
+
+        empty = (-1, 0, -1)
+        ll = self.leftmost[left] if left != -1 else empty
+        lr = self.rightmost[left] if left != -1 else empty
+        rl = self.leftmost[right] if right != -1 else empty
+        rr = self.rightmost[right] if right != -1 else empty
+
+        if rl[2] > ll[2] or left == -1:
+            self.leftmost[node] = (rl[0], rl[1] + offset, rl[2])
+        else:
+            self.leftmost[node] = (ll[0], ll[1] - offset, ll[2])
+
+        if lr[2] > rr[2] or right == -1:
+            self.rightmost[node] = (lr[0], lr[1] - offset, lr[2])
+        else:
+            self.rightmost[node] = (rr[0], rr[1] + offset, rr[2])
+
+        # Thread the shallower subtree's extreme leaf onto the deeper contour
+        if l != -1 and l != left:
+            leaf, leaf_offset = rr[0], rr[1] + offset
+            self.offset[leaf] = abs(leaf_offset - left_offset_sum)
+            if left_offset_sum <= leaf_offset:
+                self.thread_left[leaf] = l
+            else:
+                self.thread_right[leaf] = l
+            self.threaded[node] = leaf
+        elif r != -1 and r != right:
+            leaf, leaf_offset = ll[0], ll[1] - offset
+            self.offset[leaf] = abs(leaf_offset - right_offset_sum)
+            if right_offset_sum >= leaf_offset:
+                self.thread_right[leaf] = r
+            else:
+                self.thread_left[leaf] = r
+            self.threaded[node] = leaf
+
+    def _clear_thread(self, node):
+        """Remove the thread that node set while it was merged"""
+        leaf = self.threaded[node]
+        if leaf != -1:
+            self.thread_left[leaf] = -1
+            self.thread_right[leaf] = -1
+            self.offset[leaf] = 0
+            self.threaded[node] = -1
+
+    def add_leaf(self, index, parent):
+        """Update the layout after the caller appended leaf index under parent"""
+        self.parent.append(parent)
+        self.depth.append(self.depth[parent] + 1)
+        self.offset.append(0)
+        self.thread_left.append(-1)
+        self.thread_right.append(-1)
+        self.threaded.append(-1)
+        self.leftmost.append(None)
+        self.rightmost.append(None)
+
+        path = []
+        node = parent
+        while node != -1:
+            path.append(node)
+            node = self.parent[node]
+
+        # Threads set by the ancestors may run through the changed subtree, so
+        # drop them all before re-merging the path bottom-up
+        for node in path:
+            self._clear_thread(node)
+
+        self._setup(index)
+        for node in path:
+            self._setup(node)
+
+    def positions(self):
+        """Get absolute x positions, shifted so the leftmost node is at 0"""
+        n = len(self.left)
+        if n == 0:
+            return []
+
+        x = [0] * n
+        for i in range(n):  # Parents come before their children
+            if self.left[i] != -1:
+                x[self.left[i]] = x[i] - self.offset[i]
+            if self.right[i] != -1:
+                x[self.right[i]] = x[i] + self.offset[i]
+
+        shift = min(x)
+        return [value - shift for value in x]
+
+
+def subtree_summaries(flat):
+    """Get (count, min, max, height) for every subtree, cached per flat version"""
+    data, left, right = flat['data'], flat['left'], flat['right']
+    cached = flat.get('summaries')
+    if cached is not None and cached[0] == flat['version'] and len(cached[1]) == len(data):
+        return cached[1]
+
+    n = len(data)
+    count = [1] * n
+    low = list(data)
+    high = list(data)
+    height = [1] * n
+    for i in reversed(range(n)):  # Children before parents
+        for child in (left[i], right[i]):
+            if child != -1:
+                count[i] += count[child]
+                low[i] = min(low[i], low[child])
+                high[i] = max(high[i], high[child])
+                height[i] = max(height[i], height[child] + 1)
+
+    summaries = list(zip(count, low, high, height))
+    flat['summaries'] = (flat['version'], summaries)
+    return summaries
+
+
+def level_of_detail(flat, budget, expanded=(), keys=None):
+    """Prune a flat tree to about budget drawn nodes, collapsing deeper subtrees"""
+    # Nodes below the deepest level that still fits in the budget are hidden and
+    # their subtree is summarized on the last visible ancestor. A node whose key
+    # is in expanded shows its children anyway, with a fresh depth budget.
+    data, left, right, depth = flat['data'], flat['left'], flat['right'], flat['depth']
+    if len(data) <= budget:
+        return flat
+    if keys is None:
+        keys = range(len(data))
+
+    # Deepest complete level that fits, found by counting levels top-down
+    cutoff = 0
+    total = 1
+    level = [0]
+    while True:
+        next_level = [c for i in level for c in (left[i], right[i]) if c != -1]
+        if not next_level or total + len(next_level) > budget:
+            break
+        total += len(next_level)
+        cutoff += 1
+        level = next_level
+
+    summaries = subtree_summaries(flat)
+    view = {'version': flat['version'], 'source': [0], 'data': [], 'left': [],
+            'right': [], 'depth': [], 'summary': []}
+    relative_depth = [0]
+    for index, source in enumerate(view['source']):  # Grows while we scan it (BFS)
+        view['data'].append(data[source])
+        view['depth'].append(depth[source])
+        children = (left[source], right[source])
+        has_children = children != (-1, -1)
+        show_children = relative_depth[index] < cutoff or keys[source] in expanded
+
+        view['summary'].append(summaries[source] if has_children and not show_children else None)
+        for child, links in ((children[0], view['left']), (children[1], view['right'])):
+            if child == -1 or not show_children:
+                links.append(-1)
+            else:
+                links.append(len(view['source']))
+                view['source'].append(child)
+                child_depth = relative_depth[index] + 1
+                relative_depth.append(0 if child_depth > cutoff else child_depth)
+
+    layout = TidyLayout(view['left'], view['right'])
+    view['x'] = layout.positions()
+    view['y'] = [-d for d in view['depth']]
+    if 'hash' in flat:
+        view['hash'] = [flat['hash'][source] for source in view['source']]
+    return view
+
+
+def flat_traversal(flat, order):
+    """Lazily yield the values of a flat tree export in "inorder", "preorder" or "postorder" order"""
+    # An explicit stack instead of recursion, so degenerate trees don't hit the recursion
+    # limit, and lazy, so taking the first k values visits O(k + height) nodes
+    data, left, right = flat['data'], flat['left'], flat['right']
+    if not data:
+        return
+    if order == "inorder":
+        stack = []
+        index = 0
+        while stack or index != -1:
+            if index != -1:
+                stack.append(index)
+                index = left[index]
+            else:
+                index = stack.pop()
+                yield data[index]
+                index = right[index]
+        return
+
+    stack = [(0, False)]
+    while stack:
+        index, children_done = stack.pop()
+        if order == "preorder" or children_done:
+            yield data[index]
+            if order == "postorder":
+                continue
+        else:
+            stack.append((index, True))  # Postorder: yielded once both subtrees have been
+        stack.extend((child, False) for child in (right[index], left[index]) if child != -1)
+
+
+def changed_nodes(previous, flat):
+    """Indices of flat whose node differs from the previous frame's, visiting only changed subtrees"""
+    # Both frames carry each node's subtree hash and are matched by the path from the
+    # root. Where a hash equals the previous frame's at the same path the whole subtree
+    # is unchanged and skipped, so the walk costs O(changed nodes), not O(n). A node is
+    # changed when its value is new, it has no counterpart, or it summarizes a collapsed
+    # subtree that changed; its ancestors are on the changed path but keep their values.
+    if previous is None or not flat['data']:
+        return set()
+    summaries = flat.get('summary')
+    changed = set()
+    stack = [(0, 0 if previous['data'] else -1)]
+    while stack:
+        index, before = stack.pop()
+        if before == -1:
+            # Nothing was here before, so the whole subtree is new
+            changed.add(index)
+            stack.extend((child, -1) for child in (flat['left'][index], flat['right'][index]) if child != -1)
+            continue
+        if flat['hash'][index] == previous['hash'][before]:
+            continue
+        if flat['data'][index] != previous['data'][before] or (summaries and summaries[index]):
+            changed.add(index)
+        for links, previous_links in ((flat['left'], previous['left']), (flat['right'], previous['right'])):
+            if links[index] != -1:
+                stack.append((links[index], previous_links[before]))
+    return changed
+
+
+def points_per_unit(xs, ys, figsize, margin=1):
+    """How many typographic points one layout unit spans once the axes fit the layout"""
+    width = max(xs) - min(xs) + 2 * margin
+    height = max(ys) - min(ys) + 2 * margin
+    return min(figsize[0] * 72 / width, figsize[1] * 72 / height)
@@ -0,0 +1,171 @@
+"""
+Seeded synthetic workloads (keys, graphs and operation traces) for demos and benchmarks
+"""
+
+import math
+import string
+
+import numpy as np
+
+KEY_DISTRIBUTIONS = ("random", "sorted", "reverse", "zipf")
+GRAPH_MODELS = {
+    "erdos_renyi": "Erdős–Rényi",
+    "barabasi_albert": "Barabási–Albert",
+    "grid": "Grid",
+    "dag": "DAG",
+}
+ZIPF_EXPONENT = 1.3
+
+# (add, remove) operation names of the structures that take push/pop traces
+TRACE_OPERATIONS = {
+    "stack": ("push", "pop"),
+    "queue": ("enqueue", "dequeue"),
+    "heap": ("insert", "extract"),
+}
+
+
+def key_sequence(n, distribution="random", seed=0):
+    """Get n integer keys: distinct for random/sorted/reverse, heavily repeated for zipf"""
+    rng = np.random.default_rng(seed)
+    if distribution == "zipf":
+        # Zipf ranks mapped through a shuffle so the popular keys aren't just 0, 1, 2...
+        ranks = (rng.zipf(ZIPF_EXPONENT, n) - 1) % max(n, 1)
+        return rng.permutation(max(n, 1))[ranks].tolist()
+
+    values = rng.choice(10 * max(n, 1), size=n, replace=False)
+    if distribution == "sorted":
+        values.sort()
+    elif distribution == "reverse":
+        values = np.sort(values)[::-1]
+    elif distribution != "random":
+        raise ValueError(f"Unknown distribution {distribution}; expected one of {', '.join(KEY_DISTRIBUTIONS)}")
+    return values.tolist()
+
+
+def anagram_keys(n, seed=0):
+    """Get n distinct strings that are all anagrams of one word"""
+    # HashTable._hash sums character codes, so every anagram lands in the same bucket
+    length = 6
+    while math.factorial(length) < 4 * n:  # Keep enough spare permutations for quick sampling
+        length += 1
+    rng = np.random.default_rng(seed)
+    letters = np.array(list(string.ascii_lowercase))[rng.choice(26, size=length, replace=False)]
+
+    keys = {}
+    while len(keys) < n:
+        key = "".join(rng.permutation(letters))
+        keys[key] = None  # A dict keeps first-seen order, unlike a set
+    return list(keys)
+
+
+def _edge_list(rng, sources, targets, max_weight):
+    """Zip endpoints with weights, 1 everywhere unless a larger max_weight is given"""
+    if max_weight > 1:
+        weights = rng.integers(1, max_weight + 1, size=len(sources)).tolist()
+    else:
+        weights = [1] * len(sources)
+    return list(zip(sources.tolist(), targets.tolist(), weights))
+
+
+def _sample_pairs(rng, n, count, ordered):
+    """Sample count distinct vertex pairs u != v, with u < v unless ordered"""
+    count = min(count, n * (n - 1) // (1 if ordered else 2))
+    codes = np.empty(0, dtype=np.int64)
+    while len(codes) < count:
+        u = rng.integers(0, n, size=2 * (count - len(codes)) + 16)
+        v = rng.integers(0, n, size=len(u))
+        keep = u != v
+        u, v = u[keep], v[keep]
+        if not ordered:
+            u, v = np.minimum(u, v), np.maximum(u, v)
+        codes = np.unique(np.concatenate([codes, u * n + v]))
+    codes = rng.permutation(codes)[:count]
+    return codes // n, codes % n
+
+
+def erdos_renyi_edges(n, p, seed=0, max_weight=1):
+    """Get the edges of a G(n, p) random graph, each pair joined with probability p"""
+    rng = np.random.default_rng(seed)
+    count = rng.binomial(n * (n - 1) // 2, min(max(p, 0.0), 1.0)) if n > 1 else 0
+    sources, targets = _sample_pairs(rng, n, count, ordered=False)
+    return _edge_list(rng, sources, targets, max_weight)
+
+
+def barabasi_albert_edges(n, m=2, seed=0, max_weight=1):
+    """Get the edges of a preferential attachment graph where each new vertex joins m others"""
+    rng = np.random.default_rng(seed)
+    m = max(1, min(m, n - 1)) if n > 1 else 0
+    sources, targets = [], []
+    endpoints = list(range(m))  # Every vertex once per edge end, so picks follow degree
+    for vertex in range(m, n):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.add(endpoints[rng.integers(len(endpoints))])
+        for target in chosen:
+            sources.append(vertex)
+            targets.append(target)
+        endpoints.extend(chosen)
+        endpoints.extend([vertex] * m)
+    return _edge_list(rng, np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64), max_weight)
+
+
+def grid_edges(n, seed=0, max_weight=1):
+    """Get the edges of the first n vertices of a square lattice, numbered row by row"""
+    rng = np.random.default_rng(seed)
+    width = max(1, math.isqrt(n - 1) + 1) if n > 0 else 1
+    vertices = np.arange(n)
+    right = vertices[(vertices % width != width - 1) & (vertices + 1 < n)]
+    down = vertices[vertices + width < n]
+    sources = np.concatenate([right, down])
+    targets = np.concatenate([right + 1, down + width])
+    return _edge_list(rng, sources, targets, max_weight)
+
+
+def dag_edges(n, p, seed=0, max_weight=1):
+    """Get the edges of a random DAG: G(n, p) pairs pointed along a hidden topological order"""
+    rng = np.random.default_rng(seed)
+    count = rng.binomial(n * (n - 1) // 2, min(max(p, 0.0), 1.0)) if n > 1 else 0
+    low, high = _sample_pairs(rng, n, count, ordered=False)
+    order = rng.permutation(n)  # Vertex labels don't give the order away
+    return _edge_list(rng, order[low], order[high], max_weight)
+
+
+def graph_edges(model, n, seed=0, average_degree=4, max_weight=1):
+    """Get the edges of any model, with the density set by average degree"""
+    p = average_degree / (n - 1) if n > 1 else 0
+    if model == "erdos_renyi":
+        return erdos_renyi_edges(n, p, seed, max_weight)
+    if model == "barabasi_albert":
+        return barabasi_albert_edges(n, max(1, round(average_degree / 2)), seed, max_weight)
+    if model == "grid":
+        return grid_edges(n, seed, max_weight)
+    if model == "dag":
+        return dag_edges(n, p, seed, max_weight)
+    raise ValueError(f"Unknown graph model {model}; expected one of {', '.join(GRAPH_MODELS)}")
+
+
+def populate_graph(graph, n, edges, label=None):
+    """Replace a graph's contents with vertices 0..n-1 and the given edges, optionally relabelled"""
+    if label is not None:
+        edges = [(label(u), label(v), weight) for u, v, weight in edges]
+    graph.clear()
+    graph.apply_batch([("add_vertex", vertex if label is None else label(vertex)) for vertex in range(n)])
+    return graph.add_edges(edges)
+
+
+def push_pop_trace(n, add="push", remove="pop", push_ratio=0.6, seed=0):
+    """Get n interleaved (add, value) / (remove,) operations that never remove from empty"""
+    rng = np.random.default_rng(seed)
+    coins = rng.random(n) < push_ratio
+    values = rng.integers(0, 10 * max(n, 1), size=n).tolist()
+
+    ops = []
+    size = 0
+    for coin, value in zip(coins.tolist(), values):
+        if coin or size == 0:
+            ops.append((add, value))
+            size += 1
+        else:
+            ops.append((remove,))
+            size -= 1
+    return ops
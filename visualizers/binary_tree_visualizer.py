@@ -3,18 +3,29 @@ Binary Tree Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from data_structures.binary_tree import BinaryTree
+from data_structures.persistent_tree import TreeVersions, diff
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for,
+                                     tree_frame)
 from utils.pseudocode import BINARY_TREE_PSEUDOCODE
+from utils.tree_layout import flat_traversal, level_of_detail, points_per_unit
+from utils.figures import pooled_subplots
 import time
-import math
+import itertools
 
 class BinaryTreeVisualizer:
+    text_limit = 50  # Values of a traversal listed as text
+    
     def __init__(self):
         if 'binary_tree' not in st.session_state:
             st.session_state.binary_tree = BinaryTree()
         self.tree = st.session_state.binary_tree
+        self.timeline = timeline_for(self.tree, "binary_tree")  # Before any operation of this rerun runs
+        if 'bst_versions' not in st.session_state:
+            st.session_state.bst_versions = TreeVersions()
+        self.versions = st.session_state.bst_versions
     
     def render(self):
         st.title("🌳 Binary Tree Visualizer")
@@ -31,6 +42,9 @@ class BinaryTreeVisualizer:
         
         # Display operation history and traversals
         self._render_history_and_traversals()
+        
+        # Compare any two versions side by side
+        self._render_versions()
     
     def _render_controls(self):
         st.subheader("🎮 Controls")
@@ -62,6 +76,14 @@ class BinaryTreeVisualizer:
                 self.tree.clear()
                 st.rerun()
         
+        render_batch_input(self.tree, "insert_batch", lambda token: ("insert", int(token)),
+                           "Integers to insert")
+        render_import_panel(self.tree, "import")
+        render_snapshot_panel(self.tree, "snapshot", "binary_tree")
+        render_timeline(self.tree, "timeline", "binary_tree")
+        render_workload_panel(self.tree, "workload")
+        render_operation_counts(self.tree, "op_counts")
+        
         # Delete operation
         st.markdown("**Delete Operation**")
         delete_value = st.text_input("Value to delete:", key="delete_input")
@@ -81,6 +103,34 @@ class BinaryTreeVisualizer:
             else:
                 st.warning("Please enter a value to delete")
         
+        # Bulk construction
+        st.markdown("**Build Balanced Tree**")
+        build_input = st.text_input("Enter numbers (comma-separated):", key="build_input")
+        col_build, col_rebalance = st.columns(2)
+        with col_build:
+            if st.button("🏗️ Build Tree"):
+                if build_input:
+                    try:
+                        values = [int(x.strip()) for x in build_input.split(',')]
+                        success, message = self.tree.build_from(values)
+                        st.success(message)
+                        time.sleep(0.5)
+                        st.rerun()
+                    except ValueError:
+                        st.error("Please enter valid integers separated by commas")
+                else:
+                    st.warning("Please enter an array of numbers")
+        
+        with col_rebalance:
+            if st.button("⚖️ Rebalance", disabled=self.tree.is_empty()):
+                success, message = self.tree.rebalance()
+                if success:
+                    st.success(message)
+                    time.sleep(0.5)
+                    st.rerun()
+                else:
+                    st.error(message)
+        
         # Search operation
         st.markdown("**Search Operation**")
         search_value = st.text_input("Value to search:", key="search_input")
@@ -105,24 +155,95 @@ class BinaryTreeVisualizer:
         with col1:
             if st.button("📖 Inorder", disabled=self.tree.is_empty()):
                 result, message = self.tree.inorder_traversal()
-                st.info(f"Inorder: {result}")
+                st.info(f"Inorder: {self._traversal_text(result)}")
         
         with col2:
             if st.button("📖 Preorder", disabled=self.tree.is_empty()):
                 result, message = self.tree.preorder_traversal()
-                st.info(f"Preorder: {result}")
+                st.info(f"Preorder: {self._traversal_text(result)}")
         
         with col3:
             if st.button("📖 Postorder", disabled=self.tree.is_empty()):
                 result, message = self.tree.postorder_traversal()
-                st.info(f"Postorder: {result}")
+                st.info(f"Postorder: {self._traversal_text(result)}")
+        
+        # Order statistic operations
+        st.markdown("**Order Statistics**")
+        col_select, col_rank = st.columns(2)
+        
+        with col_select:
+            k_value = st.number_input("k (0-based):", min_value=0, value=0, key="select_k")
+            if st.button("🔢 k-th Smallest", disabled=self.tree.is_empty()):
+                value, message = self.tree.select(int(k_value))
+                if value is not None:
+                    st.info(message)
+                else:
+                    st.warning(message)
+        
+        with col_rank:
+            rank_value = st.text_input("Value to rank:", key="rank_input")
+            if st.button("📊 Rank"):
+                if rank_value:
+                    try:
+                        result, message = self.tree.rank(int(rank_value))
+                        st.info(message)
+                    except ValueError:
+                        st.error("Please enter a valid integer")
+                else:
+                    st.warning("Please enter a value to rank")
+        
+        col_low, col_high = st.columns(2)
+        with col_low:
+            range_low = st.text_input("Range low:", key="range_low_input")
+        with col_high:
+            range_high = st.text_input("Range high:", key="range_high_input")
+        if st.button("📏 Count Range"):
+            if range_low and range_high:
+                try:
+                    low, high = int(range_low), int(range_high)
+                    count, message = self.tree.count_range(low, high)
+                    st.info(message)
+                    if count:
+                        # Only walk as many in-range nodes as we display
+                        shown = list(itertools.islice(self.tree.range_iter(low, high), 20))
+                        suffix = " ..." if count > len(shown) else ""
+                        st.text(f"Values: {shown}{suffix}")
+                except ValueError:
+                    st.error("Please enter valid integers")
+            else:
+                st.warning("Please enter both range bounds")
+        
+        neighbor_value = st.text_input("Value for floor/ceiling:", key="neighbor_input")
+        col_floor, col_ceiling, col_pred, col_succ = st.columns(4)
+        neighbor_ops = [
+            (col_floor, "⬇️ Floor", self.tree.floor),
+            (col_ceiling, "⬆️ Ceiling", self.tree.ceiling),
+            (col_pred, "⏮️ Pred", self.tree.predecessor),
+            (col_succ, "⏭️ Succ", self.tree.successor),
+        ]
+        for column, label, operation in neighbor_ops:
+            with column:
+                if st.button(label, disabled=self.tree.is_empty()):
+                    if neighbor_value:
+                        try:
+                            value, message = operation(int(neighbor_value))
+                            if value is not None:
+                                st.info(message)
+                            else:
+                                st.warning(message)
+                        except ValueError:
+                            st.error("Please enter a valid integer")
+                    else:
+                        st.warning("Please enter a value")
         
         # Tree information
         st.markdown("**Tree Info**")
         st.write(f"Empty: {self.tree.is_empty()}")
         if not self.tree.is_empty():
-            inorder_result, _ = self.tree.inorder_traversal()
-            st.write(f"Nodes: {len(inorder_result)}")
+            stats = self.tree.stats()
+            st.write(f"Nodes: {stats['size']}")
+            st.write(f"Height: {stats['height']}")
+            st.write(f"Min / Max: {stats['min']} / {stats['max']}")
     
     def _render_visualization(self):
         st.subheader("📊 Binary Tree Visualization")
@@ -131,72 +252,95 @@ class BinaryTreeVisualizer:
             st.info("Tree is empty. Add some nodes to see the visualization!")
             return
         
-        # Get tree structure
-        tree_structure = self.tree.get_tree_structure()
-        
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(12, 8))
+        # Flat arrays are cached on the tree and only rebuilt after a mutation
+        flat = self.tree.get_flat_structure()
         
-        # Calculate tree dimensions
-        inorder_result, _ = self.tree.inorder_traversal()
-        tree_height = self._calculate_height(tree_structure)
+        # Level of detail: beyond the node budget, deep subtrees collapse into summaries
+        budget = st.slider("Node budget", 15, 511, 63, key="bst_node_budget")
+        if 'bst_expanded' not in st.session_state:
+            st.session_state.bst_expanded = set()
+        expanded = st.session_state.bst_expanded
+        view = level_of_detail(flat, budget, expanded, keys=flat['data'])
+        if view is not flat:
+            self._render_expand_controls(view, expanded)
         
-        # Draw the tree
-        self._draw_tree_recursive(ax, tree_structure, 6, 7, 3, 0)
+        figsize = (12, 8)
         
-        # Set axis properties
-        ax.set_xlim(0, 12)
-        ax.set_ylim(0, 8)
-        ax.set_aspect('equal')
-        ax.axis('off')
-        ax.set_title('Binary Search Tree Structure', fontsize=16, fontweight='bold')
+        def draw(ax, changed):
+            # Draw the tree, with the nodes changed since the last frame in green
+            xs, ys = self._draw_tree_flat(ax, view, figsize, {view['data'][i]: 'lightgreen' for i in changed})
+            
+            # Set axis properties to fit the layout extent (plus room for summary glyphs)
+            bottom_margin = 1.6 if view is not flat else 1
+            ax.set_xlim(min(xs) - 1, max(xs) + 1)
+            ax.set_ylim(min(ys) - bottom_margin, max(ys) + 1)
+            ax.set_aspect('equal')
+            ax.axis('off')
+            ax.set_title('Binary Search Tree Structure', fontsize=16, fontweight='bold')
         
         # Display the plot
-        st.pyplot(fig)
-        plt.close()
+        st.image(tree_frame("bst", view, (budget, frozenset(expanded)), draw, figsize))
     
-    def _calculate_height(self, node):
-        """Calculate the height of the tree"""
-        if node is None:
-            return 0
-        
-        left_height = self._calculate_height(node.get('left'))
-        right_height = self._calculate_height(node.get('right'))
-        
-        return 1 + max(left_height, right_height)
+    def _render_expand_controls(self, view, expanded):
+        """Let the user expand collapsed subtrees of a large tree"""
+        collapsed = [view['data'][i] for i, summary in enumerate(view['summary']) if summary is not None]
+        st.caption(f"Showing {len(view['data'])} of {self.tree.size()} nodes; "
+                   f"{len(collapsed)} subtrees are collapsed")
+        
+        col_pick, col_expand, col_reset = st.columns([2, 1, 1])
+        with col_pick:
+            target = st.selectbox("Collapsed subtree root:", collapsed, key="bst_expand_target")
+        with col_expand:
+            if st.button("➕ Expand", disabled=not collapsed):
+                expanded.add(target)
+                st.rerun()
+        with col_reset:
+            if st.button("➖ Collapse All", disabled=not expanded):
+                expanded.clear()
+                st.rerun()
     
-    def _draw_tree_recursive(self, ax, node, x, y, x_offset, level):
-        """Recursively draw the tree nodes and edges"""
-        if node is None:
-            return
-        
-        # Draw the node
-        circle = patches.Circle((x, y), 0.3, linewidth=2, edgecolor='black', facecolor='lightblue')
-        ax.add_patch(circle)
-        
-        # Add the data text
-        ax.text(x, y, str(node['data']), ha='center', va='center', 
-                fontsize=12, fontweight='bold')
-        
-        # Calculate positions for children
-        child_x_offset = x_offset / 1.5 if x_offset > 0.5 else 0.5
-        child_y = y - 1.2
-        
-        # Draw left child
-        if node.get('left'):
-            left_x = x - child_x_offset
-            # Draw edge
-            ax.plot([x, left_x], [y - 0.3, child_y + 0.3], 'k-', linewidth=2)
-            # Recursively draw left subtree
-            self._draw_tree_recursive(ax, node['left'], left_x, child_y, child_x_offset, level + 1)
-        
-        # Draw right child
-        if node.get('right'):
-            right_x = x + child_x_offset
-            # Draw edge
-            ax.plot([x, right_x], [y - 0.3, child_y + 0.3], 'k-', linewidth=2)
-            # Recursively draw right subtree
-            self._draw_tree_recursive(ax, node['right'], right_x, child_y, child_x_offset, level + 1)
+    def _draw_tree_flat(self, ax, flat, figsize, colors=None):
+        """Draw the tree nodes and edges from the flat array export, optionally coloring nodes by value"""
+        x_spacing = 0.5
+        y_spacing = 1.2
+        radius = 0.3
+        
+        xs = [x * x_spacing for x in flat['x']]
+        ys = [y * y_spacing for y in flat['y']]
+        summaries = flat.get('summary')
+        
+        # Shrink labels so they stay inside their nodes as the tree widens
+        fontsize = max(4, min(12, 0.3 * points_per_unit(xs, ys, figsize)))
+        
+        for i, value in enumerate(flat['data']):
+            # Draw edges to children
+            for child in (flat['left'][i], flat['right'][i]):
+                if child != -1:
+                    ax.plot([xs[i], xs[child]], [ys[i] - radius, ys[child] + radius], 'k-', linewidth=2)
+            
+            summary = summaries[i] if summaries else None
+            
+            # Draw the node
+            node_color = 'orange' if summary else (colors or {}).get(value, 'lightblue')
+            circle = patches.Circle((xs[i], ys[i]), radius, linewidth=2, edgecolor='black', facecolor=node_color)
+            ax.add_patch(circle)
+            
+            # Add the data text
+            ax.text(xs[i], ys[i], str(value), ha='center', va='center',
+                    fontsize=fontsize, fontweight='bold')
+            
+            # Collapsed subtree: one glyph with its size, value range and height
+            if summary:
+                count, low, high, height = summary
+                glyph_y = ys[i] - 0.75
+                ax.plot([xs[i], xs[i]], [ys[i] - radius, glyph_y + 0.15], 'k:', linewidth=1)
+                glyph = patches.RegularPolygon((xs[i], glyph_y), 3, radius=0.3,
+                                               edgecolor='black', facecolor='moccasin')
+                ax.add_patch(glyph)
+                ax.text(xs[i], glyph_y - 0.3, f"n={count}\n{low}..{high}\nh={height}",
+                        ha='center', va='top', fontsize=max(4, fontsize * 0.6))
+        
+        return xs, ys
     
     def _render_history_and_traversals(self):
         st.subheader("📝 Operation History & Traversals")
@@ -218,16 +362,78 @@ class BinaryTreeVisualizer:
         
         with col2:
             st.markdown("**Current Traversals**")
-            if not self.tree.is_empty():
-                inorder, _ = self.tree.inorder_traversal()
-                preorder, _ = self.tree.preorder_traversal()
-                postorder, _ = self.tree.postorder_traversal()
-                
-                st.text(f"Inorder:   {inorder}")
-                st.text(f"Preorder:  {preorder}")
-                st.text(f"Postorder: {postorder}")
-            else:
+            if self.tree.is_empty():
                 st.text("Tree is empty")
+            elif st.toggle("Show traversals", key="bst_show_traversals"):
+                # Walks only the values listed, over the flat export the visualization already cached
+                flat = self.tree.get_flat_structure()
+                for label, order in (("Inorder:  ", "inorder"), ("Preorder: ", "preorder"), ("Postorder:", "postorder")):
+                    st.text(f"{label} {self._first_values(flat_traversal(flat, order))}")
+                if len(flat['data']) > self.text_limit:
+                    st.text(f"  ... and {len(flat['data']) - self.text_limit} more in each")
+    
+    def _first_values(self, values):
+        """The first text_limit values as a list, for text that stays short on large trees"""
+        return list(itertools.islice(values, self.text_limit))
+    
+    def _traversal_text(self, values):
+        """A traversal's first text_limit values, and how many more there are"""
+        more = len(values) - self.text_limit
+        return f"{values[:self.text_limit]}" + (f" ... and {more} more" if more > 0 else "")
+    
+    def _render_versions(self):
+        """Side-by-side comparison of two persistent versions, highlighting what changed"""
+        st.subheader("🧬 Versions")
+        self.versions.sync(self.tree, self.timeline)
+        versions = self.versions.versions
+        if self.versions.too_large:
+            st.info(f"Versions aren't kept for trees over {self.versions.node_budget:,} nodes; "
+                    f"this one has {self.versions.too_large:,}")
+            return
+        if len(versions) < 2:
+            st.info("Change the tree to start comparing versions")
+            return
+        
+        # Without keys the pickers reset to the two newest versions whenever one is added
+        labels = [f"v{i}: {version.label}" for i, version in enumerate(versions)]
+        col_old, col_new = st.columns(2)
+        with col_old:
+            old_index = st.selectbox("Compare version:", range(len(versions)), index=len(versions) - 2,
+                                     format_func=labels.__getitem__)
+        with col_new:
+            new_index = st.selectbox("With version:", range(len(versions)), index=len(versions) - 1,
+                                     format_func=labels.__getitem__)
+        old, new = versions[old_index], versions[new_index]
+        
+        changes = diff(old, new)
+        st.caption(f"{len(changes['added'])} added, {len(changes['removed'])} removed, "
+                   f"{len(changes['copied'])} copied along changed paths, {changes['shared']} nodes shared")
+        copies = sum(version.size() for version in versions)
+        st.caption(f"{len(versions)} versions hold at most {self.versions.nodes():,} nodes "
+                   f"(full copies would take {copies:,})")
+        
+        # Removed values are red on the left, added green on the right, copied paths gold on both
+        budget = st.session_state.get("bst_node_budget", 63)
+        figsize = (7, 6)
+        with pooled_subplots((2 * figsize[0], figsize[1]), 1, 2) as (fig, axes):
+            sides = [(axes[0], old, labels[old_index], 'removed', 'salmon'),
+                     (axes[1], new, labels[new_index], 'added', 'lightgreen')]
+            for ax, version, title, change, color in sides:
+                ax.axis('off')
+                ax.set_title(title, fontsize=12, fontweight='bold')
+                if version.root is None:
+                    ax.text(0.5, 0.5, "Empty", ha='center', va='center', transform=ax.transAxes)
+                    continue
+                flat = version.get_flat_structure()
+                view = level_of_detail(flat, budget, keys=flat['data'])
+                colors = dict.fromkeys(changes['copied'], 'gold')
+                colors.update(dict.fromkeys(changes[change], color))
+                xs, ys = self._draw_tree_flat(ax, view, figsize, colors)
+                ax.set_xlim(min(xs) - 1, max(xs) + 1)
+                ax.set_ylim(min(ys) - (1.6 if view is not flat else 1), max(ys) + 1)
+                ax.set_aspect('equal')
+            
+            st.pyplot(fig)
     
     def render_with_pseudocode(self):
         """Render the visualizer with pseudocode sections"""
@@ -238,7 +444,9 @@ class BinaryTreeVisualizer:
         st.subheader("📚 Algorithm Pseudocode")
         
         # Tabs for different operations
-        tab1, tab2, tab3, tab4 = st.tabs(["Insert", "Inorder", "Preorder", "Postorder"])
+        tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(
+            ["Insert", "Inorder", "Preorder", "Postorder", "Select", "Rank", "Rebalance"]
+        )
         
         with tab1:
             st.code(BINARY_TREE_PSEUDOCODE["insert"], language="text")
@@ -251,3 +459,12 @@ class BinaryTreeVisualizer:
         
         with tab4:
             st.code(BINARY_TREE_PSEUDOCODE["postorder"], language="text")
+        
+        with tab5:
+            st.code(BINARY_TREE_PSEUDOCODE["select"], language="text")
+        
+        with tab6:
+            st.code(BINARY_TREE_PSEUDOCODE["rank"], language="text")
+        
+        with tab7:
+            st.code(BINARY_TREE_PSEUDOCODE["rebalance"], language="text")
@@ -0,0 +1,112 @@
+"""
+Complexity Explorer: measured time and operation counts against n, with fitted growth models
+"""
+
+import os
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from utils.complexity import EXPERIMENTS, MODELS, fit_models, geometric_sizes, run_experiment
+
+class ComplexityExplorer:
+    smallest_size = 64
+
+    def __init__(self):
+        if 'complexity_results' not in st.session_state:
+            st.session_state.complexity_results = {}  # Experiment label -> measurements
+        self.results = st.session_state.complexity_results
+
+    def render(self):
+        st.title("📈 Complexity Explorer")
+        st.markdown("**Empirical Big-O** - Time an operation at doubling sizes and fit growth models to it")
+
+        col1, col2 = st.columns([1, 2])
+
+        with col1:
+            label = self._render_controls()
+
+        with col2:
+            self._render_results(label)
+
+    def _render_controls(self):
+        st.subheader("🎮 Experiment")
+
+        label = st.selectbox("Operation:", list(EXPERIMENTS), key="complexity_operation")
+        largest = EXPERIMENTS[label][1]
+        exponents = list(range(self.smallest_size.bit_length(), largest.bit_length()))
+        top = st.select_slider("Largest n:", [2 ** e for e in exponents], value=2 ** exponents[-1],
+                               key="complexity_largest")
+        cpus = os.cpu_count() or 1
+        workers = int(st.number_input("Worker processes:", min_value=1, max_value=cpus, value=min(4, cpus),
+                                      step=1, key="complexity_workers"))
+        seed = int(st.number_input("Seed:", min_value=0, value=0, step=1, key="complexity_seed"))
+
+        sizes = geometric_sizes(self.smallest_size, top)
+        st.caption(f"{len(sizes)} sizes from {sizes[0]:,} to {sizes[-1]:,}; each is built fresh, "
+                   "counted once and timed as the best of several rounds")
+
+        if st.button("▶️ Run Experiment"):
+            bar = st.progress(0.0, text="Measuring...")
+
+            def report(done, total):
+                bar.progress(done / total, text=f"Measured {done} of {total} sizes")
+
+            self.results[label] = run_experiment(label, sizes, workers, seed, progress=report)
+            st.success(f"Measured {label} at {len(sizes)} sizes")
+
+        if self.results and st.button("🗑️ Clear Results"):
+            self.results.clear()
+            st.rerun()
+        return label
+
+    def _render_results(self, label):
+        st.subheader("📊 Results")
+
+        results = self.results.get(label)
+        if not results:
+            st.info("Run the experiment to measure this operation")
+            return
+
+        ns = np.array([result["n"] for result in results], dtype=float)
+        micros = np.array([result["seconds"] for result in results]) * 1e6
+        fits = fit_models(ns, micros)
+        st.success(f"Time grows like **{fits[0]['model']}**")
+        st.plotly_chart(self._fit_chart(ns, micros, fits, "Time per operation (µs)"), use_container_width=True)
+
+        # Counts are exact, so they show the growth that timer noise can blur
+        costs = sorted({cost for result in results for cost in result["counts"]})
+        if costs:
+            chart = go.Figure()
+            verdicts = []
+            for cost in costs:
+                values = np.array([result["counts"].get(cost, 0) for result in results], dtype=float)
+                chart.add_trace(go.Scatter(x=ns, y=values, mode="lines+markers", name=cost))
+                if values.min() > 0:
+                    verdicts.append(f"{cost}: **{fit_models(ns, values)[0]['model']}**")
+            chart.update_layout(xaxis_type="log", yaxis_type="log", xaxis_title="n",
+                                yaxis_title="Count per operation", height=350, margin=dict(t=30))
+            st.plotly_chart(chart, use_container_width=True)
+            if verdicts:
+                st.write("Counts grow like " + ", ".join(verdicts))
+        else:
+            st.caption("This operation has no counted steps")
+
+        st.markdown("**Model Fits** (relative RMS error, lower is better)")
+        st.dataframe([{"model": fit["model"], "error": round(fit["error"], 3),
+                       "overhead (µs)": round(fit["overhead"], 3), "scale": f"{fit['scale']:.3g}"}
+                      for fit in fits], hide_index=True, use_container_width=True)
+
+    def _fit_chart(self, ns, values, fits, title):
+        """Log-log plot of measurements with the best fits drawn as smooth curves"""
+        chart = go.Figure()
+        chart.add_trace(go.Scatter(x=ns, y=values, mode="markers", name="measured", marker=dict(size=9)))
+
+        curve = np.geomspace(ns[0], ns[-1], 100)
+        for rank, fit in enumerate(fits[:3]):
+            predicted = fit["overhead"] + fit["scale"] * MODELS[fit["model"]](curve)
+            chart.add_trace(go.Scatter(x=curve, y=predicted, mode="lines", name=fit["model"],
+                                       line=dict(width=3 if rank == 0 else 1, dash=None if rank == 0 else "dot")))
+
+        chart.update_layout(xaxis_type="log", yaxis_type="log", xaxis_title="n", yaxis_title=title,
+                            height=400, margin=dict(t=30))
+        return chart
@@ -0,0 +1,385 @@
+"""
+Streamlit widgets shared by the visualizers
+"""
+
+import re
+import time
+import streamlit as st
+from data_structures.stack import Stack
+from data_structures.queue import Queue
+from data_structures.binary_tree import BinaryTree
+from data_structures.hash_table import HashTable
+from data_structures.heap import Heap
+from data_structures.graph import Graph
+from data_structures.base import BatchMixin
+from data_structures.persistent_tree import TreeVersions
+from data_structures.instrumented import disable_counting, enable_counting, is_counting, operation_counts, reset_counts
+from data_structures.snapshot import from_snapshot, to_snapshot
+from data_structures.timeline import Timeline
+from utils.dataset_import import FORMATS, column_roles, data_dir, guess_format, import_dataset, resolve_data_path
+from utils.figures import FrameCache, png_bytes, pooled_subplots
+from utils.sessions import MAX_ELEMENTS
+from utils.tree_layout import changed_nodes
+from utils.workloads import (KEY_DISTRIBUTIONS, GRAPH_MODELS, TRACE_OPERATIONS, anagram_keys, graph_edges,
+                             key_sequence, populate_graph, push_pop_trace)
+
+
+def parse_values(text):
+    """Split comma, whitespace or newline separated input into tokens"""
+    return [token for token in re.split(r"[,\s]+", text) if token]
+
+
+def render_batch_input(structure, key, to_op, hint="Values"):
+    """Text area that applies every entered value as one batch, so the page renders once"""
+    st.markdown("**Batch Operation**")
+    text = st.text_area(f"{hint} (comma, space or newline separated):", key=key)
+
+    if st.button("📦 Apply Batch", key=f"{key}_apply"):
+        tokens = parse_values(text)
+        if not tokens:
+            st.warning("Please enter at least one value")
+            return
+
+        try:
+            ops = [to_op(token) for token in tokens]
+        except ValueError as error:
+            st.error(f"Invalid input: {error}")
+            return
+
+        results, message = structure.apply_batch(ops)
+        if results:
+            st.success(message)
+            time.sleep(0.5)
+            st.rerun()
+        else:
+            st.error(message)
+
+
+def render_import_panel(structure, key):
+    """Upload or point at a dataset and stream it into the structure, replacing its contents"""
+    with st.expander("📂 Import Dataset"):
+        uploaded = st.file_uploader("Upload a CSV, JSON (Lines) or edge-list file:", key=f"{key}_upload",
+                                    type=["csv", "json", "jsonl", "ndjson", "txt", "edges", "edgelist"])
+        path = ""
+        if data_dir() is not None:
+            path = st.text_input("...or a file path in the data directory:", key=f"{key}_path").strip()
+        source = uploaded if uploaded is not None else path
+        name = uploaded.name if uploaded is not None else path
+
+        # Keyed by the guess so that picking another file resets the format
+        guessed = guess_format(name)
+        fmt = st.selectbox("Format:", FORMATS, index=FORMATS.index(guessed), key=f"{key}_format_{guessed}")
+
+        # Columns are matched by name, or taken in order when left blank
+        roles = column_roles(structure)
+        columns = {}
+        for column, role in zip(st.columns(len(roles)), roles):
+            with column:
+                columns[role] = st.text_input(f"{role.title()} column:", key=f"{key}_{role}",
+                                              placeholder="by position").strip()
+
+        if st.button("📥 Import", key=f"{key}_import"):
+            if not source:
+                st.warning("Please upload a file or enter a path")
+                return
+            if isinstance(source, str):
+                try:
+                    source = resolve_data_path(source)
+                except ValueError as error:
+                    st.error(str(error))
+                    return
+
+            bar = st.progress(0.0, text="Importing...")
+
+            def report(rows, total):
+                bar.progress(min(1.0, rows / max(total, 1)), text=f"Imported {rows:,} of ~{total:,} rows")
+
+            rows, message = import_dataset(structure, source, fmt, columns, progress=report)
+            if message.startswith(("Successfully", "Imported")):
+                if message.startswith("Successfully"):
+                    st.success(message)
+                else:
+                    st.warning(message)  # A full stack or queue keeps the rows that fit
+                time.sleep(0.5)
+                st.rerun()
+            else:
+                st.error(message)
+
+
+def _snapshot_mismatch(structure, restored):
+    """Why a restored structure can't replace this one, or None if it can"""
+    if not isinstance(structure, type(restored)):
+        return f"That snapshot holds a {type(restored).__name__}"
+    # The page's type selector would otherwise convert the restored structure straight back
+    for attribute, label in (("doubly", "doubly linked"), ("heap_type", "heap type"), ("directed", "directed")):
+        if getattr(restored, attribute, None) != getattr(structure, attribute, None):
+            return f"That snapshot has {label} = {getattr(restored, attribute)}; switch the type above to match first"
+    return None
+
+
+def render_snapshot_panel(structure, key, state_key):
+    """Download the structure as a compact binary snapshot, or replace it with an uploaded one"""
+    with st.expander("💾 Snapshot"):
+        compress = st.checkbox("Compress with zlib", value=True, key=f"{key}_compress")
+
+        # Encoding walks the whole structure, so it only happens on request and is kept until the next change
+        current = (id(structure), structure.version, compress)
+        if st.button("📦 Create Snapshot", key=f"{key}_create"):
+            try:
+                st.session_state[f"{key}_prepared"] = (current, to_snapshot(structure, compress))
+            except ValueError as error:
+                st.error(str(error))
+        prepared = st.session_state.get(f"{key}_prepared")
+        if prepared is not None and prepared[0] == current:
+            st.download_button(f"⬇️ Download ({len(prepared[1]):,} bytes)", prepared[1], file_name=f"{state_key}.dsvs",
+                               mime="application/octet-stream", key=f"{key}_download")
+
+        uploaded = st.file_uploader("Restore a snapshot:", type=["dsvs"], key=f"{key}_upload")
+        if uploaded is not None and st.button("📤 Restore", key=f"{key}_restore"):
+            others = sum(value._element_count() for value in st.session_state.values()
+                         if isinstance(value, BatchMixin) and value is not structure)
+            try:
+                restored = from_snapshot(uploaded.getvalue(), max_elements=MAX_ELEMENTS - others)
+            except ValueError as error:
+                st.error(f"Cannot restore: {error}")
+                return
+            mismatch = _snapshot_mismatch(structure, restored)
+            if mismatch:
+                st.error(mismatch)
+                return
+
+            if is_counting(structure):
+                enable_counting(restored)
+            st.session_state[state_key] = restored
+            st.success(f"Restored {restored._element_count():,} elements")
+            time.sleep(0.5)
+            st.rerun()
+
+
+def timeline_for(structure, state_key):
+    """The undo/redo log of the structure kept in st.session_state[state_key], logging from now on"""
+    timeline = st.session_state.get(f"{state_key}_timeline")
+    if timeline is None:
+        timeline = st.session_state[f"{state_key}_timeline"] = Timeline(structure)
+    return timeline.attach(structure)
+
+
+def render_timeline(structure, key, state_key):
+    """Undo and redo buttons and a slider to jump to any step of the structure's history"""
+    timeline = timeline_for(structure, state_key)  # Again, in case the page replaced the structure
+    with st.expander("🕰️ Timeline"):
+        if timeline.unavailable:
+            st.caption(f"Undo is unavailable for this structure: {timeline.unavailable}")
+            return
+
+        steps = len(timeline.commands)
+        col1, col2 = st.columns(2)
+        with col1:
+            undo = st.button("↩️ Undo", key=f"{key}_undo", disabled=timeline.position == 0)
+        with col2:
+            redo = st.button("↪️ Redo", key=f"{key}_redo", disabled=timeline.position == steps)
+
+        target = timeline.position - 1 if undo else timeline.position + 1 if redo else None
+        if steps:
+            # Follow the current step whenever an operation or another page moved it, or the
+            # slider's state was dropped while another page was shown
+            shown = (id(timeline), timeline.position, steps)
+            if st.session_state.get(f"{key}_shown") != shown or f"{key}_step" not in st.session_state:
+                st.session_state[f"{key}_shown"] = shown
+                st.session_state[f"{key}_step"] = timeline.position
+            step = st.slider("Step:", 0, steps, key=f"{key}_step")
+            st.caption(f"Step {step} of {steps}: {timeline.label(step)}")
+            if target is None and step != timeline.position:
+                target = step
+        else:
+            st.caption("Operations you perform appear here")
+
+        if target is not None and timeline.seek(structure, target):
+            st.rerun()
+
+
+def tree_frame(key, view, settings, draw, figsize, nrows=1, ncols=1):
+    """PNG of a tree view; draw(axes, changed) runs only for a view and highlight not already cached"""
+    # Frames are kept as PNG bytes keyed by the root's subtree hash and the view settings, so
+    # reruns that didn't touch the tree, and undoing back to a recent state, skip drawing. After
+    # a change, the subtree hashes lead straight to the changed nodes for draw to highlight
+    frames = st.session_state.get(f"{key}_frames")
+    if frames is None:
+        frames = st.session_state[f"{key}_frames"] = FrameCache()
+    signature = (view['hash'][0] if view['data'] else None, settings)
+    if frames.last is not None and frames.last[0][0] == signature:
+        frame = frames.last[0]  # Shown again with the highlight it had
+    else:
+        frame = (signature, frozenset(changed_nodes(frames.last[1] if frames.last else None, view)))
+        frames.last = (frame, {name: list(view[name]) for name in ('data', 'left', 'right', 'hash')})
+
+    png = frames.get(frame)
+    if png is None:
+        with pooled_subplots(figsize, nrows, ncols) as (fig, axes):
+            draw(axes, frame[1])
+            png = frames.put(frame, png_bytes(fig))
+    return png
+
+
+def _workload_ops(structure, key, seed):
+    """Widgets for a key or push/pop workload; returns the batch to apply when requested"""
+    trace = next((TRACE_OPERATIONS[name] for name, kind in (("stack", Stack), ("queue", Queue), ("heap", Heap))
+                  if isinstance(structure, kind)), None)
+    if trace is not None:
+        length = st.slider("Operations:", 1, 500, 50, key=f"{key}_length")
+        push_ratio = st.slider("Share of additions:", 0.1, 0.9, 0.6, key=f"{key}_ratio")
+        if st.button("🎲 Generate", key=f"{key}_generate"):
+            return push_pop_trace(length, *trace, push_ratio=push_ratio, seed=seed)
+        return None
+
+    distributions = KEY_DISTRIBUTIONS + (("anagram",) if isinstance(structure, HashTable) else ())
+    distribution = st.selectbox("Keys:", distributions, key=f"{key}_distribution")
+    # Sorted keys make a BST a linked list, and insertion recurses once per level
+    count = st.slider("Keys to insert:", 1, 300, 30, key=f"{key}_count")
+    if not st.button("🎲 Generate", key=f"{key}_generate"):
+        return None
+
+    if distribution == "anagram":
+        keys = anagram_keys(count, seed)
+    else:
+        keys = key_sequence(count, distribution, seed)
+    if isinstance(structure, BinaryTree):
+        return [("insert", k) for k in keys]
+    if isinstance(structure, HashTable):
+        return [("insert", str(k), i) for i, k in enumerate(keys)]
+    return [("insert_at_end", str(k)) for k in keys]
+
+
+def render_workload_panel(structure, key):
+    """Clear the structure and fill it from a seeded synthetic workload"""
+    with st.expander("🎲 Generate Workload"):
+        seed = int(st.number_input("Seed:", min_value=0, value=0, step=1, key=f"{key}_seed"))
+
+        if isinstance(structure, Graph):
+            model = st.selectbox("Model:", list(GRAPH_MODELS), format_func=GRAPH_MODELS.get, key=f"{key}_model")
+            vertices = st.slider("Vertices:", 2, 100, 20, key=f"{key}_vertices")
+            degree = st.slider("Average degree:", 1, 10, 3, key=f"{key}_degree")
+            if st.button("🎲 Generate", key=f"{key}_generate"):
+                edges = graph_edges(model, vertices, seed, degree)
+                added, message = populate_graph(structure, vertices, edges, label=str)
+                st.success(message)
+                time.sleep(0.5)
+                st.rerun()
+            return
+
+        ops = _workload_ops(structure, key, seed)
+        if ops is not None:
+            structure.clear()
+            results, message = structure.apply_batch(ops)
+            st.success(message)
+            time.sleep(0.5)
+            st.rerun()
+
+
+def render_operation_counts(structure, key):
+    """Toggle operation counting and show what each kind of operation has cost so far"""
+    with st.expander("🔢 Operation Counts"):
+        counting = st.toggle("Count comparisons, swaps, hops and probes", value=is_counting(structure),
+                             key=f"{key}_enabled")
+        if counting != is_counting(structure):
+            (enable_counting if counting else disable_counting)(structure)
+        if not counting:
+            st.caption("Counting is off, so operations run without any instrumentation")
+            return
+
+        totals = operation_counts(structure)
+        if not totals:
+            st.info("Perform an operation to see its cost")
+            return
+
+        name, counts = structure.last_operation
+        costs = ", ".join(f"{value} {cost}" for cost, value in counts.items()) or "no counted steps"
+        st.write(f"Last operation: **{name}** ({costs})")
+
+        columns = sorted({cost for counts in totals.values() for cost in counts} - {"calls"})
+        st.dataframe([{"operation": name, "calls": counts["calls"],
+                       **{cost: counts.get(cost, 0) for cost in columns},
+                       **{f"{cost}/call": round(counts.get(cost, 0) / counts["calls"], 1) for cost in columns}}
+                      for name, counts in totals.items()], hide_index=True, use_container_width=True)
+
+        if st.button("🔄 Reset Counts", key=f"{key}_reset"):
+            reset_counts(structure)
+            st.rerun()
+
+
+def render_profiling_toggle():
+    """Sidebar switches for timing the rerun; returns (timers on, cProfile on)"""
+    st.sidebar.markdown("### ⏱️ Profiling")
+    timing = st.sidebar.toggle("Time each rerun", key="profile_reruns")
+    use_cprofile = timing and st.sidebar.checkbox("Run under cProfile", key="profile_cprofile")
+    return timing, use_cprofile
+
+
+def _breakdown(totals, total):
+    return [{"part": name, "ms": round(seconds * 1000, 1), "%": round(100 * seconds / total, 1) if total else 0.0}
+            for name, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True)]
+
+
+def render_rerun_profile(container):
+    """Show the time breakdown of a recent profiled rerun, with its cProfile stats"""
+    reports = st.session_state.get("rerun_profiles", [])
+    if not reports:
+        return
+
+    with container:
+        labels = [f"{report['page']}: {report['total'] * 1000:.0f} ms"
+                  + (" (ended by rerun)" if report["interrupted"] else "") for report in reports]
+        index = st.selectbox("Rerun (newest first):", range(len(reports)), format_func=labels.__getitem__,
+                             key="profile_report")
+        report = reports[index]
+
+        st.markdown("**By section**")
+        st.dataframe(_breakdown(report["sections"], report["total"]), hide_index=True, use_container_width=True)
+        st.markdown("**By kind of work**")
+        st.dataframe(_breakdown(report["kinds"], report["total"]), hide_index=True, use_container_width=True)
+        st.caption("PNG encode includes Matplotlib drawing the figure with Agg; figure build is the "
+                   "rest of the visualization section")
+
+        if report["pstats"] is not None:
+            st.download_button("💾 Download .pstats", report["pstats"], file_name=f"rerun_{index}.pstats",
+                               mime="application/octet-stream", key="profile_download")
+            st.dataframe(report["top"], hide_index=True, use_container_width=True)
+
+
+def _format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def render_memory_panel():
+    """Sidebar table of the deep size of every structure in this session"""
+    st.sidebar.markdown("### 🧮 Memory")
+    if not st.sidebar.toggle("Show memory use", key="show_memory"):
+        return
+
+    rows = []
+    for key, value in st.session_state.items():
+        if not isinstance(value, (BatchMixin, TreeVersions, FrameCache)):
+            continue
+        report = value.memory_report()
+        rows.append({
+            "structure": key,
+            "elements": report["elements"],
+            "total": _format_bytes(report["total"]),
+            "history": _format_bytes(report["parts"].get("history", 0)),
+            "bytes/element": round(report["bytes_per_element"], 1) if report["bytes_per_element"] else None,
+            "_bytes": report["total"],
+        })
+    if not rows:
+        st.sidebar.caption("No structures in this session yet")
+        return
+
+    session_total = sum(row.pop("_bytes") for row in rows)
+    st.sidebar.dataframe(rows, hide_index=True, use_container_width=True)
+    st.sidebar.metric("Session total", _format_bytes(session_total))
+    st.sidebar.caption("Deep size: nodes, buckets, edge tuples, stored values and operation history; "
+                       "tree versions list the nodes they can hold, and frame caches their PNG frames, as elements")
+
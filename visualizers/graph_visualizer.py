@@ -3,9 +3,11 @@ Graph Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from data_structures.graph import Graph
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for)
+from utils.figures import pooled_subplots
 import time
 import math
 import random
@@ -15,6 +17,7 @@ class GraphVisualizer:
         if 'graph' not in st.session_state:
             st.session_state.graph = Graph()
         self.graph = st.session_state.graph
+        timeline_for(self.graph, "graph")  # Before any operation of this rerun runs
     
     def render(self):
         st.title("🕸️ Graph Visualizer")
@@ -36,11 +39,10 @@ class GraphVisualizer:
             self.graph = Graph(directed)
             st.session_state.graph = self.graph
             
-            # Re-add vertices and edges
-            for vertex in old_vertices:
-                self.graph.add_vertex(vertex)
-            for v1, v2, weight in old_edges:
-                self.graph.add_edge(v1, v2, weight)
+            # Re-add vertices and edges in one batch
+            if old_vertices:
+                self.graph.apply_batch([("add_vertex", vertex) for vertex in old_vertices] +
+                                       [("add_edge", v1, v2, weight) for v1, v2, weight in old_edges])
         
         # Create two columns for controls and visualization
         col1, col2 = st.columns([1, 2])
@@ -80,6 +82,14 @@ class GraphVisualizer:
                 self.graph.clear()
                 st.rerun()
         
+        render_batch_input(self.graph, "graph_batch", self._parse_batch_token,
+                           "Vertices (A) or edges (A-B, A-B:weight)")
+        render_import_panel(self.graph, "import")
+        render_snapshot_panel(self.graph, "snapshot", "graph")
+        render_timeline(self.graph, "timeline", "graph")
+        render_workload_panel(self.graph, "workload")
+        render_operation_counts(self.graph, "op_counts")
+        
         # Add edge
         st.markdown("**Add Edge**")
         vertices_list = list(self.graph.vertices)
@@ -168,6 +178,17 @@ class GraphVisualizer:
                 else:
                     st.warning(message)
     
+    def _parse_batch_token(self, token):
+        """Turn A into an add-vertex and A-B or A-B:weight into an add-edge operation"""
+        edge, _, weight = token.partition(":")
+        if "-" not in edge:
+            return ("add_vertex", token)
+        
+        vertex1, _, vertex2 = edge.partition("-")
+        if not vertex1 or not vertex2:
+            raise ValueError(f"expected an edge like A-B, got {token}")
+        return ("add_edge", vertex1, vertex2, int(weight) if weight else 1)
+    
     def _render_visualization(self):
         st.subheader("📊 Graph Visualization")
         
@@ -181,29 +202,27 @@ class GraphVisualizer:
         edges = graph_data['edges']
         
         # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Generate positions for vertices (circular layout)
-        positions = self._generate_positions(vertices)
-        
-        # Draw edges first (so they appear behind vertices)
-        self._draw_edges(ax, edges, positions, graph_data['directed'])
-        
-        # Draw vertices
-        self._draw_vertices(ax, vertices, positions)
-        
-        # Set axis properties
-        ax.set_xlim(-1.5, 1.5)
-        ax.set_ylim(-1.5, 1.5)
-        ax.set_aspect('equal')
-        ax.axis('off')
-        
-        graph_type = "Directed" if graph_data['directed'] else "Undirected"
-        ax.set_title(f'{graph_type} Graph Visualization', fontsize=16, fontweight='bold')
-        
-        # Display the plot
-        st.pyplot(fig)
-        plt.close()
+        with pooled_subplots((12, 8)) as (fig, ax):
+            # Generate positions for vertices (circular layout)
+            positions = self._generate_positions(vertices)
+            
+            # Draw edges first (so they appear behind vertices)
+            self._draw_edges(ax, edges, positions, graph_data['directed'])
+            
+            # Draw vertices
+            self._draw_vertices(ax, vertices, positions)
+            
+            # Set axis properties
+            ax.set_xlim(-1.5, 1.5)
+            ax.set_ylim(-1.5, 1.5)
+            ax.set_aspect('equal')
+            ax.axis('off')
+            
+            graph_type = "Directed" if graph_data['directed'] else "Undirected"
+            ax.set_title(f'{graph_type} Graph Visualization', fontsize=16, fontweight='bold')
+            
+            # Display the plot
+            st.pyplot(fig)
     
     def _generate_positions(self, vertices):
         """Generate positions for vertices in a circular layout"""
@@ -299,9 +318,13 @@ class GraphVisualizer:
         with col2:
             st.markdown("**Graph Information**")
             st.write(f"**Type:** {'Directed' if self.graph.directed else 'Undirected'}")
-            st.write(f"**Vertices:** {self.graph.vertex_count()}")
-            st.write(f"**Edges:** {self.graph.edge_count()}")
+            stats = self.graph.stats()
+            st.write(f"**Vertices:** {stats['vertices']}")
+            st.write(f"**Edges:** {stats['edges']}")
             st.write(f"**Empty:** {self.graph.is_empty()}")
+            if stats['degree_histogram']:
+                degrees = ", ".join(f"{degree}: {count}" for degree, count in sorted(stats['degree_histogram'].items()))
+                st.write(f"**Degree Histogram:** {degrees}")
             
             # Show adjacency list
             st.markdown("**Adjacency List:**")
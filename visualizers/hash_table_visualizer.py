@@ -3,16 +3,22 @@ Hash Table Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
+import numpy as np
 from data_structures.hash_table import HashTable
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for)
+from utils.figures import pooled_subplots
 import time
 
 class HashTableVisualizer:
+    heatmap_threshold = 64  # Above this many buckets the table is drawn as a heatmap
+    
     def __init__(self):
         if 'hash_table' not in st.session_state:
             st.session_state.hash_table = HashTable()
         self.hash_table = st.session_state.hash_table
+        timeline_for(self.hash_table, "hash_table")  # Before any operation of this rerun runs
     
     def render(self):
         st.title("🗂️ Hash Table Visualizer")
@@ -34,15 +40,11 @@ class HashTableVisualizer:
         st.subheader("🎮 Controls")
         
         # Hash table size configuration
-        new_size = st.slider("Hash Table Size", 5, 20, self.hash_table.size)
+        new_size = int(st.number_input("Hash Table Size", min_value=5, max_value=max(10000, self.hash_table.size),
+                                       value=self.hash_table.size, step=1))
         if new_size != self.hash_table.size:
-            # Create new hash table with new size
-            old_items = self.hash_table.get_all_items()
-            self.hash_table = HashTable(new_size)
-            st.session_state.hash_table = self.hash_table
-            # Re-insert all items
-            for key, value in old_items:
-                self.hash_table.insert(key, value)
+            # Rehash every item into the new number of buckets
+            self.hash_table.resize(new_size)
         
         # Insert operation
         st.markdown("**Insert/Update Operation**")
@@ -71,6 +73,13 @@ class HashTableVisualizer:
                 self.hash_table.clear()
                 st.rerun()
         
+        render_batch_input(self.hash_table, "insert_batch", self._parse_pair, "key:value pairs to insert")
+        render_import_panel(self.hash_table, "import")
+        render_snapshot_panel(self.hash_table, "snapshot", "hash_table")
+        render_timeline(self.hash_table, "timeline", "hash_table")
+        render_workload_panel(self.hash_table, "workload")
+        render_operation_counts(self.hash_table, "op_counts")
+        
         # Get operation
         st.markdown("**Get Operation**")
         get_key = st.text_input("Key to get:", key="get_input")
@@ -112,12 +121,34 @@ class HashTableVisualizer:
             else:
                 st.warning("Please enter a key to check")
     
+    def _parse_pair(self, token):
+        """Turn a key:value token into an insert operation"""
+        key, separator, value = token.partition(":")
+        if not separator or not key or not value:
+            raise ValueError(f"expected key:value, got {token}")
+        return ("insert", key, value)
+    
     def _render_visualization(self):
         st.subheader("📊 Hash Table Visualization")
         
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(12, 8))
+        # Large tables switch to an occupancy heatmap
+        if self.hash_table.size > self.heatmap_threshold:
+            st.caption(f"{self.hash_table.size} buckets: showing chain lengths as a heatmap "
+                       f"(bucket view up to {self.heatmap_threshold} buckets)")
+            with pooled_subplots((12, 6), 1, 2, gridspec_kw={'width_ratios': [3, 2]}) as (fig, (ax_map, ax_hist)):
+                self._draw_heatmap(fig, ax_map, ax_hist)
+                st.pyplot(fig)
+            return
         
+        # Create matplotlib figure
+        with pooled_subplots((12, 8)) as (fig, ax):
+            self._draw_buckets(ax)
+            
+            # Display the plot
+            st.pyplot(fig)
+    
+    def _draw_buckets(self, ax):
+        """Draw every bucket with its chain of key-value pairs and a legend"""
         # Visualization parameters
         bucket_width = 8
         bucket_height = 0.8
@@ -205,10 +236,35 @@ class HashTableVisualizer:
         ax.add_patch(collision_rect)
         ax.text(start_x + 3.7, legend_y + 0.15, 'Collision (Chaining)', 
                va='center', fontsize=10)
+    
+    def _draw_heatmap(self, fig, ax_map, ax_hist):
+        """Draw chain lengths as one image plus a histogram of chain lengths"""
+        lengths = np.asarray(self.hash_table.get_chain_lengths())
+        
+        # Wrap buckets row by row into a near-square grid; padding cells stay blank
+        width = int(np.ceil(np.sqrt(lengths.size)))
+        rows = -(-lengths.size // width)
+        grid = np.full(rows * width, np.nan)
+        grid[:lengths.size] = lengths
+        
+        image = ax_map.imshow(grid.reshape(rows, width), cmap='YlOrRd', interpolation='nearest',
+                              vmin=0, vmax=max(1, lengths.max()))
+        fig.colorbar(image, ax=ax_map, fraction=0.046, pad=0.04, label='Chain length')
+        ax_map.set_title(f'Bucket Occupancy ({width} buckets per row)', fontsize=14, fontweight='bold')
+        ax_map.set_xlabel('Bucket index mod width')
+        ax_map.set_ylabel('Bucket index // width')
         
-        # Display the plot
-        st.pyplot(fig)
-        plt.close()
+        # How many buckets have each chain length, maintained by the table itself
+        histogram = np.asarray(self.hash_table.chain_histogram[:self.hash_table.max_chain + 1])
+        bars = ax_hist.bar(np.arange(histogram.size), histogram, color='#4ECDC4', edgecolor='black')
+        for length in range(2, histogram.size):
+            bars[length].set_facecolor('#FF6B6B')  # Collisions (Chaining)
+        ax_hist.set_title('Chain Length Histogram', fontsize=14, fontweight='bold')
+        ax_hist.set_xlabel('Chain length')
+        ax_hist.set_ylabel('Buckets')
+        if histogram.size <= 20:
+            ax_hist.set_xticks(np.arange(histogram.size))
+        fig.tight_layout()
     
     def _render_history_and_stats(self):
         st.subheader("📝 Operation History & Statistics")
@@ -230,18 +286,22 @@ class HashTableVisualizer:
         
         with col2:
             st.markdown("**Statistics**")
-            st.write(f"**Size:** {self.hash_table.size}")
-            st.write(f"**Items:** {self.hash_table.count}")
-            st.write(f"**Load Factor:** {self.hash_table.get_load_factor():.2f}")
-            st.write(f"**Collisions:** {self.hash_table.get_collision_count()}")
+            stats = self.hash_table.stats()
+            st.write(f"**Size:** {stats['size']}")
+            st.write(f"**Items:** {stats['count']}")
+            st.write(f"**Load Factor:** {stats['load_factor']:.2f}")
+            st.write(f"**Collisions:** {stats['collisions']}")
+            st.write(f"**Longest Chain:** {stats['max_chain']}")
             st.write(f"**Empty:** {self.hash_table.is_empty()}")
             
             # Show all items
             st.markdown("**All Items:**")
             all_items = self.hash_table.get_all_items()
             if all_items:
-                for key, value in all_items:
+                for key, value in all_items[:50]:
                     st.text(f"  {key}: {value}")
+                if len(all_items) > 50:
+                    st.text(f"  ... and {len(all_items) - 50} more")
             else:
                 st.text("  No items")
     
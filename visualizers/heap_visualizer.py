@@ -3,17 +3,24 @@ Heap Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from data_structures.heap import Heap
+from utils.tree_layout import level_of_detail, points_per_unit
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for,
+                                     tree_frame)
+from utils.drawing import MAX_LABELS, draw_arrows, draw_boxes, draw_labels, label_stride
 import time
-import math
 
 class HeapVisualizer:
+    array_window = 16  # Array entries drawn at once
+    text_limit = 50  # Array entries and parents listed as text
+    
     def __init__(self):
         if 'heap' not in st.session_state:
             st.session_state.heap = Heap()
         self.heap = st.session_state.heap
+        timeline_for(self.heap, "heap")  # Before any operation of this rerun runs
     
     def render(self):
         st.title("🏔️ Heap Visualizer")
@@ -71,6 +78,14 @@ class HeapVisualizer:
                 self.heap.clear()
                 st.rerun()
         
+        render_batch_input(self.heap, "insert_batch", lambda token: ("insert", int(token)),
+                           "Integers to insert")
+        render_import_panel(self.heap, "import")
+        render_snapshot_panel(self.heap, "snapshot", "heap")
+        render_timeline(self.heap, "timeline", "heap")
+        render_workload_panel(self.heap, "workload")
+        render_operation_counts(self.heap, "op_counts")
+        
         # Extract operation
         st.markdown("**Extract Operation**")
         if st.button("⬇️ Extract Root", disabled=self.heap.is_empty()):
@@ -137,9 +152,13 @@ class HeapVisualizer:
         
         # Heap information
         st.markdown("**Heap Info**")
+        stats = self.heap.stats()
         st.write(f"Type: {self.heap.heap_type.title()} Heap")
-        st.write(f"Size: {self.heap.size()}")
+        st.write(f"Size: {stats['size']}")
         st.write(f"Empty: {self.heap.is_empty()}")
+        if stats['size']:
+            st.write(f"Height: {stats['height']}")
+            st.write(f"Min / Max: {stats['min']} / {stats['max']}")
     
     def _render_visualization(self):
         st.subheader("📊 Heap Visualization")
@@ -148,89 +167,126 @@ class HeapVisualizer:
             st.info("Heap is empty. Add some elements to see the visualization!")
             return
         
-        # Get heap structure
-        tree_structure = self.heap.get_tree_structure()
-        heap_array = self.heap.get_heap_array()
-        
-        # Create matplotlib figure
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
-        
-        # Tree visualization
-        self._draw_heap_tree(ax1, tree_structure, heap_array)
-        
-        # Array visualization
-        self._draw_heap_array(ax2, heap_array)
+        # Flat arrays are cached on the heap and only rebuilt after a mutation
+        flat = self.heap.get_flat_structure()
+        
+        # Level of detail: beyond the node budget, deep subtrees collapse into summaries
+        budget = st.slider("Node budget", 15, 511, 31, key="heap_node_budget")
+        if 'heap_expanded' not in st.session_state:
+            st.session_state.heap_expanded = set()
+        expanded = st.session_state.heap_expanded
+        view = level_of_detail(flat, budget, expanded)
+        if view is not flat:
+            self._render_expand_controls(view, expanded)
+        
+        # The array view shows a scrollable window of array_window entries
+        offset = 0
+        if self.heap.size() > self.array_window:
+            offset = st.slider("Array scroll position", 0, self.heap.size() - self.array_window, 0,
+                               key="heap_array_offset")
+        
+        def draw(axes, changed):
+            ax1, ax2 = axes
+            
+            # Tree visualization, with the nodes changed since the last frame highlighted
+            self._draw_heap_tree(ax1, view, (12, 5), changed)
+            
+            # Array visualization
+            self._draw_heap_array(ax2, flat, offset)
         
         # Display the plot
-        st.pyplot(fig)
-        plt.close()
+        settings = (budget, frozenset(expanded), offset, self.heap.heap_type)
+        st.image(tree_frame("heap", view, settings, draw, (12, 10), 2, 1))
     
-    def _draw_heap_tree(self, ax, tree_structure, heap_array):
-        """Draw heap as a tree"""
-        if not tree_structure:
+    def _node_color(self, index, level):
+        """Color heap nodes by their level in the tree"""
+        if index == 0:
+            return '#FF6B6B'  # Root - red
+        elif level == 1:
+            return '#4ECDC4'  # Level 1 - teal
+        else:
+            return '#95E1D3'  # Other levels - light teal
+    
+    def _render_expand_controls(self, view, expanded):
+        """Let the user expand collapsed subtrees of a large heap"""
+        collapsed = [view['source'][i] for i, summary in enumerate(view['summary']) if summary is not None]
+        st.caption(f"Showing {len(view['data'])} of {self.heap.size()} nodes; "
+                   f"{len(collapsed)} subtrees are collapsed")
+        
+        col_pick, col_expand, col_reset = st.columns([2, 1, 1])
+        with col_pick:
+            target = st.selectbox("Collapsed subtree root:", collapsed, key="heap_expand_target",
+                                  format_func=lambda index: f"[{index}] {self.heap.heap[index]}")
+        with col_expand:
+            if st.button("➕ Expand", disabled=not collapsed):
+                expanded.add(target)
+                st.rerun()
+        with col_reset:
+            if st.button("➖ Collapse All", disabled=not expanded):
+                expanded.clear()
+                st.rerun()
+    
+    def _draw_heap_tree(self, ax, flat, figsize, changed=()):
+        """Draw heap as a tree from the flat array export, highlighting the changed nodes"""
+        if not flat['data']:
             return
         
-        # Calculate tree dimensions
-        height = math.floor(math.log2(len(heap_array))) + 1
-        width = 2 ** (height - 1)
+        x_spacing = 0.5
+        y_spacing = 1.5
+        radius = 0.4
         
-        # Draw the tree
-        self._draw_heap_node_recursive(ax, tree_structure, 6, 8, 3, 0, height)
+        xs = [x * x_spacing for x in flat['x']]
+        ys = [y * y_spacing for y in flat['y']]
+        sources = flat.get('source')
+        summaries = flat.get('summary')
         
-        # Set axis properties for tree
-        ax.set_xlim(0, 12)
-        ax.set_ylim(0, 9)
+        # Shrink labels so they stay inside their nodes as the tree widens
+        fontsize = max(4, min(12, 0.3 * points_per_unit(xs, ys, figsize)))
+        
+        for i, value in enumerate(flat['data']):
+            index = sources[i] if sources else i
+            
+            # Draw edges to children
+            for child in (flat['left'][i], flat['right'][i]):
+                if child != -1:
+                    ax.plot([xs[i], xs[child]], [ys[i] - radius, ys[child] + radius], 'k-', linewidth=2)
+            
+            # Draw the node
+            node_color = '#FF9F1C' if i in changed else self._node_color(index, flat['depth'][i])
+            circle = patches.Circle((xs[i], ys[i]), radius, linewidth=2, edgecolor='black', facecolor=node_color)
+            ax.add_patch(circle)
+            
+            # Add the data text
+            ax.text(xs[i], ys[i], str(value), ha='center', va='center',
+                    fontsize=fontsize, fontweight='bold', color='white')
+            
+            # Add index label
+            ax.text(xs[i], ys[i] - 0.7, f'[{index}]', ha='center', va='center',
+                    fontsize=fontsize * 2 / 3, color='gray')
+            
+            # Collapsed subtree: one glyph with its size, value range and height
+            summary = summaries[i] if summaries else None
+            if summary:
+                count, low, high, height = summary
+                glyph_y = ys[i] - 1.15
+                ax.plot([xs[i], xs[i]], [ys[i] - 0.85, glyph_y + 0.2], 'k:', linewidth=1)
+                glyph = patches.RegularPolygon((xs[i], glyph_y), 3, radius=0.35,
+                                               edgecolor='black', facecolor='#FFE0B2')
+                ax.add_patch(glyph)
+                ax.text(xs[i], glyph_y - 0.3, f"n={count}\n{low}..{high}\nh={height}",
+                        ha='center', va='top', fontsize=max(4, fontsize * 0.6))
+        
+        # Set axis properties for tree (plus room for summary glyphs)
+        bottom_margin = 2 if summaries else 1
+        ax.set_xlim(min(xs) - 1, max(xs) + 1)
+        ax.set_ylim(min(ys) - bottom_margin, max(ys) + 1)
         ax.set_aspect('equal')
         ax.axis('off')
         ax.set_title(f'{self.heap.heap_type.title()} Heap - Tree View', fontsize=14, fontweight='bold')
     
-    def _draw_heap_node_recursive(self, ax, node, x, y, x_offset, level, max_height):
-        """Recursively draw heap nodes"""
-        if node is None:
-            return
-        
-        # Determine node color based on heap type and position
-        if node['index'] == 0:
-            node_color = '#FF6B6B'  # Root - red
-        elif level == 1:
-            node_color = '#4ECDC4'  # Level 1 - teal
-        else:
-            node_color = '#95E1D3'  # Other levels - light teal
-        
-        # Draw the node
-        circle = patches.Circle((x, y), 0.4, linewidth=2, edgecolor='black', facecolor=node_color)
-        ax.add_patch(circle)
-        
-        # Add the data text
-        ax.text(x, y, str(node['data']), ha='center', va='center', 
-                fontsize=12, fontweight='bold', color='white')
-        
-        # Add index label
-        ax.text(x, y - 0.7, f'[{node["index"]}]', ha='center', va='center', 
-                fontsize=8, color='gray')
-        
-        # Calculate positions for children
-        child_x_offset = x_offset / 1.8 if x_offset > 0.8 else 0.8
-        child_y = y - 1.5
-        
-        # Draw left child
-        if node.get('left'):
-            left_x = x - child_x_offset
-            # Draw edge
-            ax.plot([x, left_x], [y - 0.4, child_y + 0.4], 'k-', linewidth=2)
-            # Recursively draw left subtree
-            self._draw_heap_node_recursive(ax, node['left'], left_x, child_y, child_x_offset, level + 1, max_height)
-        
-        # Draw right child
-        if node.get('right'):
-            right_x = x + child_x_offset
-            # Draw edge
-            ax.plot([x, right_x], [y - 0.4, child_y + 0.4], 'k-', linewidth=2)
-            # Recursively draw right subtree
-            self._draw_heap_node_recursive(ax, node['right'], right_x, child_y, child_x_offset, level + 1, max_height)
-    
-    def _draw_heap_array(self, ax, heap_array):
-        """Draw heap as an array"""
+    def _draw_heap_array(self, ax, flat, offset=0):
+        """Draw a window of the heap array starting at index offset"""
+        heap_array = flat['data']
         if not heap_array:
             return
         
@@ -240,55 +296,29 @@ class HeapVisualizer:
         start_x = 1
         start_y = 1
         
-        # Draw array boxes
-        for i, value in enumerate(heap_array):
-            x_pos = start_x + i * box_width
-            
-            # Determine box color based on level in tree
-            level = math.floor(math.log2(i + 1))
-            if i == 0:
-                box_color = '#FF6B6B'  # Root
-            elif level == 1:
-                box_color = '#4ECDC4'  # Level 1
-            else:
-                box_color = '#95E1D3'  # Other levels
-            
-            # Draw rectangle
-            rect = patches.Rectangle(
-                (x_pos, start_y), box_width, box_height,
-                linewidth=2, edgecolor='black', facecolor=box_color
-            )
-            ax.add_patch(rect)
-            
-            # Add value text
-            ax.text(
-                x_pos + box_width/2, start_y + box_height/2,
-                str(value), ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white'
-            )
-            
-            # Add index label
-            ax.text(
-                x_pos + box_width/2, start_y - 0.2,
-                f'[{i}]', ha='center', va='center',
-                fontsize=10, color='gray'
-            )
-            
-            # Add parent-child relationship arrows for non-root elements
-            if i > 0:
-                parent_index = (i - 1) // 2
-                parent_x = start_x + parent_index * box_width + box_width/2
-                child_x = x_pos + box_width/2
-                
-                # Draw arrow from parent to child
-                ax.annotate(
-                    '', xy=(child_x, start_y + box_height + 0.1),
-                    xytext=(parent_x, start_y + box_height + 0.3),
-                    arrowprops=dict(arrowstyle='->', color='blue', lw=1, alpha=0.6)
-                )
+        # Boxes colored by level in tree
+        window = range(offset, min(offset + self.array_window, len(heap_array)))
+        n = len(window)
+        xs = [start_x + (i - offset) * box_width for i in window]
+        colors = [self._node_color(i, flat['depth'][i]) for i in window]
+        draw_boxes(ax, xs, [start_y] * n, box_width, box_height, colors)
+        
+        # Labels only while they stay readable
+        centers = [x + box_width/2 for x in xs]
+        if n <= MAX_LABELS:
+            draw_labels(ax, centers, [start_y + box_height/2] * n, [str(heap_array[i]) for i in window],
+                        ha='center', va='center', fontsize=12, fontweight='bold', color='white')
+        draw_labels(ax, centers, [start_y - 0.2] * n, [f'[{i}]' for i in window],
+                    stride=label_stride(n), ha='center', va='center', fontsize=10, color='gray')
+        
+        # Parent-child relationship arrows for non-root elements whose parent is in the window
+        linked = [i for i in window if i > 0 and (i - 1) // 2 >= offset]
+        parents = [(centers[(i - 1) // 2 - offset], start_y + box_height + 0.3) for i in linked]
+        children = [(centers[i - offset], start_y + box_height + 0.1) for i in linked]
+        draw_arrows(ax, parents, children, color='blue', linewidth=1, alpha=0.6)
         
         # Set axis properties for array
-        ax.set_xlim(0, start_x + len(heap_array) * box_width + 1)
+        ax.set_xlim(0, start_x + min(len(heap_array), self.array_window) * box_width + 1)
         ax.set_ylim(0, 3)
         ax.set_aspect('equal')
         ax.axis('off')
@@ -319,24 +349,31 @@ class HeapVisualizer:
         
         with col2:
             st.markdown("**Current Array**")
-            heap_array = self.heap.get_heap_array()
+            heap_array = self.heap.heap  # Only read, so not copied
+            n = len(heap_array)
             if heap_array:
-                st.text(f"Array: {heap_array}")
+                # List text_limit entries from where the array view is scrolled to, not the whole heap
+                offset = min(st.session_state.get("heap_array_offset", 0), max(n - self.text_limit, 0))
+                end = min(offset + self.text_limit, n)
+                shown = f"[{offset}:{end}]" if n > self.text_limit else ""
+                st.text(f"Array{shown}: {heap_array[offset:end]}")
+                if n > self.text_limit:
+                    st.text(f"  ... and {n - (end - offset)} more")
                 
                 # Show parent-child relationships
                 st.markdown("**Parent-Child Relationships:**")
-                for i in range(len(heap_array)):
+                parents = range(offset, min(end, n // 2))  # Positions past n // 2 are leaves
+                for i in parents:
                     left_child = 2 * i + 1
                     right_child = 2 * i + 2
                     
-                    children = []
-                    if left_child < len(heap_array):
-                        children.append(f"L:{heap_array[left_child]}")
-                    if right_child < len(heap_array):
+                    children = [f"L:{heap_array[left_child]}"]
+                    if right_child < n:
                         children.append(f"R:{heap_array[right_child]}")
                     
-                    if children:
-                        st.text(f"  [{i}]{heap_array[i]} → {', '.join(children)}")
+                    st.text(f"  [{i}]{heap_array[i]} → {', '.join(children)}")
+                if n // 2 > len(parents):
+                    st.text(f"  ... and {n // 2 - len(parents)} more")
             else:
                 st.text("Heap is empty")
     
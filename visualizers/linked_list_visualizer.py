@@ -3,13 +3,17 @@ Linked List Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from data_structures.linked_list import LinkedList
 from utils.pseudocode import LINKED_LIST_PSEUDOCODE
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for)
+from utils.drawing import MAX_LABELS, draw_arrows, draw_boxes, draw_labels, label_stride
+from utils.figures import pooled_subplots
 import time
 
 class LinkedListVisualizer:
+    window_size = 8  # Nodes drawn at once
+    
     def __init__(self):
         if 'linked_list' not in st.session_state:
             st.session_state.linked_list = LinkedList()
@@ -23,6 +27,7 @@ class LinkedListVisualizer:
             self.linked_list = st.session_state.linked_list
         else:
             self.linked_list = st.session_state.doubly_linked_list
+        timeline_for(self.linked_list, "doubly_linked_list" if self.linked_list.doubly else "linked_list")
     
     def render(self):
         st.title("🔗 Linked List Visualizer")
@@ -85,6 +90,14 @@ class LinkedListVisualizer:
                 else:
                     st.warning("Please enter a value")
         
+        render_batch_input(self.linked_list, "insert_batch", lambda token: ("insert_at_end", token),
+                           "Values to insert at end")
+        render_import_panel(self.linked_list, "import")
+        render_snapshot_panel(self.linked_list, "snapshot", "doubly_linked_list" if self.linked_list.doubly else "linked_list")
+        render_timeline(self.linked_list, "timeline", "doubly_linked_list" if self.linked_list.doubly else "linked_list")
+        render_workload_panel(self.linked_list, "workload")
+        render_operation_counts(self.linked_list, "op_counts")
+        
         # Delete operation
         st.markdown("**Delete Operation**")
         delete_value = st.text_input("Value to delete:", key="delete_input")
@@ -130,80 +143,77 @@ class LinkedListVisualizer:
     def _render_visualization(self):
         st.subheader("📊 Linked List Visualization")
         
-        # Get list data
-        items = self.linked_list.get_list()
-        
-        if not items:
+        size = self.linked_list.size
+        if size == 0:
             st.info("List is empty. Add some elements to see the visualization!")
             return
         
-        # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(max(12, len(items) * 2), 6))
+        # Only a window of the list is drawn, so the figure size doesn't depend on its length
+        offset = 0
+        if size > self.window_size:
+            offset = st.slider("Scroll position", 0, size - self.window_size, 0, key="ll_offset")
+            st.caption(f"Showing positions {offset}-{offset + self.window_size - 1} of {size}")
+        items = list(self.linked_list.iter_slice(offset, offset + self.window_size))
         
+        # Create matplotlib figure
+        with pooled_subplots((16, 6)) as (fig, ax):
+            self._draw_list(ax, items, offset)
+            
+            # Display the plot
+            st.pyplot(fig)
+    
+    def _draw_list(self, ax, items, offset=0):
+        """Draw the nodes at positions offset.. with one collection per kind of shape"""
         # Visualization parameters
         node_width = 1.5
         node_height = 0.8
         arrow_length = 0.5
         start_x = 1
         start_y = 3
-        
-        # Draw nodes and arrows
-        for i, item in enumerate(items):
-            x_pos = start_x + i * (node_width + arrow_length + 0.5)
-            
-            # Draw node rectangle
-            node_color = '#4CAF50' if i == 0 else '#81C784'  # Head node in different color
-            rect = patches.Rectangle(
-                (x_pos, start_y), node_width, node_height,
-                linewidth=2, edgecolor='black', facecolor=node_color
-            )
-            ax.add_patch(rect)
-            
-            # Add data text
-            ax.text(
-                x_pos + node_width/2, start_y + node_height/2,
-                str(item), ha='center', va='center',
-                fontsize=12, fontweight='bold', color='white'
-            )
-            
-            # Add position label
+        step = node_width + arrow_length + 0.5
+        at_head = offset == 0
+        at_tail = offset + len(items) == self.linked_list.size
+        
+        # Nodes, head node in different color
+        xs = [start_x + i * step for i in range(len(items))]
+        colors = ['#81C784'] * len(items)
+        if at_head:
+            colors[0] = '#4CAF50'
+        draw_boxes(ax, xs, [start_y] * len(items), node_width, node_height, colors)
+        
+        # Labels only while they stay readable
+        centers = [x + node_width/2 for x in xs]
+        if len(items) <= MAX_LABELS:
+            draw_labels(ax, centers, [start_y + node_height/2] * len(items), [str(item) for item in items],
+                        ha='center', va='center', fontsize=12, fontweight='bold', color='white')
+        draw_labels(ax, centers, [start_y - 0.3] * len(items), [f'pos {offset + i}' for i in range(len(items))],
+                    stride=label_stride(len(items)), ha='center', va='center', fontsize=10, color='gray')
+        
+        # Forward arrows between consecutive nodes, and backward ones for a doubly linked list;
+        # past the window edges they lead to a "..." for the hidden nodes
+        arrow_y = start_y + node_height/2
+        tail_xs = [x + node_width for x in xs] if not at_tail else [x + node_width for x in xs[:-1]]
+        tails = [(x, arrow_y) for x in tail_xs]
+        heads = [(x + arrow_length + 0.5, arrow_y) for x in tail_xs]
+        draw_arrows(ax, tails, heads, color='blue')
+        if self.linked_list.doubly:
+            backs = [(x, arrow_y - 0.2) for x in xs[1:]] if at_head else [(x, arrow_y - 0.2) for x in xs]
+            draw_arrows(ax, backs, [(x - arrow_length - 0.5, y) for x, y in backs], color='red')
+        
+        if not at_head:
+            ax.text(start_x - step/2 - 0.2, arrow_y, '...', ha='center', va='center', fontsize=14, color='gray')
+        if at_tail:
+            # Draw NULL pointer for last node
             ax.text(
-                x_pos + node_width/2, start_y - 0.3,
-                f'pos {i}', ha='center', va='center',
-                fontsize=10, color='gray'
+                xs[-1] + node_width + 0.3, start_y + node_height/2,
+                'NULL', ha='center', va='center',
+                fontsize=10, color='red', fontweight='bold'
             )
-            
-            # Draw arrow to next node (except for last node)
-            if i < len(items) - 1:
-                arrow_start_x = x_pos + node_width
-                arrow_end_x = arrow_start_x + arrow_length + 0.5
-                arrow_y = start_y + node_height/2
-                
-                # Forward arrow
-                ax.annotate(
-                    '', xy=(arrow_end_x, arrow_y),
-                    xytext=(arrow_start_x, arrow_y),
-                    arrowprops=dict(arrowstyle='->', color='blue', lw=2)
-                )
-                
-                # For doubly linked list, add backward arrow
-                if self.linked_list.doubly:
-                    ax.annotate(
-                        '', xy=(arrow_start_x, arrow_y - 0.2),
-                        xytext=(arrow_end_x, arrow_y - 0.2),
-                        arrowprops=dict(arrowstyle='->', color='red', lw=2)
-                    )
-            else:
-                # Draw NULL pointer for last node
-                null_x = x_pos + node_width
-                ax.text(
-                    null_x + 0.3, start_y + node_height/2,
-                    'NULL', ha='center', va='center',
-                    fontsize=10, color='red', fontweight='bold'
-                )
+        else:
+            ax.text(xs[-1] + step + 0.2, arrow_y, '...', ha='center', va='center', fontsize=14, color='gray')
         
         # Add HEAD indicator
-        if items:
+        if at_head:
             head_x = start_x + node_width/2
             ax.annotate(
                 'HEAD', xy=(head_x, start_y + node_height),
@@ -213,8 +223,8 @@ class LinkedListVisualizer:
             )
         
         # For doubly linked list, add TAIL indicator
-        if items and self.linked_list.doubly:
-            tail_x = start_x + (len(items) - 1) * (node_width + arrow_length + 0.5) + node_width/2
+        if at_tail and self.linked_list.doubly:
+            tail_x = xs[-1] + node_width/2
             ax.annotate(
                 'TAIL', xy=(tail_x, start_y),
                 xytext=(tail_x, start_y - 0.8),
@@ -222,24 +232,20 @@ class LinkedListVisualizer:
                 fontsize=12, fontweight='bold', color='purple', ha='center'
             )
         
-        # Set axis properties
-        total_width = len(items) * (node_width + arrow_length + 0.5) + 2
-        ax.set_xlim(0, max(total_width, 8))
+        # Set axis properties (fixed to a full window so the scale doesn't jump while scrolling)
+        total_width = self.window_size * step + 2
+        ax.set_xlim(-1, total_width)
         ax.set_ylim(1, 6)
         ax.set_aspect('equal')
         ax.axis('off')
         ax.set_title(f'{self.list_type} Structure', fontsize=16, fontweight='bold')
         
         # Add legend for doubly linked list
-        if self.linked_list.doubly and len(items) > 1:
+        if self.linked_list.doubly and self.linked_list.size > 1:
             ax.text(
                 0.5, 5.5, 'Blue arrows: next pointers\nRed arrows: prev pointers',
                 fontsize=10, bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray")
             )
-        
-        # Display the plot
-        st.pyplot(fig)
-        plt.close()
     
     def _render_history(self):
         st.subheader("📝 Operation History")
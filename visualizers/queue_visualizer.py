@@ -3,10 +3,12 @@ Queue Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from data_structures.queue import Queue
 from utils.pseudocode import QUEUE_PSEUDOCODE
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for)
+from utils.drawing import MAX_LABELS, draw_boxes, draw_labels, label_stride
+from utils.figures import pooled_subplots
 import time
 
 class QueueVisualizer:
@@ -14,6 +16,7 @@ class QueueVisualizer:
         if 'queue' not in st.session_state:
             st.session_state.queue = Queue()
         self.queue = st.session_state.queue
+        timeline_for(self.queue, "queue")  # Before any operation of this rerun runs
     
     def render(self):
         st.title("🚶‍♂️ Queue Visualizer")
@@ -35,7 +38,7 @@ class QueueVisualizer:
         st.subheader("🎮 Controls")
         
         # Queue size configuration
-        max_size = st.slider("Max Queue Size", 3, 15, self.queue.max_size)
+        max_size = st.slider("Max Queue Size", 3, max(15, self.queue.max_size), self.queue.max_size)
         if max_size != self.queue.max_size:
             self.queue.max_size = max_size
         
@@ -62,6 +65,13 @@ class QueueVisualizer:
                 self.queue.clear()
                 st.rerun()
         
+        render_batch_input(self.queue, "enqueue_batch", lambda token: ("enqueue", token), "Values to enqueue")
+        render_import_panel(self.queue, "import")
+        render_snapshot_panel(self.queue, "snapshot", "queue")
+        render_timeline(self.queue, "timeline", "queue")
+        render_workload_panel(self.queue, "workload")
+        render_operation_counts(self.queue, "op_counts")
+        
         # Dequeue operation
         st.markdown("**Dequeue Operation**")
         if st.button("⬅️ Dequeue", disabled=self.queue.is_empty()):
@@ -103,58 +113,38 @@ class QueueVisualizer:
         st.subheader("📊 Queue Visualization")
         
         # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
+        with pooled_subplots((12, 6)) as (fig, ax):
+            self._draw_queue(ax)
+            
+            # Display the plot
+            st.pyplot(fig)
+    
+    def _draw_queue(self, ax):
+        """Draw the queue slots front to rear with one collection for all boxes"""
         # Queue visualization parameters
         box_width = 1.5
         box_height = 1
         start_x = 1
         start_y = 2
         
-        # Draw queue boxes
         items = self.queue.get_items()
-        
-        # Draw boxes for maximum capacity
-        for i in range(self.queue.max_size):
-            x_pos = start_x + i * box_width
-            
-            # Determine box color and content
-            if i < len(items):
-                # Filled box
-                if i == 0:
-                    box_color = '#FF5722'  # Front - Red/Orange
-                elif i == len(items) - 1:
-                    box_color = '#4CAF50'  # Rear - Green
-                else:
-                    box_color = '#81C784'  # Middle - Light Green
-                text_color = 'white'
-                content = str(items[i])
-            else:
-                # Empty box
-                box_color = '#E0E0E0'
-                text_color = 'gray'
-                content = ''
-            
-            # Draw rectangle
-            rect = patches.Rectangle(
-                (x_pos, start_y), box_width, box_height,
-                linewidth=2, edgecolor='black', facecolor=box_color
-            )
-            ax.add_patch(rect)
-            
-            # Add text
-            ax.text(
-                x_pos + box_width/2, start_y + box_height/2,
-                content, ha='center', va='center',
-                fontsize=12, fontweight='bold', color=text_color
-            )
-            
-            # Add index label
-            ax.text(
-                x_pos + box_width/2, start_y - 0.3,
-                f'[{i}]', ha='center', va='center',
-                fontsize=10, color='gray'
-            )
+        capacity = self.queue.max_size
+        
+        # Boxes for the whole capacity: front (red/orange), middle, rear (green) and empty slots
+        xs = [start_x + i * box_width for i in range(capacity)]
+        colors = ['#81C784'] * len(items) + ['#E0E0E0'] * (capacity - len(items))
+        if items:
+            colors[len(items) - 1] = '#4CAF50'
+            colors[0] = '#FF5722'
+        draw_boxes(ax, xs, [start_y] * capacity, box_width, box_height, colors)
+        
+        # Labels only while they stay readable
+        centers = [x + box_width/2 for x in xs]
+        if len(items) <= MAX_LABELS:
+            draw_labels(ax, centers, [start_y + box_height/2] * len(items), [str(item) for item in items],
+                        ha='center', va='center', fontsize=12, fontweight='bold', color='white')
+        draw_labels(ax, centers, [start_y - 0.3] * capacity, [f'[{i}]' for i in range(capacity)],
+                    stride=label_stride(capacity), ha='center', va='center', fontsize=10, color='gray')
         
         # Add "FRONT" and "REAR" indicators
         if not self.queue.is_empty():
@@ -208,10 +198,6 @@ class QueueVisualizer:
         ax.set_aspect('equal')
         ax.axis('off')
         ax.set_title('Queue Structure', fontsize=16, fontweight='bold')
-        
-        # Display the plot
-        st.pyplot(fig)
-        plt.close()
     
     def _render_history(self):
         st.subheader("📝 Operation History")
@@ -3,10 +3,12 @@ Stack Visualizer using Streamlit and Matplotlib
 """
 
 import streamlit as st
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 from data_structures.stack import Stack
 from utils.pseudocode import STACK_PSEUDOCODE
+from visualizers.components import (render_batch_input, render_import_panel, render_operation_counts,
+                                     render_snapshot_panel, render_timeline, render_workload_panel, timeline_for)
+from utils.drawing import MAX_LABELS, draw_boxes, draw_labels, label_stride
+from utils.figures import pooled_subplots
 import time
 
 class StackVisualizer:
@@ -14,6 +16,7 @@ class StackVisualizer:
         if 'stack' not in st.session_state:
             st.session_state.stack = Stack()
         self.stack = st.session_state.stack
+        timeline_for(self.stack, "stack")  # Before any operation of this rerun runs
     
     def render(self):
         st.title("🥞 Stack Visualizer")
@@ -35,7 +38,7 @@ class StackVisualizer:
         st.subheader("🎮 Controls")
         
         # Stack size configuration
-        max_size = st.slider("Max Stack Size", 3, 15, self.stack.max_size)
+        max_size = st.slider("Max Stack Size", 3, max(15, self.stack.max_size), self.stack.max_size)
         if max_size != self.stack.max_size:
             self.stack.max_size = max_size
         
@@ -62,6 +65,13 @@ class StackVisualizer:
                 self.stack.clear()
                 st.rerun()
         
+        render_batch_input(self.stack, "push_batch", lambda token: ("push", token), "Values to push")
+        render_import_panel(self.stack, "import")
+        render_snapshot_panel(self.stack, "snapshot", "stack")
+        render_timeline(self.stack, "timeline", "stack")
+        render_workload_panel(self.stack, "workload")
+        render_operation_counts(self.stack, "op_counts")
+        
         # Pop operation
         st.markdown("**Pop Operation**")
         if st.button("🔽 Pop", disabled=self.stack.is_empty()):
@@ -92,53 +102,37 @@ class StackVisualizer:
         st.subheader("📊 Stack Visualization")
         
         # Create matplotlib figure
-        fig, ax = plt.subplots(figsize=(8, 10))
-        
+        with pooled_subplots((8, 10)) as (fig, ax):
+            self._draw_stack(ax)
+            
+            # Display the plot
+            st.pyplot(fig)
+    
+    def _draw_stack(self, ax):
+        """Draw the stack slots bottom-up with one collection for all boxes"""
         # Stack visualization parameters
         box_width = 2
         box_height = 0.8
         start_x = 1
         start_y = 1
         
-        # Draw stack boxes
         items = self.stack.get_items()
-        
-        # Draw empty boxes for maximum capacity
-        for i in range(self.stack.max_size):
-            y_pos = start_y + i * box_height
-            
-            # Determine box color and content
-            if i < len(items):
-                # Filled box
-                box_color = '#4CAF50' if i == len(items) - 1 else '#81C784'
-                text_color = 'white'
-                content = str(items[i])
-            else:
-                # Empty box
-                box_color = '#E0E0E0'
-                text_color = 'gray'
-                content = ''
-            
-            # Draw rectangle
-            rect = patches.Rectangle(
-                (start_x, y_pos), box_width, box_height,
-                linewidth=2, edgecolor='black', facecolor=box_color
-            )
-            ax.add_patch(rect)
-            
-            # Add text
-            ax.text(
-                start_x + box_width/2, y_pos + box_height/2,
-                content, ha='center', va='center',
-                fontsize=12, fontweight='bold', color=text_color
-            )
-            
-            # Add index label
-            ax.text(
-                start_x - 0.3, y_pos + box_height/2,
-                f'[{i}]', ha='center', va='center',
-                fontsize=10, color='gray'
-            )
+        capacity = self.stack.max_size
+        
+        # Boxes for the whole capacity: top, filled and empty slots
+        ys = [start_y + i * box_height for i in range(capacity)]
+        colors = ['#81C784'] * len(items) + ['#E0E0E0'] * (capacity - len(items))
+        if items:
+            colors[len(items) - 1] = '#4CAF50'
+        draw_boxes(ax, [start_x] * capacity, ys, box_width, box_height, colors)
+        
+        # Labels only while they stay readable
+        centers = [y + box_height/2 for y in ys]
+        if len(items) <= MAX_LABELS:
+            draw_labels(ax, [start_x + box_width/2] * len(items), centers, [str(item) for item in items],
+                        ha='center', va='center', fontsize=12, fontweight='bold', color='white')
+        draw_labels(ax, [start_x - 0.3] * capacity, centers, [f'[{i}]' for i in range(capacity)],
+                    stride=label_stride(capacity), ha='center', va='center', fontsize=10, color='gray')
         
         # Add "TOP" indicator
         if not self.stack.is_empty():
@@ -152,14 +146,10 @@ class StackVisualizer:
         
         # Set axis properties
         ax.set_xlim(0, 4)
-        ax.set_ylim(0, start_y + self.stack.max_size * box_height + 1)
+        ax.set_ylim(0, start_y + capacity * box_height + 1)
         ax.set_aspect('equal')
         ax.axis('off')
         ax.set_title('Stack Structure', fontsize=16, fontweight='bold')
-        
-        # Display the plot
-        st.pyplot(fig)
-        plt.close()
     
     def _render_history(self):
         st.subheader("📝 Operation History")